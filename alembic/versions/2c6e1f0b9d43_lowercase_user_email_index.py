@@ -0,0 +1,69 @@
+"""Lowercase user email index
+
+Пользователи, чьи адреса отличаются только регистром или пробелами по краям,
+не объединяются автоматически: у каждого свои счета, транзакции и цели.
+Если такие адреса есть, миграция останавливается до изменения данных
+и выводит список конфликтующих адресов. Их нужно объединить или изменить
+вручную, после чего повторить миграцию.
+
+Revision ID: 2c6e1f0b9d43
+Revises: 8b3e5d0c2a17
+Create Date: 2024-03-18 20:05:44.610372
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2c6e1f0b9d43'
+down_revision: Union[str, None] = '8b3e5d0c2a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Почта хранится в нижнем регистре. Дубликаты проверяются до UPDATE, иначе он
+    # упадет на старом уникальном индексе ix_user_email с неинформативной ошибкой.
+    duplicates = op.get_bind().execute(
+        sa.text(
+            'SELECT lower(trim(email)) FROM "user" '
+            'GROUP BY lower(trim(email)) HAVING count(*) > 1'
+        )
+    ).scalars().all()
+    if duplicates:
+        raise RuntimeError(
+            'Адреса почты совпадают без учета регистра, '
+            'объедините пользователей вручную: ' + ', '.join(duplicates)
+        )
+    op.execute(
+        'UPDATE "user" SET email = lower(trim(email)) '
+        'WHERE email <> lower(trim(email))'
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_user_email_lower',
+            'user',
+            [sa.text('lower(email)')],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_user_email', table_name='user', postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_user_email',
+            'user',
+            ['email'],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_user_email_lower', table_name='user', postgresql_concurrently=True
+        )
@@ -0,0 +1,77 @@
+"""Add transaction indexes
+
+Revision ID: 4f2a9c1d7e85
+Revises: c871edcae5e1
+Create Date: 2024-03-12 21:14:05.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f2a9c1d7e85'
+down_revision: Union[str, None] = 'c871edcae5e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Индексы строятся CONCURRENTLY, чтобы не блокировать запись в таблицу
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_transaction_account_id_date_id',
+            'transaction',
+            ['account_id', sa.text('date DESC'), sa.text('id DESC')],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_transaction_account_id_date_income',
+            'transaction',
+            ['account_id', sa.text('date DESC'), sa.text('id DESC')],
+            unique=False,
+            postgresql_where=sa.text('amount >= 0'),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_transaction_account_id_date_expense',
+            'transaction',
+            ['account_id', sa.text('date DESC'), sa.text('id DESC')],
+            unique=False,
+            postgresql_where=sa.text('amount < 0'),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            op.f('ix_transaction_category_id'),
+            'transaction',
+            ['category_id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            op.f('ix_transaction_category_id'),
+            table_name='transaction',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_transaction_account_id_date_expense',
+            table_name='transaction',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_transaction_account_id_date_income',
+            table_name='transaction',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_transaction_account_id_date_id',
+            table_name='transaction',
+            postgresql_concurrently=True,
+        )
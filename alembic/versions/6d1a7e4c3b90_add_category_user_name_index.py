@@ -0,0 +1,55 @@
+"""Add category user_id lower(name) index
+
+Revision ID: 6d1a7e4c3b90
+Revises: 2c6e1f0b9d43
+Create Date: 2024-03-19 18:27:13.054921
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6d1a7e4c3b90'
+down_revision: Union[str, None] = '2c6e1f0b9d43'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Категории пользователя, названия которых отличаются только регистром, нарушили бы
+    # уникальный индекс, и миграция завершилась бы ошибкой. Такие категории не объединяются
+    # (на них ссылаются транзакции, бюджеты и daily_spend), а переименовываются:
+    # первая по id сохраняет название, к остальным добавляется их id, например "Еда (42)".
+    op.execute(
+        """
+        UPDATE category
+        SET name = category.name || ' (' || category.id || ')'
+        FROM (
+            SELECT id, row_number() OVER (
+                PARTITION BY user_id, lower(name) ORDER BY id
+            ) AS position
+            FROM category
+        ) AS duplicate
+        WHERE category.id = duplicate.id AND duplicate.position > 1
+        """
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_category_user_id_name_lower',
+            'category',
+            ['user_id', sa.text('lower(name)')],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_category_user_id_name_lower',
+            table_name='category',
+            postgresql_concurrently=True,
+        )
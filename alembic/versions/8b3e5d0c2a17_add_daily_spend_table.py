@@ -0,0 +1,56 @@
+"""Add daily_spend table
+
+Revision ID: 8b3e5d0c2a17
+Revises: 4f2a9c1d7e85
+Create Date: 2024-03-15 19:42:37.902114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b3e5d0c2a17'
+down_revision: Union[str, None] = '4f2a9c1d7e85'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('daily_spend',
+    sa.Column('user_id', sa.BigInteger(), nullable=False),
+    sa.Column('account_id', sa.BigInteger(), nullable=False),
+    sa.Column('category_id', sa.BigInteger(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('income', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('expense', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['account_id'], ['account.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['category_id'], ['category.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'account_id', 'category_id', 'day')
+    )
+    op.create_index('ix_daily_spend_user_id_day', 'daily_spend', ['user_id', 'day'], unique=False)
+
+    # Заполняет агрегат по существующим транзакциям
+    op.execute(
+        """
+        INSERT INTO daily_spend (user_id, account_id, category_id, day, income, expense, count)
+        SELECT account.user_id, transaction.account_id, transaction.category_id,
+               date(transaction.date),
+               sum(CASE WHEN transaction.amount >= 0 THEN transaction.amount ELSE 0 END),
+               sum(CASE WHEN transaction.amount < 0 THEN -transaction.amount ELSE 0 END),
+               count(*)
+        FROM transaction
+        JOIN account ON account.id = transaction.account_id
+        GROUP BY account.user_id, transaction.account_id, transaction.category_id,
+                 date(transaction.date)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_daily_spend_user_id_day', table_name='daily_spend')
+    op.drop_table('daily_spend')
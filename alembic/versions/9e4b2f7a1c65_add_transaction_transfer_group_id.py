@@ -0,0 +1,55 @@
+"""Add transaction transfer_group_id
+
+Revision ID: 9e4b2f7a1c65
+Revises: 6d1a7e4c3b90
+Create Date: 2024-03-21 22:41:09.775630
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e4b2f7a1c65'
+down_revision: Union[str, None] = '6d1a7e4c3b90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Ранее созданные переводы не связываются: их проводки нельзя надёжно сопоставить
+    op.add_column('transaction', sa.Column('transfer_group_id', sa.Uuid(), nullable=True))
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_transaction_transfer_group_id',
+            'transaction',
+            ['transfer_group_id'],
+            unique=False,
+            postgresql_where=sa.text('transfer_group_id IS NOT NULL'),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_transaction_account_id_date_transfer',
+            'transaction',
+            ['account_id', sa.text('date DESC'), sa.text('id DESC')],
+            unique=False,
+            postgresql_where=sa.text('transfer_group_id IS NOT NULL'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_transaction_account_id_date_transfer',
+            table_name='transaction',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_transaction_transfer_group_id',
+            table_name='transaction',
+            postgresql_concurrently=True,
+        )
+    op.drop_column('transaction', 'transfer_group_id')
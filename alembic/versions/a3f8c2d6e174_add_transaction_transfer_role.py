@@ -0,0 +1,44 @@
+"""Add transaction transfer_role
+
+Revision ID: a3f8c2d6e174
+Revises: 9e4b2f7a1c65
+Create Date: 2024-03-23 14:12:37.508316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f8c2d6e174'
+down_revision: Union[str, None] = '9e4b2f7a1c65'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('transaction', sa.Column('transfer_role', sa.String(length=8), nullable=True))
+    # Для уже созданных переводов роль восстанавливается по порядку id: до этой
+    # ревизии проводка отправителя вставлялась первой
+    op.execute(
+        """
+        UPDATE transaction
+        SET transfer_role = CASE
+            WHEN transaction.id = first_leg.id THEN 'sender'
+            ELSE 'receiver'
+        END
+        FROM (
+            SELECT transfer_group_id, min(id) AS id
+            FROM transaction
+            WHERE transfer_group_id IS NOT NULL
+            GROUP BY transfer_group_id
+        ) AS first_leg
+        WHERE transaction.transfer_group_id = first_leg.transfer_group_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('transaction', 'transfer_role')
@@ -1,6 +1,18 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
-from app.api.endpoints import users, auth, category, goal, account, transaction, budget
+from app.api.deps import verify_metrics_token
+
+from app.api.endpoints import (
+    users,
+    auth,
+    category,
+    goal,
+    account,
+    transaction,
+    budget,
+    analytics,
+    internal,
+)
 
 
 api_router = APIRouter()
@@ -13,3 +25,11 @@ api_router.include_router(
 api_router.include_router(category.router, prefix="/category", tags=["Category"])
 api_router.include_router(goal.router, prefix="/goal", tags=["Goal"])
 api_router.include_router(budget.router, prefix="/budget", tags=["Budget"])
+api_router.include_router(analytics.router, prefix="/analytics", tags=["Analytics"])
+api_router.include_router(
+    internal.router,
+    prefix="/internal",
+    tags=["Internal"],
+    include_in_schema=False,
+    dependencies=[Depends(verify_metrics_token)],
+)
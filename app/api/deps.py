@@ -1,61 +1,137 @@
-from typing import Annotated, Generator
+import secrets
+from typing import Annotated, AsyncGenerator, Generator, List, Optional
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Body, Depends, Header, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
 from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core import security
+from app.core.cache import user_cache
 from app.core.config import settings
-from app.db.database import engine, SessionLocal
+from app.db.database import engine, SessionLocal, AsyncSessionLocal
 from app.models import User
 from app.schemas.token import TokenPayload
+from app.schemas.user import UserIdentity
 
 reusable_oauth2 = OAuth2PasswordBearer(tokenUrl="auth/access-token")
 
 
 def get_session() -> Generator:
-    session = SessionLocal()
-    try:
+    """
+    Сессия на запрос (unit of work): CRUD-методы только выполняют flush,
+    а изменения фиксируются одним commit после обработчика. Если обработчик
+    завершился исключением (в том числе HTTPException), изменения откатываются.
+    """
+    with SessionLocal.begin() as session:
         yield session
-    finally:
-        session.close()
-    
+
+
+async def get_async_session() -> AsyncGenerator:
+    """
+    Асинхронная версия get_session.
+    """
+    async with AsyncSessionLocal.begin() as session:
+        yield session
+
+
 SessionDep = Annotated[Session, Depends(get_session)]
+AsyncSessionDep = Annotated[AsyncSession, Depends(get_async_session)]
 TokenDep = Annotated[str, Depends(reusable_oauth2)]
 
+# Параметры пакетных эндпоинтов (/batch): список объектов в теле или id в query
+BatchBody = Body(min_length=1, max_length=settings.BATCH_MAX_SIZE)
+BatchIds = Annotated[
+    List[int], Query(min_length=1, max_length=settings.BATCH_MAX_SIZE)
+]
+
+
+def _get_token_data(token: str) -> TokenPayload:
+    try:
+        return security.decode_access_token(token)
+    except (jwt.JWTError, ValidationError):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Не удалось подтвердить права доступа",
+        )
+
+
+def _get_cached_user(user_id: int) -> Optional[UserIdentity]:
+    data = user_cache.get(user_id)
+    return None if data is None else UserIdentity.model_validate(data)
 
-def get_current_user(
-    session: SessionDep, token: TokenDep
-) -> User:
+
+def _cache_user(user: Optional[User]) -> UserIdentity:
+    if not user:
+        raise HTTPException(status_code=404, detail="Пользователь не найден")
+    identity = UserIdentity.model_validate(user)
+    user_cache.set(identity.id, identity.model_dump())
+    return identity
+
+
+def get_current_user(session: SessionDep, token: TokenDep) -> UserIdentity:
     """
     Получает текущего пользователя на основе переданного токена аутентификации.
 
+    Данные пользователя (id, email, region) берутся из кэша user_cache, запрос к базе данных
+    выполняется только при промахе кэша. Полную модель User при необходимости нужно загрузить отдельно.
+
     Args:
         session (Session, optional): Экземпляр сессии базы данных. Получается через зависимость.
         token (str, optional): Токен аутентификации пользователя. Получается через зависимость.
 
     Returns:
-        User: Экземпляр пользователя, если аутентификация успешна.
+        UserIdentity: Данные пользователя, если аутентификация успешна.
 
     Raises:
         HTTPException: В случае неудачной аутентификации, возникает исключение с кодом HTTP 403 Forbidden или 404 Not Found.
     """
-    try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
-        )
-        token_data = TokenPayload(**payload)
-    except (jwt.JWTError, ValidationError):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Не удалось подтвердить права доступа",
-        )
-    user = session.get(User, token_data.sub)
-    if not user:
-        raise HTTPException(status_code=404, detail="Пользователь не найден")
-    return user
+    token_data = _get_token_data(token)
+    identity = _get_cached_user(token_data.sub)
+    if identity:
+        return identity
+    return _cache_user(session.get(User, token_data.sub))
+
 
+CurrentUser = Annotated[UserIdentity, Depends(get_current_user)]
+
+
+async def get_current_user_async(
+    session: AsyncSessionDep, token: TokenDep
+) -> UserIdentity:
+    """
+    Асинхронная версия get_current_user для эндпоинтов, работающих с AsyncSession.
 
-CurrentUser = Annotated[User, Depends(get_current_user)]
+    Raises:
+        HTTPException: В случае неудачной аутентификации (403) или если пользователь не найден (404).
+    """
+    token_data = _get_token_data(token)
+    identity = _get_cached_user(token_data.sub)
+    if identity:
+        return identity
+    return _cache_user(await session.get(User, token_data.sub))
+
+
+AsyncCurrentUser = Annotated[UserIdentity, Depends(get_current_user_async)]
+
+
+def verify_metrics_token(
+    x_metrics_token: Annotated[Optional[str], Header()] = None
+) -> None:
+    """
+    Проверяет общий токен служебных эндпоинтов. Если METRICS_TOKEN не задан,
+    эндпоинты отключены и отвечают 404.
+
+    Raises:
+        HTTPException: 404, если токен не настроен, или 403, если передан неверный токен.
+    """
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_metrics_token or not secrets.compare_digest(
+        x_metrics_token, settings.METRICS_TOKEN
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Недостаточно прав"
+        )
@@ -1,17 +1,18 @@
-from typing import List
+from datetime import datetime
+from typing import Annotated, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from sqlalchemy import select
-from sqlalchemy.orm import joinedload
 
 from app.models.account import Account
 from app.schemas.account import (
     AccountSchema,
     AccountCreate,
     AccountUpdate,
+    AccountBatchUpdate,
     AccountTransactions,
 )
-from app.api.deps import SessionDep, get_current_user, CurrentUser
+from app.api.deps import AsyncSessionDep, AsyncCurrentUser, BatchBody, BatchIds
 from app import crud
 
 router = APIRouter()
@@ -19,14 +20,115 @@ router = APIRouter()
 NOT_FOUND_MESSAGE = "Счёт не найден"
 
 
+@router.post("/batch", response_model=List[AccountSchema])
+async def create_accounts(
+    *,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    accounts_in: Annotated[List[AccountCreate], BatchBody],
+):
+    """
+    **Создает несколько счетов текущего пользователя одним запросом.**
+
+    Args:
+        session (AsyncSessionDep): Сессия базы данных.
+        current_user (AsyncCurrentUser): Текущий авторизованный пользователь.
+        accounts_in (List[AccountCreate]): Данные новых счетов.
+
+    Returns:
+        List[AccountSchema]: Созданные счета в порядке переданных данных.
+    """
+    accounts = await session.run_sync(
+        crud.account.create_many, objs_in=accounts_in, user_id=current_user.id
+    )
+    return accounts
+
+
+@router.put("/batch", response_model=List[AccountSchema])
+async def update_accounts(
+    *,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    accounts_in: Annotated[List[AccountBatchUpdate], BatchBody],
+):
+    """
+    **Обновляет несколько счетов текущего пользователя одним запросом.**
+
+    Изменения применяются ко всем счетам или не применяются вовсе.
+
+    Args:
+        session (AsyncSessionDep): Сессия базы данных.
+        current_user (AsyncCurrentUser): Текущий авторизованный пользователь.
+        accounts_in (List[AccountBatchUpdate]): Данные обновления с id счетов.
+
+    Returns:
+        List[AccountSchema]: Обновленные счета в порядке возрастания id.
+
+    Raises:
+        HTTPException: Если счёт не найден или принадлежит другому пользователю.
+    """
+    await session.run_sync(
+        crud.account.get_many_owned,
+        [account_in.id for account_in in accounts_in],
+        current_user.id,
+        not_found_detail=NOT_FOUND_MESSAGE,
+        forbidden_status=400,
+        forbidden_detail="Пользователь не может изменить не свой счёт",
+    )
+    accounts = await session.run_sync(
+        crud.account.update_many, objs_in=accounts_in, user_id=current_user.id
+    )
+    return accounts
+
+
+@router.delete("/batch")
+async def delete_accounts(
+    *,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    ids: BatchIds,
+):
+    """
+    **Удаляет несколько счетов текущего пользователя одним запросом.**
+
+    Args:
+        session (AsyncSessionDep): Сессия базы данных.
+        current_user (AsyncCurrentUser): Текущий авторизованный пользователь.
+        ids (List[int]): Идентификаторы удаляемых счетов.
+
+    Returns:
+        str: Сообщение об удалении счетов.
+
+    Raises:
+        HTTPException: Если счёт не найден или принадлежит другому пользователю.
+    """
+    await session.run_sync(
+        crud.account.get_many_owned,
+        ids,
+        current_user.id,
+        not_found_detail=NOT_FOUND_MESSAGE,
+        forbidden_status=400,
+        forbidden_detail="Пользователь не может удалить не свой счёт",
+    )
+    accounts = await session.run_sync(
+        crud.account.remove_many, ids=ids, user_id=current_user.id
+    )
+    return f"Удалено счетов: {len(accounts)}"
+
+
 @router.get("/{id}", response_model=AccountSchema)
-def get_account(*, session: SessionDep, current_user: CurrentUser, id: int):
+async def get_account(
+    *,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    id: int,
+):
     """
     **Получает информацию о счёте по его id.**
 
     Args:
-        session (SessionDep): Сессия базы данных.
-        current_user (CurrentUser): Текущий авторизованный пользователь.
+        session (AsyncSessionDep): Сессия базы данных.
+        current_user (AsyncCurrentUser): Текущий авторизованный пользователь.
         id (int): Идентификатор счёта.
 
     Returns:
@@ -35,48 +137,59 @@ def get_account(*, session: SessionDep, current_user: CurrentUser, id: int):
     Raises:
         HTTPException: Если счёт не найден или если пользователь пытается получить счёт не своего пользователя.
     """
-    account = crud.account.get(session, id)
-
-    if not account:
-        raise HTTPException(status_code=404, detail=NOT_FOUND_MESSAGE)
-
-    if account.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Недостаточно прав")
+    account = await crud.account.aget_owned(
+        session, id, current_user.id, not_found_detail=NOT_FOUND_MESSAGE
+    )
 
     return account
 
 
 @router.get("/", response_model=List[AccountSchema])
-def get_accounts(*, session: SessionDep, current_user: CurrentUser):
+async def get_accounts(
+    *,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+):
     """
     **Получает список счетов для текущего пользователя.**
 
     Args:
-        session (Session, optional): Сессия базы данных. Defaults to Depends(get_session).
-        current_user (CurrentUser): Текущий авторизованный пользователь.
+        session (AsyncSessionDep): Сессия базы данных.
+        current_user (AsyncCurrentUser): Текущий авторизованный пользователь.
 
     Returns:
         List[AccountSchema]: Список счетов пользователя.
     """
-    accounts = session.query(Account).filter(Account.user_id == current_user.id).all()
+    accounts = (
+        await session.scalars(select(Account).where(Account.user_id == current_user.id))
+    ).all()
     return accounts
 
 
 @router.get(
     "/get_account_transactions/{account_id}", response_model=List[AccountTransactions]
 )
-def get_account_with_transactions(
+async def get_account_with_transactions(
     account_id: int,
-    current_user: CurrentUser,
-    session: SessionDep,
+    current_user: AsyncCurrentUser,
+    session: AsyncSessionDep,
+    limit: int = Query(100, ge=1, le=1000),
+    begin_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
 ):
     """
-    **Получает данные о счёте пользователя вместе с его транзакциями.**
+    **Получает данные о счёте пользователя вместе с его последними транзакциями.**
+
+    Счёт и транзакции загружаются одним запросом. Количество транзакций ограничено `limit`,
+    период можно задать через `begin_date` и `end_date`.
 
     Args:
         account_id (int): Идентификатор аккаунта.
-        current_user (CurrentUser): Авторизованный пользователь.
-        session (SessionDep): Сессия базы данных.
+        current_user (AsyncCurrentUser): Авторизованный пользователь.
+        session (AsyncSessionDep): Сессия базы данных.
+        limit (int, optional): Максимальное количество транзакций. Defaults to 100.
+        begin_date (Optional[datetime], optional): Начальная дата транзакций. Defaults to None.
+        end_date (Optional[datetime], optional): Конечная дата транзакций. Defaults to None.
 
     Returns:
         List[AccountTransactions]: Список аккаунтов с их транзакциями.
@@ -85,47 +198,48 @@ def get_account_with_transactions(
         HTTPException: Если аккаунт не найден, не принадлежит текущему пользователю
         или если запрос к базе данных завершился ошибкой.
     """
-    account = (
-        session.query(Account)
-        .where(Account.id == account_id, Account.user_id == current_user.id)
-        .first()
+    account = await crud.account.aget_with_transactions(
+        session,
+        account_id=account_id,
+        user_id=current_user.id,
+        limit=limit,
+        begin_date=begin_date,
+        end_date=end_date,
     )
     if not account:
         raise HTTPException(status_code=404, detail=NOT_FOUND_MESSAGE)
-
-    statement = (
-        select(Account)
-        .options(joinedload(Account.transactions))
-        .where(Account.id == account_id, Account.user_id == current_user.id)
-        .order_by(Account.id)
-    )
-    transactions = session.execute(statement).unique().scalars().all()
-    return transactions
+    return [account]
 
 
-@router.post(
-    "/", response_model=AccountSchema
-)
-def create_account(*, session: SessionDep, account_in: AccountCreate, current_user: CurrentUser):
+@router.post("/", response_model=AccountSchema)
+async def create_account(
+    *,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    account_in: AccountCreate,
+):
     """
     **Создает новый счет для текущего пользователя.**
 
     Args:
-        session (Session, optional): Сессия базы данных. Defaults to Depends(get_session).
+        session (AsyncSessionDep): Сессия базы данных.
+        current_user (AsyncCurrentUser): Текущий авторизованный пользователь.
         account_in (AccountCreate): Данные для создания нового счета.
 
     Returns:
         AccountSchema: Созданный счет.
     """
-    account = crud.account.create(db=session, obj_in=account_in, user_id=current_user.id)
+    account = await crud.account.acreate(
+        db=session, obj_in=account_in, user_id=current_user.id
+    )
     return account
 
 
 @router.put("/{account_id}", response_model=AccountSchema)
-def update_account(
+async def update_account(
     *,
-    session: SessionDep,
-    current_user: CurrentUser,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
     account_id: int,
     account_in: AccountUpdate,
 ):
@@ -133,8 +247,8 @@ def update_account(
     **Обновляет существующий счет для текущего пользователя.**
 
     Args:
-        session (Session, optional): Сессия базы данных. Defaults to Depends(get_session).
-        current_user (CurrentUser): Текущий авторизованный пользователь.
+        session (AsyncSessionDep): Сессия базы данных.
+        current_user (AsyncCurrentUser): Текущий авторизованный пользователь.
         account_id (int): Идентификатор обновляемого счета.
         account_in (AccountUpdate): Данные для обновления счета.
 
@@ -144,31 +258,32 @@ def update_account(
     Raises:
         HTTPException: Если счет не найден или пользователь пытается изменить чужой счет.
     """
-    account = crud.account.get(session, account_id)
-    if not account:
-        raise HTTPException(status_code=404, detail=NOT_FOUND_MESSAGE)
-    if account.user_id != current_user.id:
-        raise HTTPException(
-            status_code=400, detail="Пользователь не может изменить не свой счёт"
-        )
+    account = await crud.account.aget_owned(
+        session,
+        account_id,
+        current_user.id,
+        not_found_detail=NOT_FOUND_MESSAGE,
+        forbidden_status=400,
+        forbidden_detail="Пользователь не может изменить не свой счёт",
+    )
 
-    account = crud.account.update(session, db_obj=account, obj_in=account_in)
+    account = await crud.account.aupdate(session, db_obj=account, obj_in=account_in)
     return account
 
 
 @router.delete("/{account_id}")
-def delete_account(
+async def delete_account(
     *,
-    session: SessionDep,
-    current_user: CurrentUser,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
     account_id: int,
 ):
     """
     **Удаляет счет для текущего пользователя.**
 
     Args:
-        session (Session, optional): Сессия базы данных. Defaults to Depends(get_session).
-        current_user (CurrentUser): Текущий авторизованный пользователь.
+        session (AsyncSessionDep): Сессия базы данных.
+        current_user (AsyncCurrentUser): Текущий авторизованный пользователь.
         account_id (int): Идентификатор удаляемого счета.
 
     Returns:
@@ -177,13 +292,14 @@ def delete_account(
     Raises:
         HTTPException: Если счет не найден или пользователь пытается удалить чужой счет.
     """
-    account = crud.account.get(session, account_id)
-    if not account:
-        raise HTTPException(status_code=404, detail=NOT_FOUND_MESSAGE)
-    if account.user_id != current_user.id:
-        raise HTTPException(
-            status_code=400, detail="Пользователь не может удалить не свой счёт"
-        )
+    account = await crud.account.aget_owned(
+        session,
+        account_id,
+        current_user.id,
+        not_found_detail=NOT_FOUND_MESSAGE,
+        forbidden_status=400,
+        forbidden_detail="Пользователь не может удалить не свой счёт",
+    )
 
-    crud.account.remove(session, id=account_id)
+    await crud.account.aremove(session, id=account_id)
     return f"Счёт: {account.name} удален"
@@ -0,0 +1,79 @@
+from datetime import date
+from typing import List, Optional
+
+from fastapi import APIRouter, Query
+
+from app.schemas.analytics import CashflowBucket, CashflowPoint, CategoryTotal
+from app.api.deps import AsyncCurrentUser, AsyncSessionDep
+from app import crud
+
+router = APIRouter()
+
+
+@router.get("/by-category", response_model=List[CategoryTotal])
+async def get_totals_by_category(
+    *,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    begin_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+):
+    """
+    **Получает доходы и расходы текущего пользователя по категориям за период.**
+
+    Суммы считаются одним запросом по агрегату daily_spend. Расходы возвращаются положительной суммой.
+
+    Args:
+        session (AsyncSessionDep): Сессия базы данных.
+        current_user (AsyncCurrentUser): Текущий авторизованный пользователь.
+        begin_date (Optional[date], optional): Начальная дата (включительно). Defaults to None.
+        end_date (Optional[date], optional): Конечная дата (включительно). Defaults to None.
+
+    Returns:
+        List[CategoryTotal]: Суммы по категориям, отсортированные по убыванию расходов.
+    """
+    return await session.run_sync(
+        crud.daily_spend.get_by_category,
+        user_id=current_user.id,
+        begin_date=begin_date,
+        end_date=end_date,
+    )
+
+
+@router.get("/cashflow", response_model=List[CashflowPoint])
+async def get_cashflow(
+    *,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    bucket: CashflowBucket = Query(
+        CashflowBucket.month, description="Интервал: 'day', 'week' или 'month'"
+    ),
+    account_id: Optional[int] = Query(None),
+    begin_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+):
+    """
+    **Получает доходы и расходы текущего пользователя по дням, неделям или месяцам.**
+
+    Группировка выполняется в базе данных по агрегату daily_spend. Недели начинаются с понедельника,
+    расходы возвращаются положительной суммой.
+
+    Args:
+        session (AsyncSessionDep): Сессия базы данных.
+        current_user (AsyncCurrentUser): Текущий авторизованный пользователь.
+        bucket (CashflowBucket, optional): Интервал группировки. Defaults to CashflowBucket.month.
+        account_id (Optional[int], optional): Идентификатор счёта. Defaults to None.
+        begin_date (Optional[date], optional): Начальная дата (включительно). Defaults to None.
+        end_date (Optional[date], optional): Конечная дата (включительно). Defaults to None.
+
+    Returns:
+        List[CashflowPoint]: Доходы и расходы по интервалам в порядке возрастания дат.
+    """
+    return await session.run_sync(
+        crud.daily_spend.get_cashflow,
+        user_id=current_user.id,
+        bucket=bucket,
+        account_id=account_id,
+        begin_date=begin_date,
+        end_date=end_date,
+    )
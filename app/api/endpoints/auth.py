@@ -4,10 +4,11 @@ from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import OAuth2PasswordRequestForm
 
 from app.core.config import settings
-from app.api.deps import CurrentUser, SessionDep
+from app.api.deps import AsyncSessionDep, CurrentUser, SessionDep
 from app.core.security import create_access_token
-from app.crud.auth import authenticate
+from app.crud.auth import authenticate_async
 from app.schemas.token import Token, OAuth2PasswordRequestForm
+from app.models.user import User
 from app.schemas.user import UserSchema
 
 
@@ -15,15 +16,15 @@ router = APIRouter()
 
 
 @router.post("/login", response_model=Token)
-def login(
-    session: SessionDep,
+async def login(
+    session: AsyncSessionDep,
     form_data: OAuth2PasswordRequestForm = Depends(),
 ):
     """
     **Аутентификация пользователя и выдача токена доступа.**
 
     Args:
-        session (Session, optional): Экземпляр сессии базы данных. Получается через зависимость.
+        session (AsyncSessionDep): Экземпляр асинхронной сессии базы данных. Получается через зависимость.
         form_data (OAuth2PasswordRequestForm): Данные формы для запроса токена (логин и пароль).
 
     Returns:
@@ -31,8 +32,9 @@ def login(
 
     Raises:
         HTTPException: В случае неудачной аутентификации, возникает исключение с кодом HTTP 400 Bad Request.
+            Если пул проверки паролей перегружен - HTTP 503 Service Unavailable.
     """
-    user = authenticate(
+    user = await authenticate_async(
         session=session, email=form_data.username, password=form_data.password
     )
     if not user:
@@ -48,15 +50,15 @@ def login(
 
 
 @router.post("/access-token")
-def login_access_token(
-    session: SessionDep,
+async def login_access_token(
+    session: AsyncSessionDep,
     form_data: OAuth2PasswordRequestForm = Depends(),
 ) -> Token:
     """
     **Аутентификация пользователя и выдача токена доступа (вариант для использования в заголовке Authorization).**
 
     Args:
-        session (Session, optional): Экземпляр сессии базы данных. Получается через зависимость.
+        session (AsyncSessionDep): Экземпляр асинхронной сессии базы данных. Получается через зависимость.
         form_data (OAuth2PasswordRequestForm): Данные формы для запроса токена (логин и пароль).
 
     Returns:
@@ -64,8 +66,9 @@ def login_access_token(
 
     Raises:
         HTTPException: В случае неудачной аутентификации, возникает исключение с кодом HTTP 400 Bad Request.
+            Если пул проверки паролей перегружен - HTTP 503 Service Unavailable.
     """
-    user = authenticate(
+    user = await authenticate_async(
         session=session, email=form_data.username, password=form_data.password
     )
     if not user:
@@ -77,14 +80,18 @@ def login_access_token(
 
 
 @router.get("/me", response_model=UserSchema)
-def get_me(current_user: CurrentUser):
+def get_me(session: SessionDep, current_user: CurrentUser):
     """
     **Получение данных текущего авторизованного пользователя.**
 
     Args:
+        session (Session, optional): Экземпляр сессии базы данных. Получается через зависимость.
         current_user (CurrentUser): Объект текущего авторизованного пользователя. Получается через зависимость.
 
     Returns:
         UserSchema: Объект с данными пользователя.
     """
-    return current_user
+    user = session.get(User, current_user.id)
+    if not user:
+        raise HTTPException(status_code=404, detail="Пользователь не найден")
+    return user
@@ -1,10 +1,17 @@
-from typing import List
+from typing import Annotated, List
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter
+from sqlalchemy import select
 
 from app.models.budget import Budget
-from app.schemas.budget import BudgetSchema, BudgetCreate, BudgetUpdate
-from app.api.deps import get_current_user, CurrentUser, SessionDep
+from app.schemas.budget import (
+    BudgetSchema,
+    BudgetCreate,
+    BudgetUpdate,
+    BudgetBatchUpdate,
+    BudgetProgress,
+)
+from app.api.deps import AsyncCurrentUser, AsyncSessionDep, BatchBody, BatchIds
 from app import crud
 
 router = APIRouter()
@@ -12,14 +19,172 @@ router = APIRouter()
 NOT_FOUND_MESSAGE = "Бюджет не найден"
 
 
+@router.get("/progress", response_model=List[BudgetProgress])
+async def get_budgets_progress(
+    *,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+):
+    """
+    **Получение расходов по всем бюджетам пользователя за текущий период.**
+
+    Расходы всех бюджетов вычисляются одним запросом к базе данных.
+
+    Args:
+        session (AsyncSessionDep): Экземпляр сессии базы данных.
+        current_user (AsyncCurrentUser): Авторизованный пользователь.
+
+    Returns:
+        List[BudgetProgress]: Израсходованная и оставшаяся сумма по каждому бюджету.
+    """
+    budgets = (
+        await session.scalars(select(Budget).where(Budget.user_id == current_user.id))
+    ).all()
+    return await session.run_sync(
+        crud.budget.get_progress, budgets=budgets, user_id=current_user.id
+    )
+
+
+@router.get("/{id}/progress", response_model=BudgetProgress)
+async def get_budget_progress(
+    *,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    id: int,
+):
+    """
+    **Получение расходов по бюджету за текущий период.**
+
+    Args:
+        session (AsyncSessionDep): Экземпляр сессии базы данных.
+        current_user (AsyncCurrentUser): Авторизованный пользователь.
+        id (int): Идентификатор бюджета.
+
+    Returns:
+        BudgetProgress: Израсходованная и оставшаяся сумма, процент использования бюджета.
+
+    Raises:
+        HTTPException: Если бюджет не найден или пользователь пытается получить информацию о чужом бюджете.
+    """
+    budget = await crud.budget.aget_owned(
+        session, id, current_user.id, not_found_detail=NOT_FOUND_MESSAGE
+    )
+
+    [progress] = await session.run_sync(
+        crud.budget.get_progress, budgets=[budget], user_id=current_user.id
+    )
+    return progress
+
+
+@router.post("/batch", response_model=List[BudgetSchema])
+async def create_budgets(
+    *,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    budgets_in: Annotated[List[BudgetCreate], BatchBody],
+):
+    """
+    **Создает несколько бюджетов текущего пользователя одним запросом.**
+
+    Args:
+        session (AsyncSessionDep): Сессия базы данных.
+        current_user (AsyncCurrentUser): Текущий авторизованный пользователь.
+        budgets_in (List[BudgetCreate]): Данные новых бюджетов.
+
+    Returns:
+        List[BudgetSchema]: Созданные бюджеты в порядке переданных данных.
+    """
+    budgets = await session.run_sync(
+        crud.budget.create_many, objs_in=budgets_in, user_id=current_user.id
+    )
+    return budgets
+
+
+@router.put("/batch", response_model=List[BudgetSchema])
+async def update_budgets(
+    *,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    budgets_in: Annotated[List[BudgetBatchUpdate], BatchBody],
+):
+    """
+    **Обновляет несколько бюджетов текущего пользователя одним запросом.**
+
+    Изменения применяются ко всем бюджетам или не применяются вовсе.
+
+    Args:
+        session (AsyncSessionDep): Сессия базы данных.
+        current_user (AsyncCurrentUser): Текущий авторизованный пользователь.
+        budgets_in (List[BudgetBatchUpdate]): Данные обновления с id бюджетов.
+
+    Returns:
+        List[BudgetSchema]: Обновленные бюджеты в порядке возрастания id.
+
+    Raises:
+        HTTPException: Если бюджет не найден или принадлежит другому пользователю.
+    """
+    await session.run_sync(
+        crud.budget.get_many_owned,
+        [budget_in.id for budget_in in budgets_in],
+        current_user.id,
+        not_found_detail=NOT_FOUND_MESSAGE,
+        forbidden_status=400,
+        forbidden_detail="Пользователь не может изменить не свой бюджет",
+    )
+    budgets = await session.run_sync(
+        crud.budget.update_many, objs_in=budgets_in, user_id=current_user.id
+    )
+    return budgets
+
+
+@router.delete("/batch")
+async def delete_budgets(
+    *,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    ids: BatchIds,
+):
+    """
+    **Удаляет несколько бюджетов текущего пользователя одним запросом.**
+
+    Args:
+        session (AsyncSessionDep): Сессия базы данных.
+        current_user (AsyncCurrentUser): Текущий авторизованный пользователь.
+        ids (List[int]): Идентификаторы удаляемых бюджетов.
+
+    Returns:
+        str: Сообщение об удалении бюджетов.
+
+    Raises:
+        HTTPException: Если бюджет не найден или принадлежит другому пользователю.
+    """
+    await session.run_sync(
+        crud.budget.get_many_owned,
+        ids,
+        current_user.id,
+        not_found_detail=NOT_FOUND_MESSAGE,
+        forbidden_status=400,
+        forbidden_detail="Пользователь не может удалить не свой бюджет",
+    )
+    budgets = await session.run_sync(
+        crud.budget.remove_many, ids=ids, user_id=current_user.id
+    )
+    return f"Удалено бюджетов: {len(budgets)}"
+
+
 @router.get("/{id}", response_model=BudgetSchema)
-def get_budget(*, session: SessionDep, current_user: CurrentUser, id: int):
+async def get_budget(
+    *,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    id: int,
+):
     """
     **Получение информации о конкретном бюджете.**
 
     Args:
-        session (SessionDep): Экземпляр сессии базы данных.
-        current_user (CurrentUser): Авторизованный пользователь.
+        session (AsyncSessionDep): Экземпляр сессии базы данных.
+        current_user (AsyncCurrentUser): Авторизованный пользователь.
         id (int): Идентификатор бюджета.
 
     Returns:
@@ -28,57 +193,64 @@ def get_budget(*, session: SessionDep, current_user: CurrentUser, id: int):
     Raises:
         HTTPException: Если бюджет не найден или пользователь пытается получить информацию о чужом бюджете.
     """
-    budget = crud.budget.get(session, id)
-
-    if not budget:
-        raise HTTPException(status_code=404, detail=NOT_FOUND_MESSAGE)
-
-    if budget.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Недостаточно прав")
+    budget = await crud.budget.aget_owned(
+        session, id, current_user.id, not_found_detail=NOT_FOUND_MESSAGE
+    )
 
     return budget
 
 
 @router.get("/", response_model=List[BudgetSchema])
-def get_budgets(*, session: SessionDep, current_user: CurrentUser):
+async def get_budgets(
+    *,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+):
     """
     **Получение списка бюджетов пользователя.**
 
     Args:
-        session (SessionDep): Экземпляр сессии базы данных.
-        current_user (CurrentUser): Авторизованный пользователь.
+        session (AsyncSessionDep): Экземпляр сессии базы данных.
+        current_user (AsyncCurrentUser): Авторизованный пользователь.
 
     Returns:
         List[BudgetSchema]: Список бюджетов пользователя.
     """
-    budgets = session.query(Budget).where(Budget.user_id == current_user.id).all()
+    budgets = (
+        await session.scalars(select(Budget).where(Budget.user_id == current_user.id))
+    ).all()
     return budgets
 
 
 @router.post("/", response_model=BudgetSchema)
-def create_budget(
-    *, session: SessionDep, budget_in: BudgetCreate, current_user: CurrentUser
+async def create_budget(
+    *,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    budget_in: BudgetCreate,
 ):
     """
     **Создание нового бюджета.**
 
     Args:
-        session (SessionDep): Экземпляр сессии базы данных.
+        session (AsyncSessionDep): Экземпляр сессии базы данных.
+        current_user (AsyncCurrentUser): Авторизованный пользователь.
         budget_in (BudgetCreate): Данные для создания нового бюджета.
-        current_user (CurrentUser): Авторизованный пользователь.
 
     Returns:
         BudgetSchema: Созданный бюджет.
     """
-    budget = crud.budget.create(db=session, obj_in=budget_in, user_id=current_user.id)
+    budget = await crud.budget.acreate(
+        db=session, obj_in=budget_in, user_id=current_user.id
+    )
     return budget
 
 
 @router.put("/{budget_id}", response_model=BudgetSchema)
-def update_budget(
+async def update_budget(
     *,
-    session: SessionDep,
-    current_user: CurrentUser,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
     budget_id: int,
     budget_in: BudgetUpdate,
 ):
@@ -86,8 +258,8 @@ def update_budget(
     **Обновление информации о бюджете.**
 
     Args:
-        session (SessionDep): Экземпляр сессии базы данных.
-        current_user (CurrentUser): Авторизованный пользователь.
+        session (AsyncSessionDep): Экземпляр сессии базы данных.
+        current_user (AsyncCurrentUser): Авторизованный пользователь.
         budget_id (int): Идентификатор бюджета.
         budget_in (BudgetUpdate): Обновленные данные для бюджета.
 
@@ -97,31 +269,32 @@ def update_budget(
     Raises:
         HTTPException: Если бюджет не найден или пользователь пытается изменить не свой бюджет.
     """
-    budget = crud.budget.get(session, budget_id)
-    if not budget:
-        raise HTTPException(status_code=404, detail=NOT_FOUND_MESSAGE)
-    if budget.user_id != current_user.id:
-        raise HTTPException(
-            status_code=400, detail="Пользователь не может изменить не свой бюджет"
-        )
-
-    budget = crud.budget.update(session, db_obj=budget, obj_in=budget_in)
+    budget = await crud.budget.aget_owned(
+        session,
+        budget_id,
+        current_user.id,
+        not_found_detail=NOT_FOUND_MESSAGE,
+        forbidden_status=400,
+        forbidden_detail="Пользователь не может изменить не свой бюджет",
+    )
+
+    budget = await crud.budget.aupdate(session, db_obj=budget, obj_in=budget_in)
     return budget
 
 
 @router.delete("/{budget_id}")
-def delete_budget(
+async def delete_budget(
     *,
-    session: SessionDep,
-    current_user: CurrentUser,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
     budget_id: int,
 ):
     """
     Удаление бюджета.
 
     Args:
-        session (SessionDep): Экземпляр сессии базы данных.
-        current_user (CurrentUser): Авторизованный пользователь.
+        session (AsyncSessionDep): Экземпляр сессии базы данных.
+        current_user (AsyncCurrentUser): Авторизованный пользователь.
         budget_id (int): Идентификатор бюджета.
 
     Returns:
@@ -130,13 +303,14 @@ def delete_budget(
     Raises:
         HTTPException: Если бюджет не найден или пользователь пытается удалить не свой бюджет.
     """
-    budget = crud.budget.get(session, budget_id)
-    if not budget:
-        raise HTTPException(status_code=404, detail=NOT_FOUND_MESSAGE)
-    if budget.user_id != current_user.id:
-        raise HTTPException(
-            status_code=400, detail="Пользователь не может удалить не свой бюджет"
-        )
-
-    crud.budget.remove(session, id=budget_id)
+    budget = await crud.budget.aget_owned(
+        session,
+        budget_id,
+        current_user.id,
+        not_found_detail=NOT_FOUND_MESSAGE,
+        forbidden_status=400,
+        forbidden_detail="Пользователь не может удалить не свой бюджет",
+    )
+
+    await crud.budget.aremove(session, id=budget_id)
     return "Бюджет удален"
@@ -1,24 +1,144 @@
-from typing import List
+from typing import Annotated, List
+
+from fastapi import APIRouter, HTTPException
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 
-from fastapi import APIRouter, Depends, HTTPException
 from app.models.category import Category
-from app.schemas.category import CategorySchema, CategoryCreate, CategoryUpdate
-from app.api.deps import get_current_user, CurrentUser, SessionDep
+from app.schemas.category import (
+    CategorySchema,
+    CategoryCreate,
+    CategoryUpdate,
+    CategoryBatchUpdate,
+)
+from app.api.deps import AsyncCurrentUser, AsyncSessionDep, BatchBody, BatchIds
 from app import crud
 
 router = APIRouter()
 
 NOT_FOUND_MESSAGE = "Категория не найдена"
+DUPLICATE_MESSAGE = "Категория с таким названием уже существует"
+
+
+@router.post("/batch", response_model=List[CategorySchema])
+async def create_categories(
+    *,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    categories_in: Annotated[List[CategoryCreate], BatchBody],
+):
+    """
+    **Создает несколько категорий текущего пользователя одним запросом.**
+
+    Args:
+        session (AsyncSessionDep): Сессия базы данных.
+        current_user (AsyncCurrentUser): Текущий авторизованный пользователь.
+        categories_in (List[CategoryCreate]): Данные новых категорий.
+
+    Returns:
+        List[CategorySchema]: Созданные категории в порядке переданных данных.
+
+    Raises:
+        HTTPException: Если у пользователя уже есть категория с таким названием.
+    """
+    try:
+        categories = await session.run_sync(
+            crud.category.create_many, objs_in=categories_in, user_id=current_user.id
+        )
+    except IntegrityError:
+        raise HTTPException(status_code=400, detail=DUPLICATE_MESSAGE)
+    return categories
+
+
+@router.put("/batch", response_model=List[CategorySchema])
+async def update_categories(
+    *,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    categories_in: Annotated[List[CategoryBatchUpdate], BatchBody],
+):
+    """
+    **Обновляет несколько категорий текущего пользователя одним запросом.**
+
+    Изменения применяются ко всем категориям или не применяются вовсе.
+
+    Args:
+        session (AsyncSessionDep): Сессия базы данных.
+        current_user (AsyncCurrentUser): Текущий авторизованный пользователь.
+        categories_in (List[CategoryBatchUpdate]): Данные обновления с id категорий.
+
+    Returns:
+        List[CategorySchema]: Обновленные категории в порядке возрастания id.
+
+    Raises:
+        HTTPException: Если категория не найдена, принадлежит другому пользователю
+            или у пользователя уже есть категория с таким названием.
+    """
+    await session.run_sync(
+        crud.category.get_many_owned,
+        [category_in.id for category_in in categories_in],
+        current_user.id,
+        not_found_detail=NOT_FOUND_MESSAGE,
+        forbidden_status=400,
+        forbidden_detail="Пользователь не может изменить не свою категорию",
+    )
+    try:
+        categories = await session.run_sync(
+            crud.category.update_many, objs_in=categories_in, user_id=current_user.id
+        )
+    except IntegrityError:
+        raise HTTPException(status_code=400, detail=DUPLICATE_MESSAGE)
+    return categories
+
+
+@router.delete("/batch")
+async def delete_categories(
+    *,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    ids: BatchIds,
+):
+    """
+    **Удаляет несколько категорий текущего пользователя одним запросом.**
+
+    Args:
+        session (AsyncSessionDep): Сессия базы данных.
+        current_user (AsyncCurrentUser): Текущий авторизованный пользователь.
+        ids (List[int]): Идентификаторы удаляемых категорий.
+
+    Returns:
+        str: Сообщение об удалении категорий.
+
+    Raises:
+        HTTPException: Если категория не найдена или принадлежит другому пользователю.
+    """
+    await session.run_sync(
+        crud.category.get_many_owned,
+        ids,
+        current_user.id,
+        not_found_detail=NOT_FOUND_MESSAGE,
+        forbidden_status=400,
+        forbidden_detail="Пользователь не может удалить не свою категорию",
+    )
+    categories = await session.run_sync(
+        crud.category.remove_many, ids=ids, user_id=current_user.id
+    )
+    return f"Удалено категорий: {len(categories)}"
 
 
 @router.get("/{id}", response_model=CategorySchema)
-def get_category(*, session: SessionDep, current_user: CurrentUser, id: int):
+async def get_category(
+    *,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    id: int,
+):
     """
     **Получает информацию о категории по её id.**
 
     Args:
-        session (SessionDep): Сессия базы данных.
-        current_user (CurrentUser): Текущий авторизованный пользователь.
+        session (AsyncSessionDep): Сессия базы данных.
+        current_user (AsyncCurrentUser): Текущий авторизованный пользователь.
         id (int): Идентификатор категории.
 
     Returns:
@@ -27,60 +147,74 @@ def get_category(*, session: SessionDep, current_user: CurrentUser, id: int):
     Raises:
         HTTPException: Если категория не найдена или если пользователь пытается получить категорию не своего пользователя.
     """
-    category = crud.category.get(session, id)
-
-    if not category:
-        raise HTTPException(status_code=404, detail=NOT_FOUND_MESSAGE)
-
-    if category.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Недостаточно прав")
+    category = await crud.category.aget_owned(
+        session, id, current_user.id, not_found_detail=NOT_FOUND_MESSAGE
+    )
 
     return category
 
 
 @router.get("/", response_model=List[CategorySchema])
-def get_categories(*, session: SessionDep, current_user: CurrentUser):
+async def get_categories(
+    *,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+):
     """
     **Получает список категорий для текущего пользователя.**
 
     Args:
-        session (Session, optional): Сессия базы данных. Defaults to Depends(get_session).
-        current_user (CurrentUser): Текущий авторизованный пользователь.
+        session (AsyncSessionDep): Сессия базы данных.
+        current_user (AsyncCurrentUser): Текущий авторизованный пользователь.
 
     Returns:
         List[CategorySchema]: Список категорий пользователя.
     """
     categories = (
-        session.query(Category).where(Category.user_id == current_user.id).all()
-    )
+        await session.scalars(
+            select(Category).where(Category.user_id == current_user.id)
+        )
+    ).all()
     return categories
 
 
-@router.post(
-    "/", response_model=CategorySchema
-)
-def create_category(
-    *, session: SessionDep, category_in: CategoryCreate, current_user: CurrentUser
+@router.post("/", response_model=CategorySchema)
+async def create_category(
+    *,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    category_in: CategoryCreate,
 ):
     """
     **Создает новую категорию для текущего пользователя.**
 
     Args:
-        session (Session, optional): Сессия базы данных. Defaults to Depends(get_session).
+        session (AsyncSessionDep): Сессия базы данных.
+        current_user (AsyncCurrentUser): Текущий авторизованный пользователь.
         category_in (CategoryCreate): Данные для создания новой категории.
 
     Returns:
         CategorySchema: Созданная категория.
+
+    Raises:
+        HTTPException: Если у пользователя уже есть категория с таким названием.
     """
-    category = crud.category.create(db=session, obj_in=category_in, user_id=current_user.id)
+    if category_in.name and await crud.category.aget_by_name(
+        session, user_id=current_user.id, name=category_in.name
+    ):
+        raise HTTPException(status_code=400, detail=DUPLICATE_MESSAGE)
+
+    category = await crud.category.acreate(
+        db=session, obj_in=category_in, user_id=current_user.id
+    )
     return category
 
 
 @router.put("/{category_id}", response_model=CategorySchema)
-def update_category(
+async def update_category(
     *,
-    session: SessionDep,
-    current_user: CurrentUser,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
     category_id: int,
     category_in: CategoryUpdate,
 ):
@@ -88,8 +222,8 @@ def update_category(
     **Обновляет существующую категорию для текущего пользователя.**
 
     Args:
-        session (Session, optional): Сессия базы данных. Defaults to Depends(get_session).
-        current_user (CurrentUser): Текущий авторизованный пользователь.
+        session (AsyncSessionDep): Сессия базы данных.
+        current_user (AsyncCurrentUser): Текущий авторизованный пользователь.
         category_id (int): Идентификатор обновляемой категории.
         category_in (CategoryUpdate): Данные для обновления категории.
 
@@ -97,33 +231,43 @@ def update_category(
         CategorySchema: Обновленная категория.
 
     Raises:
-        HTTPException: Если категория не найдена или пользователь пытается изменить чужую категорию.
-    """
-    category = crud.category.get(session, category_id)
-    if not category:
-        raise HTTPException(status_code=404, detail=NOT_FOUND_MESSAGE)
-    if category.user_id != current_user.id:
-        raise HTTPException(
-            status_code=400, detail="Пользователь не может изменить не свою категорию"
+        HTTPException: Если категория не найдена, пользователь пытается изменить чужую категорию
+            или у пользователя уже есть категория с таким названием.
+    """
+    category = await crud.category.aget_owned(
+        session,
+        category_id,
+        current_user.id,
+        not_found_detail=NOT_FOUND_MESSAGE,
+        forbidden_status=400,
+        forbidden_detail="Пользователь не может изменить не свою категорию",
+    )
+    if (
+        category_in.name
+        and category_in.name.lower() != category.name.lower()
+        and await crud.category.aget_by_name(
+            session, user_id=current_user.id, name=category_in.name
         )
+    ):
+        raise HTTPException(status_code=400, detail=DUPLICATE_MESSAGE)
 
-    category = crud.category.update(session, db_obj=category, obj_in=category_in)
+    category = await crud.category.aupdate(session, db_obj=category, obj_in=category_in)
     return category
 
 
 @router.delete("/{category_id}")
-def delete_category(
+async def delete_category(
     *,
-    session: SessionDep,
-    current_user: CurrentUser,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
     category_id: int,
 ):
     """
     **Удаляет категорию для текущего пользователя.**
 
     Args:
-        session (Session, optional): Сессия базы данных. Defaults to Depends(get_session).
-        current_user (CurrentUser): Текущий авторизованный пользователь.
+        session (AsyncSessionDep): Сессия базы данных.
+        current_user (AsyncCurrentUser): Текущий авторизованный пользователь.
         category_id (int): Идентификатор удаляемой категории.
 
     Returns:
@@ -132,13 +276,14 @@ def delete_category(
     Raises:
         HTTPException: Если категория не найдена или пользователь пытается удалить чужую категорию.
     """
-    category = crud.category.get(session, category_id)
-    if not category:
-        raise HTTPException(status_code=404, detail=NOT_FOUND_MESSAGE)
-    if category.user_id != current_user.id:
-        raise HTTPException(
-            status_code=400, detail="Пользователь не может удалить не свою категорию"
-        )
+    category = await crud.category.aget_owned(
+        session,
+        category_id,
+        current_user.id,
+        not_found_detail=NOT_FOUND_MESSAGE,
+        forbidden_status=400,
+        forbidden_detail="Пользователь не может удалить не свою категорию",
+    )
 
-    crud.category.remove(session, id=category_id)
+    await crud.category.aremove(session, id=category_id)
     return f"Категория: {category.name} удалена"
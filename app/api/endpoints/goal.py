@@ -1,10 +1,17 @@
-from typing import List
+from typing import Annotated, List
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter
+from sqlalchemy import select
 
 from app.models.goal import Goal
-from app.schemas.goal import GoalSchema, GoalCreate, GoalUpdate, GoalUpdateAmount
-from app.api.deps import CurrentUser, SessionDep
+from app.schemas.goal import (
+    GoalSchema,
+    GoalCreate,
+    GoalUpdate,
+    GoalBatchUpdate,
+    GoalUpdateAmount,
+)
+from app.api.deps import AsyncCurrentUser, AsyncSessionDep, BatchBody, BatchIds
 from app import crud
 
 router = APIRouter()
@@ -12,14 +19,115 @@ router = APIRouter()
 NOT_FOUND_MESSAGE = "Цель не найдена"
 
 
+@router.post("/batch", response_model=List[GoalSchema])
+async def create_goals(
+    *,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    goals_in: Annotated[List[GoalCreate], BatchBody],
+):
+    """
+    **Создает несколько целей текущего пользователя одним запросом.**
+
+    Args:
+        session (AsyncSessionDep): Сессия базы данных.
+        current_user (AsyncCurrentUser): Текущий авторизованный пользователь.
+        goals_in (List[GoalCreate]): Данные новых целей.
+
+    Returns:
+        List[GoalSchema]: Созданные цели в порядке переданных данных.
+    """
+    goals = await session.run_sync(
+        crud.goal.create_many, objs_in=goals_in, user_id=current_user.id
+    )
+    return goals
+
+
+@router.put("/batch", response_model=List[GoalSchema])
+async def update_goals(
+    *,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    goals_in: Annotated[List[GoalBatchUpdate], BatchBody],
+):
+    """
+    **Обновляет несколько целей текущего пользователя одним запросом.**
+
+    Изменения применяются ко всем целям или не применяются вовсе.
+
+    Args:
+        session (AsyncSessionDep): Сессия базы данных.
+        current_user (AsyncCurrentUser): Текущий авторизованный пользователь.
+        goals_in (List[GoalBatchUpdate]): Данные обновления с id целей.
+
+    Returns:
+        List[GoalSchema]: Обновленные цели в порядке возрастания id.
+
+    Raises:
+        HTTPException: Если цель не найдена или принадлежит другому пользователю.
+    """
+    await session.run_sync(
+        crud.goal.get_many_owned,
+        [goal_in.id for goal_in in goals_in],
+        current_user.id,
+        not_found_detail=NOT_FOUND_MESSAGE,
+        forbidden_status=400,
+        forbidden_detail="Пользователь не может изменить не свою цель",
+    )
+    goals = await session.run_sync(
+        crud.goal.update_many, objs_in=goals_in, user_id=current_user.id
+    )
+    return goals
+
+
+@router.delete("/batch")
+async def delete_goals(
+    *,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    ids: BatchIds,
+):
+    """
+    **Удаляет несколько целей текущего пользователя одним запросом.**
+
+    Args:
+        session (AsyncSessionDep): Сессия базы данных.
+        current_user (AsyncCurrentUser): Текущий авторизованный пользователь.
+        ids (List[int]): Идентификаторы удаляемых целей.
+
+    Returns:
+        str: Сообщение об удалении целей.
+
+    Raises:
+        HTTPException: Если цель не найдена или принадлежит другому пользователю.
+    """
+    await session.run_sync(
+        crud.goal.get_many_owned,
+        ids,
+        current_user.id,
+        not_found_detail=NOT_FOUND_MESSAGE,
+        forbidden_status=400,
+        forbidden_detail="Пользователь не может удалить не свою цель",
+    )
+    goals = await session.run_sync(
+        crud.goal.remove_many, ids=ids, user_id=current_user.id
+    )
+    return f"Удалено целей: {len(goals)}"
+
+
 @router.get("/{id}", response_model=GoalSchema)
-def get_goal(*, session: SessionDep, current_user: CurrentUser, id: int):
+async def get_goal(
+    *,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    id: int,
+):
     """
     **Получает информацию о цели по её ID.**
 
     Args:
-        session (SessionDep): Сессия базы данных.
-        current_user (CurrentUser): Текущий авторизованный пользователь.
+        session (AsyncSessionDep): Сессия базы данных.
+        current_user (AsyncCurrentUser): Текущий авторизованный пользователь.
         id (int): Идентификатор цели.
 
     Returns:
@@ -28,54 +136,62 @@ def get_goal(*, session: SessionDep, current_user: CurrentUser, id: int):
     Raises:
         HTTPException: Если цель не найдена или если пользователь пытается получить цель не своего пользователя.
     """
-    goal = crud.goal.get(session, id)
-
-    if not goal:
-        raise HTTPException(status_code=404, detail=NOT_FOUND_MESSAGE)
-
-    if goal.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Недостаточно прав")
+    goal = await crud.goal.aget_owned(
+        session, id, current_user.id, not_found_detail=NOT_FOUND_MESSAGE
+    )
 
     return goal
 
 
 @router.get("/", response_model=List[GoalSchema])
-def get_goals(*, session: SessionDep, current_user: CurrentUser):
+async def get_goals(
+    *,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+):
     """
     **Получает список категорий для текущего пользователя.**
 
     Args:
-        session (Session, optional): Сессия базы данных. Defaults to Depends(get_session).
-        current_user (CurrentUser): Текущий авторизованный пользователь.
+        session (AsyncSessionDep): Сессия базы данных.
+        current_user (AsyncCurrentUser): Текущий авторизованный пользователь.
 
     Returns:
         List[GoalSchema]: Список целей пользователя.
     """
-    goals = session.query(Goal).where(Goal.user_id == current_user.id).all()
+    goals = (
+        await session.scalars(select(Goal).where(Goal.user_id == current_user.id))
+    ).all()
     return goals
 
 
 @router.post("/", response_model=GoalSchema)
-def create_goal(*, session: SessionDep, goal_in: GoalCreate, current_user: CurrentUser):
+async def create_goal(
+    *,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    goal_in: GoalCreate,
+):
     """
     **Создает новую цель для текущего пользователя.**
 
     Args:
-        session (Session, optional): Сессия базы данных. Defaults to Depends(get_session).
+        session (AsyncSessionDep): Сессия базы данных.
+        current_user (AsyncCurrentUser): Текущий авторизованный пользователь.
         goal_in (GoalCreate): Данные для создания новой цели.
 
     Returns:
         GoalSchema: Созданная цель.
     """
-    goal = crud.goal.create(db=session, obj_in=goal_in, user_id=current_user.id)
+    goal = await crud.goal.acreate(session, obj_in=goal_in, user_id=current_user.id)
     return goal
 
 
 @router.put("/{goal_id}", response_model=GoalSchema)
-def update_goal(
+async def update_goal(
     *,
-    session: SessionDep,
-    current_user: CurrentUser,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
     goal_id: int,
     goal_in: GoalUpdate,
 ):
@@ -83,8 +199,8 @@ def update_goal(
     **Обновляет существующую цель для текущего пользователя.**
 
     Args:
-        session (Session, optional): Сессия базы данных. Defaults to Depends(get_session).
-        current_user (CurrentUser): Текущий авторизованный пользователь.
+        session (AsyncSessionDep): Сессия базы данных.
+        current_user (AsyncCurrentUser): Текущий авторизованный пользователь.
         goal_id (int): Идентификатор обновляемой цели.
         goal_in (GoalUpdate): Данные для обновления цели.
 
@@ -94,23 +210,24 @@ def update_goal(
     Raises:
         HTTPException: Если цель не найдена или пользователь пытается изменить чужую цель.
     """
-    goal = crud.goal.get(session, goal_id)
-    if not goal:
-        raise HTTPException(status_code=404, detail=NOT_FOUND_MESSAGE)
-    if goal.user_id != current_user.id:
-        raise HTTPException(
-            status_code=400, detail="Пользователь не может изменить не свою цель"
-        )
+    goal = await crud.goal.aget_owned(
+        session,
+        goal_id,
+        current_user.id,
+        not_found_detail=NOT_FOUND_MESSAGE,
+        forbidden_status=400,
+        forbidden_detail="Пользователь не может изменить не свою цель",
+    )
 
-    goal = crud.goal.update(session, db_obj=goal, obj_in=goal_in)
+    goal = await crud.goal.aupdate(session, db_obj=goal, obj_in=goal_in)
     return goal
 
 
 @router.put("/add_accumulated_amount/{goal_id}", response_model=GoalSchema)
-def add_accumulated_amount(
+async def add_accumulated_amount(
     *,
-    session: SessionDep,
-    current_user: CurrentUser,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
     goal_id: int,
     goal_in: GoalUpdateAmount,
 ):
@@ -118,8 +235,8 @@ def add_accumulated_amount(
     **Добавляет накопленную сумму к текущей сумме цели.**
 
     Args:
-        session (Session, optional): Сессия базы данных. Defaults to Depends(get_session).
-        current_user (CurrentUser): Текущий авторизованный пользователь.
+        session (AsyncSessionDep): Сессия базы данных.
+        current_user (AsyncCurrentUser): Текущий авторизованный пользователь.
         goal_id (int): Идентификатор цели, к которой добавляется сумма.
         goal_in (GoalUpdateAmount): Данные для добавления суммы.
 
@@ -129,33 +246,32 @@ def add_accumulated_amount(
     Raises:
         HTTPException: Если цель не найдена или пользователь пытается изменить чужую цель.
     """
-    goal = crud.goal.get(session, goal_id)
-    if not goal:
-        raise HTTPException(status_code=404, detail=NOT_FOUND_MESSAGE)
-    if goal.user_id != current_user.id:
-        raise HTTPException(
-            status_code=400, detail="Пользователь не может изменить не свою цель"
-        )
-
-    goal = crud.goal.add_accumulated_amount(
-        session, db_obj=goal, obj_in=goal_in, goal_id=goal_id
+    goal = await crud.goal.aget_owned(
+        session,
+        goal_id,
+        current_user.id,
+        not_found_detail=NOT_FOUND_MESSAGE,
+        forbidden_status=400,
+        forbidden_detail="Пользователь не может изменить не свою цель",
     )
+
+    goal = await crud.goal.aadd_accumulated_amount(session, db_obj=goal, obj_in=goal_in)
     return goal
 
 
 @router.delete("/{goal_id}")
-def delete_goal(
+async def delete_goal(
     *,
-    session: SessionDep,
-    current_user: CurrentUser,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
     goal_id: int,
 ):
     """
     **Удаляет цель текущего пользователя.**
 
     Args:
-        session (Session, optional): Сессия базы данных. Defaults to Depends(get_session).
-        current_user (CurrentUser): Текущий авторизованный пользователь.
+        session (AsyncSessionDep): Сессия базы данных.
+        current_user (AsyncCurrentUser): Текущий авторизованный пользователь.
         goal_id (int): Идентификатор удаляемой цели.
 
     Returns:
@@ -164,13 +280,14 @@ def delete_goal(
     Raises:
         HTTPException: Если цель не найдена или пользователь пытается удалить чужую цель.
     """
-    goal = crud.goal.get(session, goal_id)
-    if not goal:
-        raise HTTPException(status_code=404, detail=NOT_FOUND_MESSAGE)
-    if goal.user_id != current_user.id:
-        raise HTTPException(
-            status_code=400, detail="Пользователь не может удалить не свою цель"
-        )
+    goal = await crud.goal.aget_owned(
+        session,
+        goal_id,
+        current_user.id,
+        not_found_detail=NOT_FOUND_MESSAGE,
+        forbidden_status=400,
+        forbidden_detail="Пользователь не может удалить не свою цель",
+    )
 
-    crud.goal.remove(session, id=goal_id)
+    await crud.goal.aremove(session, id=goal_id)
     return f"Цель: {goal.name} удалена"
@@ -0,0 +1,23 @@
+from fastapi import APIRouter
+
+from app.db.database import async_engine, engine, pool_stats
+
+router = APIRouter()
+
+
+@router.get("/metrics/pool")
+def get_pool_metrics():
+    """
+    **Состояние пулов соединений текущего воркера.**
+
+    Для каждого движка (sync и async) возвращает размер пула, число выданных
+    и свободных соединений, overflow, счётчики событий пула, таймауты
+    и время ожидания соединения.
+
+    Returns:
+        dict: Метрики пулов по ключам 'sync' и 'async'.
+    """
+    return {
+        "sync": pool_stats["sync"].snapshot(engine.pool),
+        "async": pool_stats["async"].snapshot(async_engine.sync_engine.pool),
+    }
@@ -1,64 +1,204 @@
-from typing import List, Optional
+from typing import Annotated, List, Optional
 from datetime import datetime
-from copy import deepcopy
+from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, UploadFile
+from fastapi.responses import StreamingResponse
 
 from app.schemas.transaction import (
     TransactionSchema,
     TransactionCreate,
     TransactionUpdate,
-    TransactionsOut,
     TransactionTransferCreate,
+    TransactionImportResult,
+    TransactionsPage,
+    TransferSchema,
+)
+from app.crud.crud_category import TRANSFER_CATEGORY_NAME
+from app.api.deps import (
+    AsyncCurrentUser,
+    AsyncSessionDep,
+    BatchBody,
+    SessionDep,
+    CurrentUser,
 )
-from app.schemas.category import CategoryCreate
-from app.api.deps import SessionDep, get_current_user, CurrentUser
 from app import crud
+from app.utils import transaction_io
+from app.utils.utils import encode_cursor, decode_cursor
 
 router = APIRouter()
 
 NOT_FOUND_MESSAGE = "Транзакция не найдена"
+TRANSFER_LEG_MESSAGE = "Транзакция является частью перевода, отмените перевод целиком"
 
 
-@router.get(
-    "/{id}",
-    dependencies=[Depends(get_current_user)],
-    response_model=Optional[TransactionSchema],
-)
-def get_transaction(*, session: SessionDep, id: int, current_user: CurrentUser):
+# Выгрузка и импорт остаются синхронными: строки читаются из серверного курсора
+# и из файла по одной, поэтому обработчики работают в пуле потоков
+# и не блокируют цикл событий
+@router.get("/export", response_class=StreamingResponse)
+def export_transactions(
+    *,
+    session: SessionDep,
+    current_user: CurrentUser,
+    format: str = Query(
+        transaction_io.CSV_FORMAT,
+        pattern="^(csv|ndjson)$",
+        description="Формат выгрузки: 'csv' или 'ndjson'",
+    ),
+    account_id: Optional[int] = Query(None),
+    begin_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    transaction_type: Optional[str] = Query(
+        None,
+        description="Фильтрует транзакции по типу: 'income' - доходы или 'expense' - расходы",
+    ),
+):
     """
-    **Получает информацию о транзакции по её id.**
+    **Выгружает транзакции текущего пользователя в формате CSV или NDJSON.**
+
+    Ответ передаётся потоком: транзакции читаются из базы серверным курсором и сразу
+    отправляются клиенту, поэтому потребление памяти не зависит от размера истории.
 
     Args:
         session (Session, optional): Сессия базы данных. Defaults to Depends(get_session).
-        id (int): Идентификатор транзакции.
         current_user (CurrentUser): Текущий авторизованный пользователь.
+        format (str, optional): Формат выгрузки: 'csv' или 'ndjson'. Defaults to 'csv'.
+        account_id (Optional[int], optional): Идентификатор счёта. Defaults to None.
+        begin_date (Optional[datetime], optional): Начальная дата фильтрации. Defaults to None.
+        end_date (Optional[datetime], optional): Конечная дата фильтрации. Defaults to None.
+        transaction_type (Optional[str], optional): Тип транзакции для фильтрации: 'income' - доходы, 'expense' - расходы. Defaults to None.
 
     Returns:
-        Optional[TransactionSchema]: Информация о транзакции.
+        StreamingResponse: Файл с транзакциями.
+    """
+    rows = crud.transaction.stream_filtered_transactions(
+        session,
+        user_id=current_user.id,
+        account_id=account_id,
+        begin_date=begin_date,
+        end_date=end_date,
+        transaction_type=transaction_type,
+    )
+    if format == transaction_io.NDJSON_FORMAT:
+        content = transaction_io.iter_ndjson_export(rows)
+    else:
+        content = transaction_io.iter_csv_export(rows)
+
+    def stream():
+        # Зависимость get_session завершается до отправки тела ответа,
+        # поэтому сессию закрывает сам поток после выгрузки
+        try:
+            yield from content
+        finally:
+            session.close()
+
+    return StreamingResponse(
+        stream(),
+        media_type=transaction_io.MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="transactions.{format}"'
+        },
+    )
+
+
+@router.get("/transfers", response_model=List[TransferSchema])
+async def get_transfers(
+    *,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    account_id: Optional[int] = Query(None),
+    limit: int = Query(50, ge=1, le=500),
+):
+    """
+    **Получает переводы между счетами текущего пользователя.**
+
+    Каждый перевод возвращается одной строкой: `amount` - изменение баланса счёта `account_id`,
+    счёт `to_account_id` получил сумму с противоположным знаком.
+
+    Args:
+        session (AsyncSessionDep): Сессия базы данных.
+        current_user (AsyncCurrentUser): Текущий авторизованный пользователь.
+        account_id (Optional[int], optional): Только переводы с участием счёта. Defaults to None.
+        limit (int, optional): Максимальное количество переводов. Defaults to 50.
+
+    Returns:
+        List[TransferSchema]: Переводы от новых к старым.
+    """
+    return await session.run_sync(
+        crud.transaction.get_transfers,
+        user_id=current_user.id,
+        account_id=account_id,
+        limit=limit,
+    )
+
+
+@router.delete("/transfers/{transfer_group_id}")
+async def reverse_transfer(
+    *,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    transfer_group_id: UUID,
+):
+    """
+    **Отменяет перевод: удаляет обе проводки и возвращает балансы счетов.**
+
+    Args:
+        session (AsyncSessionDep): Сессия базы данных.
+        current_user (AsyncCurrentUser): Текущий авторизованный пользователь.
+        transfer_group_id (UUID): Идентификатор перевода.
+
+    Returns:
+        str: Сообщение об отмене перевода.
 
     Raises:
-        HTTPException: Если транзакция не найдена или если пользователь пытается получить транзакцию не своего счёта.
+        HTTPException: Если перевод не найден или принадлежит другому пользователю.
     """
-    transaction = crud.transaction.get(session, id)
+    try:
+        await session.run_sync(
+            crud.transaction.reverse_transfer,
+            transfer_group_id=transfer_group_id,
+            user_id=current_user.id,
+        )
+        return "Перевод отменён"
+    except HTTPException as e:
+        raise e from e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Произошла ошибка: {e}") from e
+
+
+@router.get("/{id}", response_model=Optional[TransactionSchema])
+async def get_transaction(
+    *,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    id: int,
+):
+    """
+    **Получает информацию о транзакции по её id.**
 
-    if not transaction:
-        raise HTTPException(status_code=404, detail=NOT_FOUND_MESSAGE)
+    Args:
+        session (AsyncSessionDep): Сессия базы данных.
+        current_user (AsyncCurrentUser): Текущий авторизованный пользователь.
+        id (int): Идентификатор транзакции.
+
+    Returns:
+        Optional[TransactionSchema]: Информация о транзакции.
 
-    if transaction.account.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Недостаточно прав")
+    Raises:
+        HTTPException: Если транзакция не найдена или если пользователь пытается получить транзакцию не своего счёта.
+    """
+    transaction = await crud.transaction.aget_owned(
+        session, id, current_user.id, not_found_detail=NOT_FOUND_MESSAGE
+    )
 
     return transaction
 
 
-@router.get(
-    "/account_transactions/{account_id}",
-    dependencies=[Depends(get_current_user)],
-    response_model=List[TransactionsOut],
-)
-def get_account_transactions(
+@router.get("/account_transactions/{account_id}", response_model=TransactionsPage)
+async def get_account_transactions(
     *,
-    session: SessionDep,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
     account_id: int,
     begin_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
@@ -66,38 +206,83 @@ def get_account_transactions(
         None,
         description="Фильтрует транзакции по типу: 'income' - доходы или 'expense' - расходы",
     ),
+    limit: int = Query(50, ge=1, le=500, description="Размер страницы"),
+    cursor: Optional[str] = Query(
+        None, description="Курсор следующей страницы из поля next_cursor"
+    ),
 ):
     """
-    **Получает список транзакций для указанного счёта с возможностью фильтрации.**
+    **Получает страницу транзакций для указанного счёта с возможностью фильтрации.**
+
+    Транзакции отсортированы по дате и id по убыванию. Для получения следующей страницы
+    передайте значение `next_cursor` из ответа в параметр `cursor`.
 
     Args:
-        session (Session, optional): Сессия базы данных. Defaults to Depends(get_session).
+        session (AsyncSessionDep): Сессия базы данных.
+        current_user (AsyncCurrentUser): Текущий авторизованный пользователь.
         account_id (int): Идентификатор счёта.
         begin_date (Optional[datetime], optional): Начальная дата фильтрации. Defaults to None.
         end_date (Optional[datetime], optional): Конечная дата фильтрации. Defaults to None.
         transaction_type (Optional[str], optional): Тип транзакции для фильтрации: 'income' - доходы, 'expense' - расходы. Defaults to None.
+        limit (int, optional): Размер страницы. Defaults to 50.
+        cursor (Optional[str], optional): Курсор следующей страницы. Defaults to None.
 
     Returns:
-        List[TransactionsOut]: Список транзакций.
+        TransactionsPage: Страница транзакций и курсор следующей страницы.
 
     Raises:
-        HTTPException: Если произошла ошибка при получении транзакций.
+        HTTPException: Если курсор некорректен, счёт не найден или принадлежит другому пользователю.
     """
-    return crud.transaction.get_filtered_transactions(
-        session, account_id, begin_date, end_date, transaction_type
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+
+    transactions = await session.run_sync(
+        crud.transaction.get_filtered_transactions,
+        account_id,
+        begin_date,
+        end_date,
+        transaction_type,
+        limit=limit + 1,
+        after=after,
+        user_id=current_user.id,
     )
+    if not transactions:
+        # Владелец уже проверен фильтром запроса; пустая страница может означать
+        # чужой или несуществующий счёт, поэтому ошибку уточняем отдельным запросом.
+        await crud.account.aget_owned(
+            session,
+            account_id,
+            current_user.id,
+            not_found_detail="Счёт не найден",
+            forbidden_status=400,
+            forbidden_detail="Пользователь не может получить транзакции не своего счёта",
+        )
+    next_cursor = None
+    if len(transactions) > limit:
+        transactions = transactions[:limit]
+        last = transactions[-1]
+        next_cursor = encode_cursor(last.date, last.id)
+    return TransactionsPage(items=transactions, next_cursor=next_cursor)
 
 
-@router.post(
-    "/", dependencies=[Depends(get_current_user)], response_model=TransactionSchema
-)
-def create_transaction(*, session: SessionDep, transaction_in: TransactionCreate):
+@router.post("/", response_model=TransactionSchema)
+async def create_transaction(
+    *,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    transaction_in: TransactionCreate,
+):
     """
     **Создает новую транзакцию для текущего пользователя.
     Если amount положительная - доход. Если amount отрицательная - расход**
 
     Args:
-        session (Session, optional): Сессия базы данных. Defaults to Depends(get_session).
+        session (AsyncSessionDep): Сессия базы данных.
+        current_user (AsyncCurrentUser): Текущий авторизованный пользователь.
         transaction_in (TransactionCreate): Данные для создания новой транзакции.
 
     Returns:
@@ -107,7 +292,9 @@ def create_transaction(*, session: SessionDep, transaction_in: TransactionCreate
         HTTPException: В случае ошибки при создании транзакции.
     """
     try:
-        transaction = crud.transaction.create(db=session, obj_in=transaction_in)
+        transaction = await session.run_sync(
+            crud.transaction.create, obj_in=transaction_in
+        )
         return transaction
     except HTTPException as e:
         raise e from e
@@ -115,11 +302,99 @@ def create_transaction(*, session: SessionDep, transaction_in: TransactionCreate
         raise HTTPException(status_code=500, detail=f"Произошла ошибка: {e}") from e
 
 
-@router.put("/{transaction_id}", response_model=TransactionSchema)
-def update_transaction(
+@router.post("/bulk", response_model=TransactionImportResult)
+async def create_transactions_bulk(
+    *,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    transactions_in: Annotated[List[TransactionCreate], BatchBody],
+):
+    """
+    **Массово создает транзакции текущего пользователя из JSON-массива.**
+
+    Массив разбирается в памяти целиком, поэтому его размер ограничен BATCH_MAX_SIZE.
+    Большие выписки загружайте через `/transaction/import`: файл читается потоком.
+
+    Args:
+        session (AsyncSessionDep): Сессия базы данных.
+        current_user (AsyncCurrentUser): Текущий авторизованный пользователь.
+        transactions_in (List[TransactionCreate]): Данные новых транзакций.
+
+    Returns:
+        TransactionImportResult: Количество созданных транзакций и новые балансы счетов.
+
+    Raises:
+        HTTPException: Если счёт или категория не принадлежат пользователю, или произошла ошибка при импорте.
+    """
+    try:
+        count, balances = await session.run_sync(
+            crud.transaction.import_transactions,
+            obj_in=transactions_in,
+            user_id=current_user.id,
+        )
+        return TransactionImportResult(count=count, balances=balances)
+    except HTTPException as e:
+        raise e from e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Произошла ошибка: {e}") from e
+
+
+@router.post("/import", response_model=TransactionImportResult)
+def import_transactions(
     *,
     session: SessionDep,
     current_user: CurrentUser,
+    file: UploadFile,
+    format: Optional[str] = Query(
+        None,
+        description="Формат файла: 'csv' или 'ndjson'. По умолчанию определяется по типу и имени файла",
+    ),
+):
+    """
+    **Импортирует транзакции текущего пользователя из CSV или NDJSON файла.**
+
+    Файл читается построчно и записывается пакетами, поэтому размер выписки не ограничен памятью.
+    CSV должен содержать заголовок `amount,date,description,category_id,account_id`.
+
+    Args:
+        session (Session, optional): Сессия базы данных. Defaults to Depends(get_session).
+        current_user (CurrentUser): Текущий авторизованный пользователь.
+        file (UploadFile): Файл выписки.
+        format (Optional[str], optional): Формат файла: 'csv' или 'ndjson'. Defaults to None.
+
+    Returns:
+        TransactionImportResult: Количество созданных транзакций и новые балансы счетов.
+
+    Raises:
+        HTTPException: Если формат не поддерживается, строка файла некорректна,
+        счёт или категория не принадлежат пользователю, или произошла ошибка при импорте.
+    """
+    file_format = format or transaction_io.detect_format(
+        file.content_type, file.filename
+    )
+    if file_format == transaction_io.CSV_FORMAT:
+        rows = transaction_io.iter_csv_transactions(file.file)
+    elif file_format == transaction_io.NDJSON_FORMAT:
+        rows = transaction_io.iter_ndjson_transactions(file.file)
+    else:
+        raise HTTPException(status_code=400, detail="Неподдерживаемый формат файла")
+
+    try:
+        count, balances = crud.transaction.import_transactions(
+            session, obj_in=rows, user_id=current_user.id
+        )
+        return TransactionImportResult(count=count, balances=balances)
+    except HTTPException as e:
+        raise e from e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Произошла ошибка: {e}") from e
+
+
+@router.put("/{transaction_id}", response_model=TransactionSchema)
+async def update_transaction(
+    *,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
     transaction_id: int,
     transaction_in: TransactionUpdate,
 ):
@@ -127,8 +402,8 @@ def update_transaction(
     **Обновляет существующую транзакцию пользователя.**
 
     Args:
-        session (Session, optional): Сессия базы данных. Defaults to Depends(get_session).
-        current_user (CurrentUser): Текущий авторизованный пользователь.
+        session (AsyncSessionDep): Сессия базы данных.
+        current_user (AsyncCurrentUser): Текущий авторизованный пользователь.
         transaction_id (int): Идентификатор транзакции.
         transaction_in (TransactionUpdate): Данные для обновления транзакции.
 
@@ -139,21 +414,21 @@ def update_transaction(
         HTTPException: Если транзакция не найдена, пользователь не может изменить транзакцию не своего счёта,
         или произошла ошибка при обновлении транзакции.
     """
-    transaction = crud.transaction.get(session, transaction_id)
-    if not transaction:
-        raise HTTPException(status_code=404, detail=NOT_FOUND_MESSAGE)
-
-    if transaction.account.user_id != current_user.id:
-        raise HTTPException(
-            status_code=400,
-            detail="Пользователь не может изменить транзакцию не своего счёта",
-        )
+    transaction = await crud.transaction.aget_owned(
+        session,
+        transaction_id,
+        current_user.id,
+        not_found_detail=NOT_FOUND_MESSAGE,
+        forbidden_status=400,
+        forbidden_detail="Пользователь не может изменить транзакцию не своего счёта",
+    )
+    if transaction.transfer_group_id:
+        raise HTTPException(status_code=400, detail=TRANSFER_LEG_MESSAGE)
 
     try:
-        transaction = crud.transaction.update(
-            session, db_obj=transaction, obj_in=transaction_in
+        transaction = await session.run_sync(
+            crud.transaction.update, db_obj=transaction, obj_in=transaction_in
         )
-        crud.account.update_balance(session, transaction.account_id)
         return transaction
     except HTTPException as e:
         raise e from e
@@ -162,18 +437,18 @@ def update_transaction(
 
 
 @router.delete("/{transaction_id}")
-def delete_transaction(
+async def delete_transaction(
     *,
-    session: SessionDep,
-    current_user: CurrentUser,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
     transaction_id: int,
 ):
     """
     **Удаляет транзакцию пользователя.**
 
     Args:
-        session (Session, optional): Сессия базы данных. Defaults to Depends(get_session).
-        current_user (CurrentUser): Текущий авторизованный пользователь.
+        session (AsyncSessionDep): Сессия базы данных.
+        current_user (AsyncCurrentUser): Текущий авторизованный пользователь.
         transaction_id (int): Идентификатор транзакции.
 
     Returns:
@@ -183,18 +458,18 @@ def delete_transaction(
         HTTPException: Если транзакция не найдена, пользователь не может удалить транзакцию не своего счёта,
         или произошла ошибка при удалении транзакции.
     """
-    transaction = crud.transaction.get(session, transaction_id)
-    if not transaction:
-        raise HTTPException(status_code=404, detail=NOT_FOUND_MESSAGE)
-
-    if transaction.account.user_id != current_user.id:
-        raise HTTPException(
-            status_code=400,
-            detail="Пользователь не может удалить транзакцию не своего счёта",
-        )
+    transaction = await crud.transaction.aget_owned(
+        session,
+        transaction_id,
+        current_user.id,
+        not_found_detail=NOT_FOUND_MESSAGE,
+        forbidden_status=400,
+        forbidden_detail="Пользователь не может удалить транзакцию не своего счёта",
+    )
+    if transaction.transfer_group_id:
+        raise HTTPException(status_code=400, detail=TRANSFER_LEG_MESSAGE)
     try:
-        crud.transaction.remove(session, id=transaction_id)
-        crud.account.update_balance(session, transaction.account_id)
+        await session.run_sync(crud.transaction.remove, id=transaction_id)
         return f"Транзакция на сумму: {transaction.amount}, выполненная: {transaction.date} удалена"
     except HTTPException as e:
         raise e from e
@@ -202,71 +477,41 @@ def delete_transaction(
         raise HTTPException(status_code=500, detail=f"Произошла ошибка: {e}") from e
 
 
-@router.post(
-    "/transfer_transaction",
-    response_model=str,
-)
-def create_transfer_transaction(
+@router.post("/transfer_transaction", response_model=str)
+async def create_transfer_transaction(
     *,
-    session: SessionDep,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
     transaction_in: TransactionTransferCreate,
-    current_user: CurrentUser,
 ):
     """
     **Создает новую транзакцию для перевода денег между счетами текущего пользователя.**
 
+    Обе проводки (`amount` для счёта отправителя, `-amount` для счёта получателя) и изменения
+    балансов фиксируются одной транзакцией базы данных, счета блокируются на время перевода.
+
     Args:
-        session (Session, optional): Сессия базы данных. Defaults to Depends(get_session).
-        transaction_in (TransactionCreate): Данные для создания новой транзакции.
-        current_user (CurrentUser): Текущий авторизованный пользователь.
+        session (AsyncSessionDep): Сессия базы данных.
+        current_user (AsyncCurrentUser): Текущий авторизованный пользователь.
+        transaction_in (TransactionTransferCreate): Данные перевода.
 
     Returns:
-        TransactionSchema: Созданная транзакция.
+        str: Сообщение о выполненном переводе.
 
     Raises:
-        HTTPException: В случае ошибки при создании транзакции.
+        HTTPException: Если счёт не найден, не принадлежит пользователю, счета совпадают
+            или в случае ошибки при создании транзакции.
     """
-    # Получает данные о счетах
-    account_from = crud.account.get(session, transaction_in.account_id)
-    if not account_from:
-        raise HTTPException(status_code=404, detail="Счёт отправитель не найден")
-
-    account_to = crud.account.get(session, transaction_in.to_account_id)
-    if not account_to:
-        raise HTTPException(status_code=404, detail="Счёт получатель не найден")
-
-    if account_from.user_id != current_user.id or account_to.user_id != current_user.id:
-        raise HTTPException(
-            status_code=400,
-            detail="Пользователь не может сделать перевод не для своих счетов",
-        )
-    # Проверяет наличие категории для перевода
-    translation_category = crud.category.get_by_name(session, "Перевод")
-    if not translation_category:
-        translation_category = crud.category.create(
-            db=session,
-            obj_in=CategoryCreate(name="Перевод", user_id=current_user.id),
-        )
-
-    # Добавялет идентификатор категории
-    transaction_in.category_id = translation_category.id
-    transaction_in_dump = transaction_in.model_dump()
-    # Убирает не валидное поле
-    transaction_in_dump.pop("to_account_id")
-
-    # Создаёт транзакцию для счёта отправителя
-    crud.transaction.create(db=session, obj_in=transaction_in_dump)
-
-    to_transaction_in = transaction_in.model_copy(deep=True)
-    to_transaction_in.amount = -transaction_in.amount
-    to_transaction_in.account_id = transaction_in.to_account_id
-    to_transaction_in_dump = transaction_in.model_dump()
-    to_transaction_in_dump.pop("to_account_id")
+    # Категория перевода текущего пользователя (создаётся при первом переводе)
+    transaction_in.category_id = await session.run_sync(
+        crud.category.get_system_category_id,
+        user_id=current_user.id,
+        name=TRANSFER_CATEGORY_NAME,
+    )
     try:
-
-        # Создаёт транзакцию для счёта получателя
-        crud.transaction.create(db=session, obj_in=to_transaction_in_dump)
-
+        account_from, account_to = await session.run_sync(
+            crud.transaction.transfer, obj_in=transaction_in, user_id=current_user.id
+        )
         return f"Перевод на сумму {transaction_in.amount}, {account_from.name} --> {account_to.name}, прошёл успешно"
     except HTTPException as e:
         raise e from e
@@ -1,9 +1,10 @@
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
 
 from app import crud
-from app.api.deps import get_current_user, CurrentUser, SessionDep
+from app.api.deps import get_current_user_async, AsyncCurrentUser, AsyncSessionDep
 from app.schemas.user import UserCreate, UserSchema, UserUpdate
 from app.models.user import User
 
@@ -11,29 +12,37 @@ router = APIRouter()
 
 
 @router.get(
-    "/", dependencies=[Depends(get_current_user)], response_model=List[UserSchema]
+    "/",
+    dependencies=[Depends(get_current_user_async)],
+    response_model=List[UserSchema],
 )
-def get_users(session: SessionDep):
+async def get_users(session: AsyncSessionDep):
     """
     **Получение списка пользователей.**
 
     Args:
-        session (Session, optional): Экземпляр сессии базы данных. Получается через зависимость.
+        session (AsyncSessionDep): Экземпляр асинхронной сессии базы данных. Получается через зависимость.
 
     Returns:
         List[UserSchema]: Список объектов с данными пользователей.
     """
-    users = session.query(User).all()
+    users = (await session.scalars(select(User))).all()
     return users
 
 
 @router.post("/", response_model=UserSchema)
-def create_user(*, session: SessionDep, user_in: UserCreate):
+async def create_user(
+    *,
+    session: AsyncSessionDep,
+    user_in: UserCreate,
+):
     """
     **Создание нового пользователя.**
 
+    Хэш пароля вычисляется в пуле bcrypt, обработчик ожидает его без блокировки цикла событий.
+
     Args:
-        session (Session, optional): Экземпляр сессии базы данных. Получается через зависимость.
+        session (AsyncSessionDep): Экземпляр асинхронной сессии базы данных. Получается через зависимость.
         user_in (UserCreate): Объект с данными нового пользователя.
 
     Returns:
@@ -42,31 +51,33 @@ def create_user(*, session: SessionDep, user_in: UserCreate):
     Raises:
         HTTPException: В случае, если пользователь с таким email уже существует, возникает исключение с кодом HTTP 400 Bad Request.
     """
-    user = crud.get_user_by_email(session=session, email=user_in.email)
+    user = await crud.aget_user_by_email(session=session, email=user_in.email)
     if user:
         raise HTTPException(
             status_code=400,
             detail="Пользователь с такой почтой уже существует",
         )
 
-    user = crud.user.create(db=session, obj_in=user_in)
+    user = await crud.user.acreate(session, obj_in=user_in)
     return user
 
 
 @router.put("/{user_id}", response_model=UserSchema)
-def update_user(
+async def update_user(
     *,
-    session: SessionDep,
-    current_user: CurrentUser,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
     user_id: int,
     user_in: UserUpdate,
 ):
     """
     **Обновление данных пользователя.**
 
+    Новый пароль хэшируется в пуле bcrypt без блокировки цикла событий.
+
     Args:
-        session (Session, optional): Экземпляр сессии базы данных. Получается через зависимость.
-        current_user (CurrentUser): Объект текущего авторизованного пользователя. Получается через зависимость.
+        session (AsyncSessionDep): Экземпляр асинхронной сессии базы данных. Получается через зависимость.
+        current_user (AsyncCurrentUser): Объект текущего авторизованного пользователя. Получается через зависимость.
         user_id (int): Уникальный идентификатор пользователя, данные которого нужно обновить.
         user_in (UserUpdate): Объект с обновленными данными пользователя.
 
@@ -77,7 +88,7 @@ def update_user(
         HTTPException: В случае, если пользователь не найден или текущий пользователь пытается изменить другого пользователя,
                        возникает исключение с кодом HTTP 404 Not Found или HTTP 400 Bad Request.
     """
-    user = crud.user.get(session, user_id)
+    user = await crud.user.aget(session, user_id)
     if not user:
         raise HTTPException(
             status_code=404,
@@ -89,18 +100,23 @@ def update_user(
             detail="Пользователь не может изменять другого пользователя",
         )
 
-    user = crud.user.update(session, db_obj=user, obj_in=user_in)
+    user = await crud.user.aupdate(session, db_obj=user, obj_in=user_in)
     return user
 
 
 @router.delete("/{user_id}")
-def delete_user(*, session: SessionDep, current_user: CurrentUser, user_id: int):
+async def delete_user(
+    *,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    user_id: int,
+):
     """
     **Удаление пользователя.**
 
     Args:
-        session (Session, optional): Экземпляр сессии базы данных. Получается через зависимость.
-        current_user (CurrentUser): Объект текущего авторизованного пользователя. Получается через зависимость.
+        session (AsyncSessionDep): Экземпляр асинхронной сессии базы данных. Получается через зависимость.
+        current_user (AsyncCurrentUser): Объект текущего авторизованного пользователя. Получается через зависимость.
         user_id (int): Уникальный идентификатор пользователя, которого нужно удалить.
 
     Returns:
@@ -110,7 +126,7 @@ def delete_user(*, session: SessionDep, current_user: CurrentUser, user_id: int)
         HTTPException: В случае, если пользователь не найден или текущий пользователь пытается удалить себя,
                        возникает исключение с кодом HTTP 404 Not Found или HTTP 400 Bad Request.
     """
-    user = crud.user.get(session, user_id)
+    user = await crud.user.aget(session, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="Пользователь не найден")
     if user_id == current_user.id:
@@ -118,5 +134,5 @@ def delete_user(*, session: SessionDep, current_user: CurrentUser, user_id: int)
             status_code=400, detail="Пользователь не может удалить себя"
         )
 
-    crud.user.remove(session, id=user_id)
+    await crud.user.aremove(session, id=user_id)
     return f"Пользователь: {user.name} удалён"
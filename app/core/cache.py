@@ -0,0 +1,144 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from app.core.config import settings
+
+
+class TTLCache:
+    """
+    Потокобезопасный кэш в памяти процесса с ограничением размера (LRU)
+    и временем жизни записей.
+
+    Args:
+        maxsize (int): Максимальное количество записей. При переполнении вытесняются
+            давно не использованные записи.
+        ttl (float): Время жизни записи по умолчанию в секундах.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Сохраняет значение. `ttl` переопределяет время жизни записи по умолчанию.
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class RedisCache:
+    """
+    Кэш в Redis (или совместимом хранилище) с тем же интерфейсом, что и TTLCache.
+    Значения хранятся в JSON, поэтому должны быть сериализуемыми.
+
+    Требует пакет `redis`, который импортируется только при создании кэша.
+
+    Args:
+        url (str): Адрес Redis, например `redis://localhost:6379/0`.
+        prefix (str): Префикс ключей.
+        ttl (float): Время жизни записи по умолчанию в секундах.
+    """
+
+    def __init__(self, url: str, prefix: str, ttl: float):
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self.ttl = ttl
+
+    def _key(self, key: Hashable) -> str:
+        return f"{self.prefix}:{key}"
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        value = self._client.get(self._key(key))
+        return None if value is None else json.loads(value)
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        self._client.set(self._key(key), json.dumps(value), px=int(ttl * 1000))
+
+    def delete(self, key: Hashable) -> None:
+        self._client.delete(self._key(key))
+
+    def clear(self) -> None:
+        keys = list(self._client.scan_iter(match=self._key("*")))
+        if keys:
+            self._client.delete(*keys)
+
+
+# Ключ session.info со списком записей кэша, которые нужно сбросить после commit
+PENDING_INVALIDATIONS = "cache_invalidations"
+
+
+def invalidate_after_commit(session: Any, cache: Any, key: Hashable) -> None:
+    """
+    Откладывает удаление записи кэша до фиксации транзакции сессии.
+
+    CRUD-методы выполняют только flush, поэтому до commit другие запросы читают
+    старую строку. Если сбросить запись сразу, такой запрос снова закэширует
+    старые данные на весь TTL.
+
+    Args:
+        session (Session | AsyncSession): Сессия, в транзакции которой изменены данные.
+        cache (TTLCache | RedisCache): Кэш.
+        key (Hashable): Ключ записи.
+    """
+    session.info.setdefault(PENDING_INVALIDATIONS, []).append((cache, key))
+
+
+def apply_pending_invalidations(session: Any) -> None:
+    """
+    Сбрасывает записи кэша, отложенные invalidate_after_commit.
+    Вызывается после commit (событие after_commit сессии).
+    """
+    for cache, key in session.info.pop(PENDING_INVALIDATIONS, []):
+        cache.delete(key)
+
+
+def discard_pending_invalidations(session: Any) -> None:
+    """
+    Забывает отложенные сбросы: после отката данные в базе не изменились.
+    """
+    session.info.pop(PENDING_INVALIDATIONS, None)
+
+
+def _create_user_cache():
+    if settings.USER_CACHE_REDIS_URL:
+        return RedisCache(
+            settings.USER_CACHE_REDIS_URL, prefix="user", ttl=settings.USER_CACHE_TTL
+        )
+    return TTLCache(maxsize=settings.USER_CACHE_MAXSIZE, ttl=settings.USER_CACHE_TTL)
+
+
+# Кэш аутентифицированных пользователей: id -> UserIdentity.model_dump()
+user_cache = _create_user_cache()
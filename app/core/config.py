@@ -10,6 +10,18 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "TEST_SECRET_DO_NOT_USE_IN_PROD"
     # истекает через 7 дней
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7
+    # схемы хэширования паролей passlib: первая используется для новых хэшей,
+    # остальные пересчитываются при входе (для argon2 нужен пакет argon2-cffi)
+    PASSWORD_SCHEMES: List[str] = ["bcrypt"]
+    # cost factor bcrypt; хэши с другим значением пересчитываются при входе
+    BCRYPT_ROUNDS: int = 12
+    # потоки для bcrypt и допустимая очередь сверх них (дальше - ответ 503)
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_LIMIT: int = 32
+    # максимальное число проверенных токенов в кэше воркера
+    TOKEN_CACHE_MAXSIZE: int = 10000
+    # максимальное число объектов в одном пакетном запросе (/batch)
+    BATCH_MAX_SIZE: int = 500
     BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = []
 
     POSTGRES_HOST: str
@@ -19,6 +31,25 @@ class Settings(BaseSettings):
     POSTGRES_PORT: int
     SQLALCHEMY_DATABASE_URI: Optional[PostgresDsn] = None
 
+    # Пул соединений (на каждый воркер и каждый движок: sync и async)
+    POOL_SIZE: int = 5
+    MAX_OVERFLOW: int = 10
+    # секунды ожидания свободного соединения
+    POOL_TIMEOUT: float = 30
+    # пересоздавать соединения старше, секунд (-1 - не пересоздавать)
+    POOL_RECYCLE: int = 1800
+    POOL_PRE_PING: bool = True
+
+    # Кэш аутентифицированных пользователей (id, email, region)
+    USER_CACHE_TTL: int = 300
+    USER_CACHE_MAXSIZE: int = 10000
+    # если задан, вместо кэша в памяти процесса используется Redis
+    USER_CACHE_REDIS_URL: Optional[str] = None
+
+    # Токен для служебных эндпоинтов /internal (заголовок X-Metrics-Token).
+    # Если не задан, эндпоинты недоступны
+    METRICS_TOKEN: Optional[str] = None
+
     @validator("BACKEND_CORS_ORIGINS", pre=True)
     def assemble_cors_origins(cls, v: Union[str, List[str]]) -> Union[List[str], str]:
         """
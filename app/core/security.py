@@ -1,16 +1,46 @@
+import asyncio
+import hashlib
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Union
+from typing import Any, Callable, Optional, Tuple, Union
 
+from fastapi import HTTPException
 from jose import jwt
 from passlib.context import CryptContext
 
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.schemas.token import TokenPayload
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Новые хэши создаются первой схемой из PASSWORD_SCHEMES, остальные схемы устаревшие.
+# Хэши bcrypt с cost factor, отличным от BCRYPT_ROUNDS, тоже считаются устаревшими
+# и пересчитываются при успешном входе (см. verify_and_update_password_async).
+pwd_context = CryptContext(
+    schemes=settings.PASSWORD_SCHEMES,
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+# bcrypt выполняется в отдельном пуле потоков (библиотека bcrypt освобождает GIL),
+# чтобы всплеск логинов не занимал общий пул потоков обработчиков запросов.
+# Число задач в пуле и в очереди ограничено: сверх лимита запрос получает 503.
+password_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
+password_hash_slots = threading.BoundedSemaphore(
+    settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_LIMIT
+)
 
 
 ALGORITHM = "HS256"
 
+# Проверенные токены: sha256(token) -> TokenPayload, запись живёт до exp токена
+token_cache = TTLCache(maxsize=settings.TOKEN_CACHE_MAXSIZE, ttl=0)
+
 
 def create_access_token(
     subject: Union[str, Any], expires_delta: timedelta = None
@@ -26,9 +56,76 @@ def create_access_token(
     return encoded_jwt
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+def decode_access_token(token: str) -> TokenPayload:
+    """
+    Проверяет подпись и срок действия токена и возвращает его содержимое.
+
+    Результат проверки кэшируется по хэшу токена до истечения срока действия (claim `exp`),
+    поэтому повторные запросы с тем же токеном не выполняют проверку подписи заново.
+    Просроченный токен вытесняется из кэша и повторно проверяется через `jwt.decode`,
+    который его отклоняет.
+
+    Raises:
+        jwt.JWTError: Если токен некорректен или истёк.
+        ValidationError: Если содержимое токена не соответствует TokenPayload.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    token_data = token_cache.get(key)
+    if token_data is not None:
+        return token_data
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
+    token_data = TokenPayload(**payload)
+    if token_data.exp is not None:
+        token_cache.set(key, token_data, ttl=token_data.exp - time.time())
+    return token_data
+
+
+def _submit_password_hashing(fn: Callable, *args) -> Future:
+    """
+    Ставит операцию bcrypt в очередь пула password_hash_executor.
+
+    Raises:
+        HTTPException: Если пул и очередь заполнены (код 503, заголовок Retry-After).
+    """
+    slots = password_hash_slots
+    if not slots.acquire(blocking=False):
+        raise HTTPException(
+            status_code=503,
+            detail="Сервер перегружен, повторите попытку позже",
+            headers={"Retry-After": "1"},
+        )
+    future = password_hash_executor.submit(fn, *args)
+    future.add_done_callback(lambda _: slots.release())
+    return future
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return _submit_password_hashing(pwd_context.hash, password).result()
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Асинхронная версия get_password_hash: ожидание не блокирует ни цикл событий,
+    ни пул потоков обработчиков.
+    """
+    return await asyncio.wrap_future(
+        _submit_password_hashing(pwd_context.hash, password)
+    )
+
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Проверяет пароль и, если хэш устарел (другая схема или cost factor),
+    возвращает новый хэш с текущими параметрами. Ожидание не блокирует
+    ни цикл событий, ни пул потоков обработчиков.
+
+    Returns:
+        Tuple[bool, Optional[str]]: Результат проверки и новый хэш или None, если обновление не требуется.
+    """
+    return await asyncio.wrap_future(
+        _submit_password_hashing(
+            pwd_context.verify_and_update, plain_password, hashed_password
+        )
+    )
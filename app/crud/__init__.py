@@ -1,7 +1,8 @@
 from .crud_user import user
-from .auth import authenticate, get_session, get_user_by_email
+from .auth import aget_user_by_email, get_user_by_email
 from .crud_category import category
 from .crud_goal import goal
 from .crud_account import account
 from .crud_transaction import transaction
 from .crud_budget import budget
+from .crud_daily_spend import daily_spend
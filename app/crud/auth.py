@@ -1,16 +1,19 @@
-from sqlalchemy import func
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from fastapi import Depends
 
 from app.models.user import User
-from app.core.security import verify_password
+from app.core.security import verify_and_update_password_async
 
-from app.api.deps import get_session
+from app.utils.utils import normalize_email
 
 
 def get_user_by_email(*, session: Session, email: str) -> User | None:
     """
-    Получает пользователя из базы данных по адресу электронной почты.
+    Получает пользователя из базы данных по адресу электронной почты без учета регистра.
+
+    Выражение `lower(email)` совпадает с выражением уникального индекса ix_user_email_lower,
+    поэтому поиск выполняется по индексу.
 
     Args:
         session (Session): Экземпляр сессии базы данных.
@@ -20,27 +23,48 @@ def get_user_by_email(*, session: Session, email: str) -> User | None:
         User | None: Возвращает экземпляр пользователя если найден, в противном случае None.
     """
     return (
-        session.query(User).filter(func.lower(User.email) == func.lower(email)).first()
+        session.query(User)
+        .filter(func.lower(User.email) == normalize_email(email))
+        .first()
+    )
+
+
+async def aget_user_by_email(*, session: AsyncSession, email: str) -> User | None:
+    """
+    Асинхронная версия get_user_by_email.
+    """
+    return await session.scalar(
+        select(User).where(func.lower(User.email) == normalize_email(email))
     )
 
 
-def authenticate(
-    *, session: Session = Depends(get_session), email: str, password: str
+async def authenticate_async(
+    *, session: AsyncSession, email: str, password: str
 ) -> User | None:
     """
-    Проверяет учетные данные пользователя и выполняет аутентификацию.
+    Проверяет учетные данные пользователя и выполняет аутентификацию. Проверка пароля
+    выполняется в пуле bcrypt без блокировки цикла событий.
+
+    Если хэш пароля создан устаревшей схемой или с другим cost factor,
+    он пересчитывается с текущими параметрами и сохраняется.
 
     Args:
-        session (Session, optional): Экземпляр сессии базы данных.
+        session (AsyncSession): Экземпляр асинхронной сессии базы данных.
         email (str): Адрес электронной почты пользователя.
         password (str): Пароль пользователя.
 
     Returns:
         User | None: Возвращает экземпляр пользователя, если аутентификация успешна, в противном случае None.
     """
-    user = get_user_by_email(session=session, email=email)
+    user = await aget_user_by_email(session=session, email=email)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    valid, new_hash = await verify_and_update_password_async(
+        password, user.hashed_password
+    )
+    if not valid:
         return None
+    if new_hash:
+        user.hashed_password = new_hash
+        await session.flush()
     return user
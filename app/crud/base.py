@@ -1,7 +1,20 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from functools import cached_property
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Generic,
+    List,
+    Optional,
+    Type,
+    TypeVar,
+    Union,
+)
 
-from fastapi.encoders import jsonable_encoder
+from fastapi import HTTPException
 from pydantic import BaseModel
+from sqlalchemy import Select, case, delete, insert, inspect, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 ModelType = TypeVar("ModelType", bound=Any)
@@ -18,6 +31,10 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         CreateSchemaType (Type): Тип Pydantic схемы для создания экземпляров модели.
         UpdateSchemaType (Type): Тип Pydantic схемы для обновления экземпляров модели.
 
+    Методы записи не выполняют commit: изменения отправляются в базу через flush
+    (значения id и других столбцов по умолчанию возвращаются тем же INSERT),
+    а фиксирует их зависимость сессии одним commit в конце запроса.
+
     Attributes:
         model (Type[ModelType]): Ссылка на класс SQLAlchemy модели.
 
@@ -33,25 +50,111 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
 
         remove(db: Session, id: int) -> ModelType:
             Удаляет экземпляр модели из базы данных по его уникальному идентификатору.
+
+        get_owned(db: Session, id: Any, user_id: int) -> ModelType:
+            Получает экземпляр модели одним запросом вместе с проверкой владельца.
+
+        get_many, get_many_owned, create_many, update_many, remove_many:
+            Пакетные версии методов: один запрос на операцию.
+
+        aget, aget_owned, acreate, aupdate, aremove:
+            Асинхронные версии методов для AsyncSession.
     """
 
     def __init__(self, model: Type[ModelType]):
 
         self.model = model
 
+    @cached_property
+    def _column_keys(self) -> FrozenSet[str]:
+        """
+        Имена столбцов модели по маппингу SQLAlchemy. Вычисляются один раз
+        при первом обращении, когда все модели уже настроены.
+        """
+        return frozenset(attr.key for attr in inspect(self.model).column_attrs)
+
+    def _update_values(
+        self, obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        # Только столбцы модели: связи и прочие атрибуты не изменяются и не загружаются
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+        return {
+            field: value
+            for field, value in update_data.items()
+            if field in self._column_keys
+        }
+
     def get(self, db: Session, id: Any) -> Optional[ModelType]:
         return db.query(self.model).filter(self.model.id == id).first()
 
+    def _owned_statement(self, user_id: int) -> Select:
+        """
+        Запрос объектов с признаком `is_owner`. Модели, у которых владелец
+        определяется через связанную таблицу, переопределяют этот метод.
+        """
+        return select(self.model, (self.model.user_id == user_id).label("is_owner"))
+
+    def _check_owned(
+        self,
+        row,
+        *,
+        not_found_detail: str,
+        forbidden_status: int,
+        forbidden_detail: str,
+    ) -> ModelType:
+        if not row:
+            raise HTTPException(status_code=404, detail=not_found_detail)
+        obj, is_owner = row
+        if not is_owner:
+            raise HTTPException(status_code=forbidden_status, detail=forbidden_detail)
+        return obj
+
+    def get_owned(
+        self,
+        db: Session,
+        id: Any,
+        user_id: int,
+        *,
+        not_found_detail: str = "Объект не найден",
+        forbidden_status: int = 403,
+        forbidden_detail: str = "Недостаточно прав",
+    ) -> ModelType:
+        """
+        Получает объект пользователя по id одним запросом: владелец проверяется
+        по результату того же запроса, без ленивой загрузки связей.
+
+        Args:
+            db (Session): Сессия базы данных.
+            id (Any): Идентификатор объекта.
+            user_id (int): Идентификатор пользователя, который должен владеть объектом.
+            not_found_detail (str, optional): Сообщение, если объект не найден.
+            forbidden_status (int, optional): Код ответа, если объект принадлежит другому пользователю. Defaults to 403.
+            forbidden_detail (str, optional): Сообщение, если объект принадлежит другому пользователю.
+
+        Returns:
+            ModelType: Найденный объект.
+
+        Raises:
+            HTTPException: 404, если объект не найден, или `forbidden_status`, если он принадлежит другому пользователю.
+        """
+        return self._check_owned(
+            db.execute(
+                self._owned_statement(user_id).where(self.model.id == id)
+            ).first(),
+            not_found_detail=not_found_detail,
+            forbidden_status=forbidden_status,
+            forbidden_detail=forbidden_detail,
+        )
+
     def create(
         self, db: Session, *, obj_in: CreateSchemaType, user_id: Optional[int] = None
     ) -> ModelType:
-        obj_in_data = jsonable_encoder(obj_in)
-        if user_id:
-            obj_in_data["user_id"] = user_id
-        db_obj = self.model(**obj_in_data)  # type: ignore
+        db_obj = self.model(**self._create_values(obj_in, user_id))  # type: ignore
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        db.flush()
         return db_obj
 
     def update(
@@ -61,21 +164,246 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db_obj: ModelType,
         obj_in: Union[UpdateSchemaType, Dict[str, Any]]
     ) -> ModelType:
-        obj_data = jsonable_encoder(db_obj)
-        if isinstance(obj_in, dict):
-            update_data = obj_in
-        else:
-            update_data = obj_in.model_dump(exclude_unset=True)
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
+        for field, value in self._update_values(obj_in).items():
+            setattr(db_obj, field, value)
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        db.flush()
         return db_obj
 
     def remove(self, db: Session, *, id: int) -> ModelType:
         obj = db.query(self.model).get(id)
         db.delete(obj)
-        db.commit()
+        db.flush()
+        return obj
+
+    def get_many(
+        self, db: Session, ids: List[Any], *, user_id: Optional[int] = None
+    ) -> List[ModelType]:
+        """
+        Получает объекты по списку id одним запросом `WHERE id IN (...)`.
+
+        Args:
+            db (Session): Сессия базы данных.
+            ids (List[Any]): Идентификаторы объектов.
+            user_id (Optional[int], optional): Вернуть только объекты пользователя. Defaults to None.
+
+        Returns:
+            List[ModelType]: Найденные объекты в порядке возрастания id.
+        """
+        statement = select(self.model).where(self.model.id.in_(ids))
+        if user_id is not None:
+            statement = statement.where(self.model.user_id == user_id)
+        return list(db.scalars(statement.order_by(self.model.id)))
+
+    def get_many_owned(
+        self,
+        db: Session,
+        ids: List[Any],
+        user_id: int,
+        *,
+        not_found_detail: str = "Объект не найден",
+        forbidden_status: int = 403,
+        forbidden_detail: str = "Недостаточно прав",
+    ) -> List[ModelType]:
+        """
+        Получает объекты пользователя по списку id одним запросом, как get_owned.
+        Ошибка возвращается, если хотя бы один объект не найден или принадлежит
+        другому пользователю.
+
+        Returns:
+            List[ModelType]: Найденные объекты в порядке возрастания id.
+
+        Raises:
+            HTTPException: 404, если объект не найден, или `forbidden_status`, если он принадлежит другому пользователю.
+        """
+        rows = db.execute(
+            self._owned_statement(user_id)
+            .where(self.model.id.in_(ids))
+            .order_by(self.model.id)
+        ).all()
+        if len(rows) < len(set(ids)):
+            raise HTTPException(status_code=404, detail=not_found_detail)
+        return [
+            self._check_owned(
+                row,
+                not_found_detail=not_found_detail,
+                forbidden_status=forbidden_status,
+                forbidden_detail=forbidden_detail,
+            )
+            for row in rows
+        ]
+
+    def _create_values(
+        self, obj_in: CreateSchemaType, user_id: Optional[int]
+    ) -> Dict[str, Any]:
+        # model_dump вместо jsonable_encoder: без refresh объект хранит переданные
+        # значения, поэтому нужны даты и Decimal, а не строки и float
+        obj_in_data = obj_in.model_dump()
+        if user_id:
+            obj_in_data["user_id"] = user_id
+        return obj_in_data
+
+    def _update_many_values(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Выражения SET для update_many. Модели с вычисляемыми полями дополняют их здесь.
+        """
+        return values
+
+    def create_many(
+        self,
+        db: Session,
+        *,
+        objs_in: List[CreateSchemaType],
+        user_id: Optional[int] = None
+    ) -> List[ModelType]:
+        """
+        Создает объекты одним `INSERT ... VALUES (...), (...) RETURNING`.
+
+        Args:
+            db (Session): Сессия базы данных.
+            objs_in (List[CreateSchemaType]): Данные новых объектов.
+            user_id (Optional[int], optional): Владелец, который подставляется во все объекты. Defaults to None.
+
+        Returns:
+            List[ModelType]: Созданные объекты в порядке `objs_in`.
+        """
+        values = [self._create_values(obj_in, user_id) for obj_in in objs_in]
+        if not values:
+            return []
+        objs = list(
+            db.scalars(
+                insert(self.model).returning(
+                    self.model, sort_by_parameter_order=True
+                ),
+                values,
+            )
+        )
+        return objs
+
+    def update_many(
+        self,
+        db: Session,
+        *,
+        objs_in: List[Union[UpdateSchemaType, Dict[str, Any]]],
+        user_id: Optional[int] = None
+    ) -> List[ModelType]:
+        """
+        Обновляет объекты одним `UPDATE ... WHERE id IN (...)`: значение каждого
+        поля выбирается по id через `CASE`. Каждый элемент `objs_in` должен содержать `id`;
+        поля, не переданные для объекта, не меняются.
+
+        Args:
+            db (Session): Сессия базы данных.
+            objs_in (List[Union[UpdateSchemaType, Dict[str, Any]]]): Данные обновления с id объектов.
+            user_id (Optional[int], optional): Обновлять только объекты пользователя. Defaults to None.
+
+        Returns:
+            List[ModelType]: Обновленные объекты в порядке возрастания id.
+        """
+        ids = []
+        values: Dict[str, Dict[Any, Any]] = {}
+        for obj_in in objs_in:
+            update_data = self._update_values(obj_in)
+            id = update_data.pop("id")
+            update_data.pop("user_id", None)
+            ids.append(id)
+            for field, value in update_data.items():
+                values.setdefault(field, {})[id] = value
+
+        if values:
+            statement = (
+                update(self.model)
+                .where(self.model.id.in_(ids))
+                .values(
+                    self._update_many_values(
+                        {
+                            field: case(
+                                by_id,
+                                value=self.model.id,
+                                else_=getattr(self.model, field),
+                            )
+                            for field, by_id in values.items()
+                        }
+                    )
+                )
+                .execution_options(synchronize_session="fetch")
+            )
+            if user_id is not None:
+                statement = statement.where(self.model.user_id == user_id)
+            db.execute(statement)
+        return self.get_many(db, ids, user_id=user_id)
+
+    def remove_many(
+        self, db: Session, *, ids: List[Any], user_id: Optional[int] = None
+    ) -> List[ModelType]:
+        """
+        Удаляет объекты одним `DELETE ... WHERE id IN (...) RETURNING`.
+        Связанные записи удаляются каскадно на стороне базы данных (`ON DELETE CASCADE`).
+
+        Args:
+            db (Session): Сессия базы данных.
+            ids (List[Any]): Идентификаторы объектов.
+            user_id (Optional[int], optional): Удалять только объекты пользователя. Defaults to None.
+
+        Returns:
+            List[ModelType]: Удаленные объекты.
+        """
+        statement = delete(self.model).where(self.model.id.in_(ids))
+        if user_id is not None:
+            statement = statement.where(self.model.user_id == user_id)
+        return list(db.scalars(statement.returning(self.model)))
+
+    async def aget(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
+        return await db.get(self.model, id)
+
+    async def aget_owned(
+        self,
+        db: AsyncSession,
+        id: Any,
+        user_id: int,
+        *,
+        not_found_detail: str = "Объект не найден",
+        forbidden_status: int = 403,
+        forbidden_detail: str = "Недостаточно прав",
+    ) -> ModelType:
+        return self._check_owned(
+            (
+                await db.execute(
+                    self._owned_statement(user_id).where(self.model.id == id)
+                )
+            ).first(),
+            not_found_detail=not_found_detail,
+            forbidden_status=forbidden_status,
+            forbidden_detail=forbidden_detail,
+        )
+
+    async def acreate(
+        self,
+        db: AsyncSession,
+        *,
+        obj_in: CreateSchemaType,
+        user_id: Optional[int] = None
+    ) -> ModelType:
+        db_obj = self.model(**self._create_values(obj_in, user_id))  # type: ignore
+        db.add(db_obj)
+        await db.flush()
+        return db_obj
+
+    async def aupdate(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> ModelType:
+        for field, value in self._update_values(obj_in).items():
+            setattr(db_obj, field, value)
+        db.add(db_obj)
+        await db.flush()
+        return db_obj
+
+    async def aremove(self, db: AsyncSession, *, id: int) -> ModelType:
+        obj = await db.get(self.model, id)
+        await db.delete(obj)
+        await db.flush()
         return obj
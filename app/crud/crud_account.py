@@ -1,58 +1,107 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Optional
+
+from sqlalchemy import and_, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.crud.base import CRUDBase
 from app.models.account import Account
-from app.schemas.account import AccountCreate, AccountUpdate, AccountUpdateBalance
 from app.models.transaction import Transaction
+from app.schemas.account import AccountCreate, AccountUpdate
 
 
 class CRUDAccount(CRUDBase[Account, AccountCreate, AccountUpdate]):
-    def update_balance_by_transaction(
-        self, db: Session, *, obj_in: AccountUpdateBalance
-    ) -> Account:
+    def apply_balance_delta(
+        self, db: Session, *, account_id: int, amount: Decimal
+    ) -> Optional[Row]:
         """
-        Обновляет баланс счета на основе изменения транзакции.
+        Изменяет баланс счета на указанную сумму одним запросом
+        `UPDATE ... SET balance = balance + :amount RETURNING balance, user_id`.
+
+        Не выполняет commit: изменение применяется в текущей транзакции сессии.
 
         Args:
             db (Session): Сессия базы данных.
-            obj_in (AccountUpdateBalance): Данные для обновления баланса.
+            account_id (int): Идентификатор счета.
+            amount (Decimal): Сумма, на которую изменяется баланс.
 
         Returns:
-            Account: Обновленный объект счета.
+            Optional[Row]: Новый баланс счета (`balance`) и его владелец (`user_id`)
+            или None, если счет не найден.
         """
-        account = super().get(db, id=obj_in.id)
-
-        if account:
-            account.balance += obj_in.amount
-            db.commit()
-            db.refresh(account)
+        statement = (
+            update(Account)
+            .where(Account.id == account_id)
+            .values(balance=Account.balance + amount)
+            .returning(Account.balance, Account.user_id)
+        )
+        return db.execute(statement).one_or_none()
 
-        return account
-
-    def update_balance(self, db: Session, account_id: int):
+    async def aget_with_transactions(
+        self,
+        db: AsyncSession,
+        *,
+        account_id: int,
+        user_id: int,
+        limit: int = 100,
+        begin_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> Optional[Dict]:
         """
-        Обновляет баланс счета на основе суммы транзакций.
+        Получает счет пользователя вместе с последними транзакциями одним запросом.
+
+        Счет соединяется с транзакциями через LEFT JOIN, из транзакций выбираются только
+        поля amount, date и description. Проверка владельца выполняется в том же запросе.
 
         Args:
-            db (Session): Сессия базы данных.
+            db (AsyncSession): Асинхронная сессия базы данных.
             account_id (int): Идентификатор счета.
+            user_id (int): Идентификатор владельца счета.
+            limit (int, optional): Максимальное количество транзакций. Defaults to 100.
+            begin_date (Optional[datetime], optional): Начальная дата транзакций. Defaults to None.
+            end_date (Optional[datetime], optional): Конечная дата транзакций. Defaults to None.
 
         Returns:
-            Account: Обновленный объект счета.
+            Optional[Dict]: Поля счета и список `transactions` (от новых к старым)
+            или None, если счет не найден или принадлежит другому пользователю.
         """
-        account = super().get(db, id=account_id)
-        if account:
-            transactions = (
-                db.query(Transaction).filter(Transaction.account_id == account_id).all()
+        join_on = [Transaction.account_id == Account.id]
+        if begin_date:
+            join_on.append(Transaction.date >= begin_date)
+        if end_date:
+            join_on.append(Transaction.date <= end_date)
+        statement = (
+            select(
+                *Account.__table__.columns,
+                Transaction.id.label("transaction_id"),
+                Transaction.amount.label("transaction_amount"),
+                Transaction.date.label("transaction_date"),
+                Transaction.description.label("transaction_description"),
             )
-
-            new_balance = account.balance
-            for transaction in transactions:
-                new_balance += transaction.amount
-            account.balance = new_balance
-            db.commit()
-            db.refresh(account)
-            return account
+            .outerjoin(Transaction, and_(*join_on))
+            .where(Account.id == account_id, Account.user_id == user_id)
+            .order_by(Transaction.date.desc(), Transaction.id.desc())
+            .limit(limit)
+        )
+        rows = (await db.execute(statement)).all()
+        if not rows:
+            return None
+        result = {
+            column.key: rows[0]._mapping[column] for column in Account.__table__.columns
+        }
+        result["transactions"] = [
+            {
+                "amount": row.transaction_amount,
+                "date": row.transaction_date,
+                "description": row.transaction_description,
+            }
+            for row in rows
+            if row.transaction_id is not None
+        ]
+        return result
 
 
 account = CRUDAccount(Account)
@@ -1,10 +1,146 @@
+import calendar
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import List, Optional, Tuple
+
+from sqlalchemy import BigInteger, DateTime, and_, func, literal, or_, select, union_all
+from sqlalchemy.orm import Session
+
 from app.crud.base import CRUDBase
+from app.models.account import Account
 from app.models.budget import Budget
-from app.schemas.budget import BudgetCreate, BudgetUpdate
+from app.models.transaction import Transaction
+from app.schemas.budget import BudgetCreate, BudgetPeriod, BudgetProgress, BudgetUpdate
+
+
+def _add_months(date: datetime, months: int) -> datetime:
+    month_index = date.month - 1 + months
+    year = date.year + month_index // 12
+    month = month_index % 12 + 1
+    day = min(date.day, calendar.monthrange(year, month)[1])
+    return date.replace(year=year, month=month, day=day)
+
+
+def get_period_window(
+    period: str, start_date: datetime, now: datetime
+) -> Tuple[datetime, datetime]:
+    """
+    Вычисляет текущий период бюджета `[начало, конец)`.
+
+    Периоды отсчитываются от даты начала бюджета. Если бюджет ещё не начался,
+    возвращается его первый период.
+
+    Args:
+        period (str): Период бюджета: 'day', 'week', 'month' или 'year'.
+        start_date (datetime): Дата начала бюджета.
+        now (datetime): Момент, для которого вычисляется период.
+
+    Returns:
+        Tuple[datetime, datetime]: Начало и конец текущего периода.
+    """
+    if period in (BudgetPeriod.day, BudgetPeriod.week):
+        step = timedelta(days=1 if period == BudgetPeriod.day else 7)
+        passed = max((now - start_date) // step, 0)
+        period_start = start_date + step * passed
+        return period_start, period_start + step
+
+    months = 1 if period == BudgetPeriod.month else 12
+    passed = (now.year - start_date.year) * 12 + now.month - start_date.month
+    passed = max(passed - passed % months, 0)
+    if passed and _add_months(start_date, passed) > now:
+        passed -= months
+    return _add_months(start_date, passed), _add_months(start_date, passed + months)
 
 
 class CRUDBudget(CRUDBase[Budget, BudgetCreate, BudgetUpdate]):
-    pass
+    def get_progress(
+        self,
+        db: Session,
+        *,
+        budgets: List[Budget],
+        user_id: int,
+        now: Optional[datetime] = None,
+    ) -> List[BudgetProgress]:
+        """
+        Вычисляет расходы по бюджетам за их текущие периоды.
+
+        Расходы всех бюджетов считаются одним запросом: периоды бюджетов
+        передаются в базу как CTE и соединяются с транзакциями счетов пользователя,
+        после чего суммы расходов группируются по бюджету.
+
+        Args:
+            db (Session): Сессия базы данных.
+            budgets (List[Budget]): Бюджеты пользователя.
+            user_id (int): Идентификатор пользователя.
+            now (Optional[datetime], optional): Момент расчета. Defaults to datetime.utcnow().
+
+        Returns:
+            List[BudgetProgress]: Израсходованная и оставшаяся сумма по каждому бюджету.
+        """
+        if not budgets:
+            return []
+        now = now or datetime.utcnow()
+        windows = {
+            budget.id: get_period_window(budget.period, budget.start_date, now)
+            for budget in budgets
+        }
+
+        budget_window = union_all(
+            *[
+                select(
+                    literal(budget.id, BigInteger).label("budget_id"),
+                    literal(budget.category_id, BigInteger).label("category_id"),
+                    literal(windows[budget.id][0], DateTime).label("period_start"),
+                    literal(windows[budget.id][1], DateTime).label("period_end"),
+                )
+                for budget in budgets
+            ]
+        ).cte("budget_window")
+
+        statement = (
+            select(budget_window.c.budget_id, func.sum(-Transaction.amount))
+            .select_from(budget_window)
+            .join(
+                Transaction,
+                and_(
+                    Transaction.date >= budget_window.c.period_start,
+                    Transaction.date < budget_window.c.period_end,
+                    Transaction.amount < 0,
+                    Transaction.transfer_group_id.is_(None),
+                    or_(
+                        budget_window.c.category_id.is_(None),
+                        Transaction.category_id == budget_window.c.category_id,
+                    ),
+                ),
+            )
+            .join(
+                Account,
+                and_(Account.id == Transaction.account_id, Account.user_id == user_id),
+            )
+            .group_by(budget_window.c.budget_id)
+        )
+        spent_by_budget = dict(db.execute(statement).all())
+
+        progress = []
+        for budget in budgets:
+            spent = Decimal(spent_by_budget.get(budget.id) or 0)
+            period_start, period_end = windows[budget.id]
+            progress.append(
+                BudgetProgress(
+                    budget_id=budget.id,
+                    amount=budget.amount,
+                    spent=spent,
+                    remaining=budget.amount - spent,
+                    percent_used=(
+                        round(float(spent / budget.amount * 100), 2)
+                        if budget.amount
+                        else 0.0
+                    ),
+                    period_start=period_start,
+                    period_end=period_end,
+                )
+            )
+        return progress
 
 
 budget = CRUDBudget(Budget)
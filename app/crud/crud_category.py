@@ -1,12 +1,26 @@
-from typing import Union, Dict, Any
+from typing import Union, Dict, Any, List, Optional
 
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select
 
+from app.core.cache import TTLCache, invalidate_after_commit
 from app.crud.base import CRUDBase
 from app.models.category import Category
 from app.schemas.category import CategoryCreate, CategoryUpdate
 
+# Системная категория для переводов между счетами
+TRANSFER_CATEGORY_NAME = "Перевод"
+
+SYSTEM_CATEGORY_CACHE_SIZE = 10000
+SYSTEM_CATEGORY_CACHE_TTL = 600
+
+# (user_id, lower(name)) -> id системной категории пользователя
+system_category_cache = TTLCache(
+    maxsize=SYSTEM_CATEGORY_CACHE_SIZE, ttl=SYSTEM_CATEGORY_CACHE_TTL
+)
+
 
 class CRUDCategory(CRUDBase[Category, CategoryCreate, CategoryUpdate]):
     def update(
@@ -21,14 +35,127 @@ class CRUDCategory(CRUDBase[Category, CategoryCreate, CategoryUpdate]):
         else:
             update_data = obj_in.model_dump(exclude_unset=True)
 
+        self._forget(db, db_obj)
         return super().update(db, db_obj=db_obj, obj_in=update_data)
 
-    def get_by_name(self, db: Session, name: str):
-        return (
-            db.query(Category)
-            .where(func.lower(Category.name) == func.lower(name))
-            .first()
+    def remove(self, db: Session, *, id: int) -> Category:
+        category = super().remove(db, id=id)
+        self._forget(db, category)
+        return category
+
+    async def aupdate(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: Category,
+        obj_in: Union[CategoryUpdate, Dict[str, Any]]
+    ) -> Category:
+        self._forget(db, db_obj)
+        return await super().aupdate(db, db_obj=db_obj, obj_in=obj_in)
+
+    async def aremove(self, db: AsyncSession, *, id: int) -> Category:
+        category = await super().aremove(db, id=id)
+        self._forget(db, category)
+        return category
+
+    def update_many(
+        self,
+        db: Session,
+        *,
+        objs_in: List[Union[CategoryUpdate, Dict[str, Any]]],
+        user_id: Optional[int] = None
+    ) -> List[Category]:
+        ids = [
+            obj_in["id"] if isinstance(obj_in, dict) else obj_in.id for obj_in in objs_in
+        ]
+        for category in self.get_many(db, ids, user_id=user_id):
+            self._forget(db, category)
+        return super().update_many(db, objs_in=objs_in, user_id=user_id)
+
+    def remove_many(
+        self, db: Session, *, ids: List[Any], user_id: Optional[int] = None
+    ) -> List[Category]:
+        categories = super().remove_many(db, ids=ids, user_id=user_id)
+        for category in categories:
+            self._forget(db, category)
+        return categories
+
+    def _forget(
+        self, db: Union[Session, AsyncSession], category: Optional[Category]
+    ) -> None:
+        # Запись сбрасывается после commit: до него другие запросы видят старое название
+        if category:
+            invalidate_after_commit(
+                db, system_category_cache, (category.user_id, category.name.lower())
+            )
+
+    def forget_system_category(self, *, user_id: int, name: str) -> None:
+        """
+        Сбрасывает запись кэша системной категории. Кэш локален для процесса,
+        поэтому при изменении категории в другом воркере вызывающий код сбрасывает
+        запись сам, не найдя категорию в базе данных.
+        """
+        system_category_cache.delete((user_id, name.lower()))
+
+    def _by_name_statement(self, user_id: int, name: str):
+        # Выражение совпадает с индексом ix_category_user_id_name_lower. Название
+        # приводится к нижнему регистру той же функцией базы данных, что и в индексе
+        # (lower в SQLite не меняет регистр кириллицы)
+        return select(Category).where(
+            Category.user_id == user_id,
+            func.lower(Category.name) == func.lower(name),
         )
 
+    def get_by_name(
+        self, db: Session, *, user_id: int, name: str
+    ) -> Optional[Category]:
+        """
+        Получает категорию пользователя по названию без учета регистра.
+        """
+        return db.scalar(self._by_name_statement(user_id, name))
+
+    async def aget_by_name(
+        self, db: AsyncSession, *, user_id: int, name: str
+    ) -> Optional[Category]:
+        return await db.scalar(self._by_name_statement(user_id, name))
+
+    def get_system_category_id(self, db: Session, *, user_id: int, name: str) -> int:
+        """
+        Возвращает идентификатор системной категории пользователя (например, "Перевод"),
+        создавая ее при первом обращении.
+
+        Идентификатор кэшируется в памяти процесса, поэтому повторные вызовы не обращаются к базе данных.
+        Запись кэша сбрасывается после commit изменения или удаления категории. Только что созданная
+        категория не кэшируется: она еще не зафиксирована и исчезнет, если запрос откатится.
+
+        Args:
+            db (Session): Сессия базы данных.
+            user_id (int): Идентификатор пользователя.
+            name (str): Название системной категории.
+
+        Returns:
+            int: Идентификатор категории.
+        """
+        key = (user_id, name.lower())
+        category_id = system_category_cache.get(key)
+        if category_id is not None:
+            return category_id
+
+        category = self.get_by_name(db, user_id=user_id, name=name)
+        if category:
+            system_category_cache.set(key, category.id)
+            return category.id
+        try:
+            # savepoint: ошибка вставки не должна откатывать остальные изменения запроса
+            with db.begin_nested():
+                category = self.create(
+                    db, obj_in=CategoryCreate(name=name), user_id=user_id
+                )
+        except IntegrityError:
+            # категорию одновременно создал другой запрос
+            category = self.get_by_name(db, user_id=user_id, name=name)
+            system_category_cache.set(key, category.id)
+        return category.id
+
 
 category = CRUDCategory(Category)
@@ -0,0 +1,267 @@
+from collections import defaultdict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Date, case, cast, delete, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.account import Account
+from app.models.category import Category
+from app.models.daily_spend import DailySpend
+from app.models.transaction import Transaction
+from app.schemas.analytics import CashflowBucket
+
+UPSERT_BATCH_SIZE = 500
+
+# Ключ строки агрегата: (user_id, account_id, category_id, day)
+DailySpendKey = Tuple[int, int, int, date]
+
+
+class DailySpendDelta:
+    """
+    Накапливает изменения агрегата daily_spend, чтобы записать их одним upsert.
+
+    Положительная сумма учитывается как доход, отрицательная - как расход.
+    """
+
+    def __init__(self):
+        self.rows: Dict[DailySpendKey, List] = defaultdict(
+            lambda: [Decimal(0), Decimal(0), 0]
+        )
+
+    def add(
+        self,
+        *,
+        user_id: int,
+        account_id: int,
+        category_id: int,
+        date: datetime,
+        amount: Decimal,
+        count: int = 1,
+    ) -> None:
+        """
+        Добавляет вклад транзакции с суммой `amount`. Для отмены вклада передается `count=-1`.
+        """
+        row = self.rows[(user_id, account_id, category_id, date.date())]
+        if amount >= 0:
+            row[0] += amount * count
+        else:
+            row[1] -= amount * count
+        row[2] += count
+
+
+class CRUDDailySpend:
+    """
+    Операции с агрегатом daily_spend.
+    """
+
+    def _insert(self, db: Session):
+        if db.get_bind().dialect.name == "postgresql":
+            return postgresql.insert(DailySpend)
+        if db.get_bind().dialect.name == "sqlite":
+            return sqlite.insert(DailySpend)
+        return insert(DailySpend)
+
+    def apply(self, db: Session, *, delta: DailySpendDelta) -> None:
+        """
+        Применяет накопленные изменения к агрегату через
+        `INSERT ... ON CONFLICT DO UPDATE`. Не выполняет commit.
+
+        Args:
+            db (Session): Сессия базы данных.
+            delta (DailySpendDelta): Накопленные изменения.
+        """
+        values = []
+        for key, (income, expense, count) in delta.rows.items():
+            if not (income or expense or count):
+                continue
+            user_id, account_id, category_id, day = key
+            values.append(
+                {
+                    "user_id": user_id,
+                    "account_id": account_id,
+                    "category_id": category_id,
+                    "day": day,
+                    "income": income,
+                    "expense": expense,
+                    "count": count,
+                }
+            )
+        for start in range(0, len(values), UPSERT_BATCH_SIZE):
+            statement = self._insert(db).values(
+                values[start : start + UPSERT_BATCH_SIZE]
+            )
+            statement = statement.on_conflict_do_update(
+                index_elements=[
+                    DailySpend.user_id,
+                    DailySpend.account_id,
+                    DailySpend.category_id,
+                    DailySpend.day,
+                ],
+                set_={
+                    "income": DailySpend.income + statement.excluded.income,
+                    "expense": DailySpend.expense + statement.excluded.expense,
+                    "count": DailySpend.count + statement.excluded.count,
+                },
+            )
+            db.execute(statement)
+
+    def get_by_category(
+        self,
+        db: Session,
+        *,
+        user_id: int,
+        begin_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ):
+        """
+        Получает доходы и расходы пользователя по категориям одним GROUP BY по агрегату.
+
+        Args:
+            db (Session): Сессия базы данных.
+            user_id (int): Идентификатор пользователя.
+            begin_date (Optional[date], optional): Начальная дата (включительно). Defaults to None.
+            end_date (Optional[date], optional): Конечная дата (включительно). Defaults to None.
+
+        Returns:
+            List[Row]: Суммы по категориям, отсортированные по убыванию расходов.
+        """
+        statement = (
+            select(
+                DailySpend.category_id,
+                Category.name.label("category_name"),
+                func.sum(DailySpend.income).label("income"),
+                func.sum(DailySpend.expense).label("expense"),
+                func.sum(DailySpend.count).label("count"),
+            )
+            .join(Category, Category.id == DailySpend.category_id)
+            .where(DailySpend.user_id == user_id)
+            .group_by(DailySpend.category_id, Category.name)
+            .having(func.sum(DailySpend.count) > 0)
+            .order_by(func.sum(DailySpend.expense).desc(), DailySpend.category_id)
+        )
+        if begin_date:
+            statement = statement.where(DailySpend.day >= begin_date)
+        if end_date:
+            statement = statement.where(DailySpend.day <= end_date)
+        return db.execute(statement).all()
+
+    def _bucket(self, db: Session, bucket: CashflowBucket):
+        """
+        Возвращает выражение начала интервала для дня агрегата.
+
+        В PostgreSQL используется `date_trunc`, в SQLite - модификаторы функции `date`.
+        Недели начинаются с понедельника.
+        """
+        if db.get_bind().dialect.name == "sqlite":
+            if bucket == CashflowBucket.week:
+                return func.date(DailySpend.day, "weekday 0", "-6 days", type_=Date)
+            if bucket == CashflowBucket.month:
+                return func.date(DailySpend.day, "start of month", type_=Date)
+            return DailySpend.day
+        return cast(func.date_trunc(bucket.value, DailySpend.day), Date)
+
+    def get_cashflow(
+        self,
+        db: Session,
+        *,
+        user_id: int,
+        bucket: CashflowBucket = CashflowBucket.month,
+        account_id: Optional[int] = None,
+        begin_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ):
+        """
+        Получает доходы и расходы пользователя по интервалам (день, неделя, месяц).
+
+        Группировка выполняется в базе данных по агрегату daily_spend, в котором
+        транзакции с суммой `>= 0` учтены как доходы, а с суммой `< 0` - как расходы,
+        как и в фильтре get_filtered_transactions.
+
+        Args:
+            db (Session): Сессия базы данных.
+            user_id (int): Идентификатор пользователя.
+            bucket (CashflowBucket, optional): Размер интервала. Defaults to CashflowBucket.month.
+            account_id (Optional[int], optional): Идентификатор счета. Defaults to None.
+            begin_date (Optional[date], optional): Начальная дата (включительно). Defaults to None.
+            end_date (Optional[date], optional): Конечная дата (включительно). Defaults to None.
+
+        Returns:
+            List[Row]: Доходы и расходы по интервалам в порядке возрастания дат.
+        """
+        period_start = self._bucket(db, bucket).label("period_start")
+        statement = (
+            select(
+                period_start,
+                func.sum(DailySpend.income).label("income"),
+                func.sum(DailySpend.expense).label("expense"),
+            )
+            .where(DailySpend.user_id == user_id)
+            .group_by(period_start)
+            .having(func.sum(DailySpend.count) > 0)
+            .order_by(period_start)
+        )
+        if account_id:
+            statement = statement.where(DailySpend.account_id == account_id)
+        if begin_date:
+            statement = statement.where(DailySpend.day >= begin_date)
+        if end_date:
+            statement = statement.where(DailySpend.day <= end_date)
+        return db.execute(statement).all()
+
+    def rebuild(self, db: Session, *, user_id: Optional[int] = None) -> int:
+        """
+        Полностью пересчитывает агрегат из таблицы transaction одним
+        `INSERT ... SELECT ... GROUP BY`. Проводки переводов не учитываются. Не выполняет commit.
+
+        Args:
+            db (Session): Сессия базы данных.
+            user_id (Optional[int], optional): Пересчитать только данные пользователя. Defaults to None.
+
+        Returns:
+            int: Количество строк агрегата.
+        """
+        clear = delete(DailySpend)
+        if user_id:
+            clear = clear.where(DailySpend.user_id == user_id)
+        db.execute(clear)
+
+        day = func.date(Transaction.date, type_=Date)
+        source = (
+            select(
+                Account.user_id,
+                Transaction.account_id,
+                Transaction.category_id,
+                day,
+                func.sum(case((Transaction.amount >= 0, Transaction.amount), else_=0)),
+                func.sum(case((Transaction.amount < 0, -Transaction.amount), else_=0)),
+                func.count(),
+            )
+            .join(Account, Account.id == Transaction.account_id)
+            .where(Transaction.transfer_group_id.is_(None))
+            .group_by(
+                Account.user_id, Transaction.account_id, Transaction.category_id, day
+            )
+        )
+        if user_id:
+            source = source.where(Account.user_id == user_id)
+        result = db.execute(
+            insert(DailySpend).from_select(
+                [
+                    "user_id",
+                    "account_id",
+                    "category_id",
+                    "day",
+                    "income",
+                    "expense",
+                    "count",
+                ],
+                source,
+            )
+        )
+        return result.rowcount
+
+
+daily_spend = CRUDDailySpend()
@@ -1,5 +1,6 @@
 from typing import Union, Dict, Any, Optional
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.crud.base import CRUDBase
@@ -8,37 +9,65 @@ from app.schemas.goal import GoalCreate, GoalUpdate, GoalUpdateAmount
 
 
 class CRUDGoal(CRUDBase[Goal, GoalCreate, GoalUpdate]):
-    def create(self, db: Session, *, obj_in: GoalCreate, user_id: Optional[int] = None):
-        goal = super().create(db, obj_in=obj_in, user_id=user_id)
-        new_goal = self._update_is_achieved(db, goal.id)
-        return new_goal
+    """
+    Признак is_achieved вычисляется в памяти и записывается тем же INSERT или UPDATE,
+    что и сумма цели, без повторного чтения объекта.
+    """
 
     def update(
         self, db: Session, *, db_obj: Goal, obj_in: Union[GoalUpdate, Dict[str, Any]]
     ) -> Goal:
-        goal = super().update(db, db_obj=db_obj, obj_in=obj_in)
-        new_goal = self._update_is_achieved(db, goal.id)
-        return new_goal
-
-    def _update_is_achieved(self, db: Session, goal_id: int) -> Goal:
-        goal = self.get(db, goal_id)
-        if goal:
-            goal.is_achieved = goal.amount >= goal.target_amount
-            db.commit()
-            db.refresh(goal)
-        return goal
-
-    def add_accumulated_amount(
-        self, db: Session, db_obj: Goal, obj_in: GoalUpdateAmount, goal_id: int
-    ):
+        return super().update(
+            db, db_obj=db_obj, obj_in=self._goal_update_values(db_obj, obj_in)
+        )
+
+    async def aupdate(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: Goal,
+        obj_in: Union[GoalUpdate, Dict[str, Any]]
+    ) -> Goal:
+        return await super().aupdate(
+            db, db_obj=db_obj, obj_in=self._goal_update_values(db_obj, obj_in)
+        )
+
+    def _goal_update_values(
+        self, db_obj: Goal, obj_in: Union[GoalUpdate, Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        if isinstance(obj_in, dict):
+            update_data = dict(obj_in)
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+        update_data["is_achieved"] = update_data.get(
+            "amount", db_obj.amount
+        ) >= update_data.get("target_amount", db_obj.target_amount)
+        return update_data
+
+    def _create_values(
+        self, obj_in: GoalCreate, user_id: Optional[int]
+    ) -> Dict[str, Any]:
+        values = super()._create_values(obj_in, user_id)
+        values["is_achieved"] = values["amount"] >= values["target_amount"]
+        return values
+
+    def _update_many_values(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        # Признак считается в том же UPDATE по новым значениям суммы и цели
+        values["is_achieved"] = values.get("amount", Goal.amount) >= values.get(
+            "target_amount", Goal.target_amount
+        )
+        return values
+
+    async def aadd_accumulated_amount(
+        self, db: AsyncSession, *, db_obj: Goal, obj_in: GoalUpdateAmount
+    ) -> Goal:
         """
         Добавляет или вычитает новую сумму из текущей суммы цели.
         """
         db_obj.amount += obj_in.amount
-        db.commit()
-        db.refresh(db_obj)
-        goal = self._update_is_achieved(db, goal_id)
-        return goal
+        db_obj.is_achieved = db_obj.amount >= db_obj.target_amount
+        await db.flush()
+        return db_obj
 
 
 goal = CRUDGoal(Goal)
@@ -1,36 +1,512 @@
-from typing import Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import select
+import uuid
+from collections import defaultdict
+from decimal import Decimal
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session, aliased, contains_eager
+from sqlalchemy import Select, and_, case, delete, insert, or_, select, tuple_, update
 from datetime import datetime
 
+from fastapi import HTTPException
+
 from app.crud.base import CRUDBase
-from app.crud import account
-from app.models.transaction import Transaction
-from app.schemas.transaction import TransactionCreate, TransactionUpdate
-from app.schemas.account import AccountUpdateBalance
+from app.crud import account, category
+from app.crud.crud_category import TRANSFER_CATEGORY_NAME
+from app.crud.crud_daily_spend import DailySpendDelta, daily_spend
+from app.models.transaction import TRANSFER_RECEIVER, TRANSFER_SENDER, Transaction
+from app.schemas.transaction import (
+    TransactionCreate,
+    TransactionTransferCreate,
+    TransactionUpdate,
+)
 from app.models.user import User
 from app.models.account import Account
 from app.models.category import Category
 
+IMPORT_BATCH_SIZE = 1000
+EXPORT_BATCH_SIZE = 1000
+
 
 class CRUDtransaction(CRUDBase[Transaction, TransactionCreate, TransactionUpdate]):
-    def create(self, db: Session, *, obj_in: TransactionCreate):
-        new_transaction = super().create(db, obj_in=obj_in)
-        new_amount = AccountUpdateBalance(
-            id=new_transaction.account_id,
-            amount=new_transaction.amount,
+    def _owned_statement(self, user_id: int) -> Select:
+        # Владелец транзакции - владелец счета: счет загружается тем же запросом
+        return (
+            select(Transaction, (Account.user_id == user_id).label("is_owner"))
+            .join(Transaction.account)
+            .options(contains_eager(Transaction.account))
         )
-        account.update_balance_by_transaction(db=db, obj_in=new_amount)
-        return super().create(db, obj_in=obj_in)
 
-    def get_filtered_transactions(
+    def create(
+        self, db: Session, *, obj_in: Union[TransactionCreate, Dict[str, Any]]
+    ) -> Transaction:
+        """
+        Создает транзакцию и изменяет баланс счета в одной транзакции базы данных.
+
+        Выполняет ровно один INSERT и один `UPDATE ... RETURNING` для баланса и
+        обновляет агрегат daily_spend. Commit выполняет зависимость сессии. Баланс
+        вычисляется на стороне базы данных, поэтому параллельные запросы не затирают
+        изменения друг друга.
+
+        Args:
+            db (Session): Сессия базы данных.
+            obj_in (Union[TransactionCreate, Dict[str, Any]]): Данные новой транзакции.
+
+        Returns:
+            Transaction: Созданная транзакция.
+        """
+        if isinstance(obj_in, dict):
+            obj_in_data = obj_in
+        else:
+            obj_in_data = obj_in.model_dump()
+        db_obj = Transaction(**obj_in_data)
+        db.add(db_obj)
+        db.flush()
+        balance = account.apply_balance_delta(
+            db, account_id=db_obj.account_id, amount=db_obj.amount
+        )
+        if balance:
+            delta = DailySpendDelta()
+            self._add_to_daily_spend(delta, db_obj, user_id=balance.user_id)
+            daily_spend.apply(db, delta=delta)
+        return db_obj
+
+    def update(
         self,
         db: Session,
-        account_id: int,
+        *,
+        db_obj: Transaction,
+        obj_in: Union[TransactionUpdate, Dict[str, Any]],
+    ) -> Transaction:
+        """
+        Обновляет транзакцию и применяет к балансу счета только разницу сумм.
+
+        Баланс изменяется на `new_amount - old_amount` без пересчета всей истории
+        счета. Если транзакция перенесена на другой счет, старая сумма списывается
+        с прежнего счета, а новая добавляется к новому. Агрегат daily_spend
+        обновляется так же инкрементально. Commit выполняет зависимость сессии.
+
+        Args:
+            db (Session): Сессия базы данных.
+            db_obj (Transaction): Обновляемая транзакция.
+            obj_in (Union[TransactionUpdate, Dict[str, Any]]): Данные для обновления.
+
+        Returns:
+            Transaction: Обновленная транзакция.
+        """
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+
+        user_id = db_obj.account.user_id
+        delta = DailySpendDelta()
+        self._add_to_daily_spend(delta, db_obj, user_id=user_id, count=-1)
+
+        old_account_id = db_obj.account_id
+        old_amount = db_obj.amount
+        for field, value in update_data.items():
+            if hasattr(Transaction, field):
+                setattr(db_obj, field, value)
+        db.flush()
+
+        if db_obj.account_id != old_account_id:
+            account.apply_balance_delta(
+                db, account_id=old_account_id, amount=-old_amount
+            )
+            account.apply_balance_delta(
+                db, account_id=db_obj.account_id, amount=db_obj.amount
+            )
+        elif db_obj.amount != old_amount:
+            account.apply_balance_delta(
+                db, account_id=db_obj.account_id, amount=db_obj.amount - old_amount
+            )
+
+        self._add_to_daily_spend(delta, db_obj, user_id=user_id)
+        daily_spend.apply(db, delta=delta)
+        return db_obj
+
+    def remove(self, db: Session, *, id: int) -> Optional[Transaction]:
+        """
+        Удаляет транзакцию и вычитает её сумму из баланса счета и агрегата daily_spend.
+
+        Args:
+            db (Session): Сессия базы данных.
+            id (int): Идентификатор транзакции.
+
+        Returns:
+            Optional[Transaction]: Удаленная транзакция или None, если она не найдена.
+        """
+        db_obj = db.get(Transaction, id)
+        if not db_obj:
+            return None
+        db.delete(db_obj)
+        db.flush()
+        balance = account.apply_balance_delta(
+            db, account_id=db_obj.account_id, amount=-db_obj.amount
+        )
+        if balance:
+            delta = DailySpendDelta()
+            self._add_to_daily_spend(delta, db_obj, user_id=balance.user_id, count=-1)
+            daily_spend.apply(db, delta=delta)
+        return db_obj
+
+    def _add_to_daily_spend(
+        self,
+        delta: DailySpendDelta,
+        db_obj: Transaction,
+        *,
+        user_id: int,
+        count: int = 1,
+    ) -> None:
+        # Проводки переводов не являются доходами или расходами
+        if db_obj.transfer_group_id is not None:
+            return
+        delta.add(
+            user_id=user_id,
+            account_id=db_obj.account_id,
+            category_id=db_obj.category_id,
+            date=db_obj.date,
+            amount=db_obj.amount,
+            count=count,
+        )
+
+    def import_transactions(
+        self,
+        db: Session,
+        *,
+        obj_in: Iterable[TransactionCreate],
+        user_id: int,
+        batch_size: int = IMPORT_BATCH_SIZE,
+    ) -> Tuple[int, Dict[int, Decimal]]:
+        """
+        Массово создает транзакции пользователя пакетными INSERT-запросами.
+
+        Строки читаются из `obj_in` по мере необходимости, поэтому источник может
+        быть потоковым. Принадлежность счетов и категорий пользователю проверяется
+        один раз для каждого нового идентификатора. Изменения балансов суммируются
+        и применяются одним UPDATE на счет, изменения агрегата daily_spend - пакетным
+        upsert. Commit выполняет зависимость сессии.
+
+        Args:
+            db (Session): Сессия базы данных.
+            obj_in (Iterable[TransactionCreate]): Данные новых транзакций.
+            user_id (int): Идентификатор пользователя, выполняющего импорт.
+            batch_size (int, optional): Размер пакета для INSERT. Defaults to IMPORT_BATCH_SIZE.
+
+        Returns:
+            Tuple[int, Dict[int, Decimal]]: Количество созданных транзакций и новые балансы счетов.
+
+        Raises:
+            HTTPException: Если счет или категория не принадлежат пользователю.
+        """
+        owned_accounts: Set[int] = set()
+        owned_categories: Set[int] = set()
+        deltas: Dict[int, Decimal] = defaultdict(Decimal)
+        spend = DailySpendDelta()
+        count = 0
+
+        rows = iter(obj_in)
+        while batch := list(islice(rows, batch_size)):
+            self._check_import_ownership(
+                db,
+                account_ids={row.account_id for row in batch} - owned_accounts,
+                category_ids={row.category_id for row in batch} - owned_categories,
+                user_id=user_id,
+            )
+            owned_accounts.update(row.account_id for row in batch)
+            owned_categories.update(row.category_id for row in batch)
+
+            values = []
+            for row in batch:
+                data = row.model_dump()
+                if data["date"] is None:
+                    data["date"] = datetime.utcnow()
+                values.append(data)
+                deltas[row.account_id] += row.amount
+                spend.add(
+                    user_id=user_id,
+                    account_id=row.account_id,
+                    category_id=row.category_id,
+                    date=data["date"],
+                    amount=row.amount,
+                )
+            db.execute(insert(Transaction), values)
+            count += len(values)
+
+        balances = {
+            account_id: account.apply_balance_delta(
+                db, account_id=account_id, amount=amount
+            ).balance
+            for account_id, amount in deltas.items()
+        }
+        daily_spend.apply(db, delta=spend)
+        return count, balances
+
+    def transfer(
+        self, db: Session, *, obj_in: TransactionTransferCreate, user_id: int
+    ) -> Tuple[Account, Account]:
+        """
+        Выполняет перевод между счетами пользователя в одной транзакции базы данных.
+
+        Оба счета блокируются `SELECT ... FOR UPDATE` в порядке возрастания id, чтобы
+        встречные переводы не приводили к взаимной блокировке. Тот же запрос проверяет,
+        что категория `category_id` существует: если она удалена, id категории перевода
+        определяется заново. Обе проводки создаются
+        одним многострочным INSERT с общим transfer_group_id, балансы обоих счетов
+        изменяются одним UPDATE. Commit выполняет зависимость сессии.
+
+        Перевод не является доходом или расходом, поэтому не учитывается в агрегате daily_spend.
+
+        Сумма `amount` - изменение баланса счета `account_id`, счет `to_account_id`
+        получает проводку с противоположным знаком.
+
+        Args:
+            db (Session): Сессия базы данных.
+            obj_in (TransactionTransferCreate): Данные перевода с заполненной category_id.
+            user_id (int): Идентификатор пользователя, выполняющего перевод.
+
+        Returns:
+            Tuple[Account, Account]: Счет отправителя и счет получателя.
+
+        Raises:
+            HTTPException: Если счет не найден, не принадлежит пользователю или счета совпадают.
+        """
+        if obj_in.account_id == obj_in.to_account_id:
+            raise HTTPException(
+                status_code=400, detail="Нельзя сделать перевод на тот же счёт"
+            )
+        # Тем же запросом проверяется, что категория из кэша еще существует
+        category_exists = (
+            select(Category.id)
+            .where(Category.id == obj_in.category_id, Category.user_id == user_id)
+            .exists()
+            .label("category_exists")
+        )
+        rows = db.execute(
+            select(Account, category_exists)
+            .where(Account.id.in_([obj_in.account_id, obj_in.to_account_id]))
+            .order_by(Account.id)
+            .with_for_update(of=Account)
+        ).all()
+        accounts = {row.Account.id: row.Account for row in rows}
+        account_from = accounts.get(obj_in.account_id)
+        if not account_from:
+            raise HTTPException(status_code=404, detail="Счёт отправитель не найден")
+        account_to = accounts.get(obj_in.to_account_id)
+        if not account_to:
+            raise HTTPException(status_code=404, detail="Счёт получатель не найден")
+        if account_from.user_id != user_id or account_to.user_id != user_id:
+            raise HTTPException(
+                status_code=400,
+                detail="Пользователь не может сделать перевод не для своих счетов",
+            )
+
+        if not rows[0].category_exists:
+            # Кэш хранит id категории, удаленной в другом воркере:
+            # запись сбрасывается, категория ищется (или создается) заново
+            category.forget_system_category(
+                user_id=user_id, name=TRANSFER_CATEGORY_NAME
+            )
+            obj_in.category_id = category.get_system_category_id(
+                db, user_id=user_id, name=TRANSFER_CATEGORY_NAME
+            )
+
+        date = obj_in.date or datetime.utcnow()
+        transfer_group_id = uuid.uuid4()
+        legs = [
+            {
+                "amount": amount,
+                "date": date,
+                "description": obj_in.description,
+                "category_id": obj_in.category_id,
+                "account_id": account_id,
+                "transfer_group_id": transfer_group_id,
+                "transfer_role": role,
+            }
+            for account_id, amount, role in (
+                (account_from.id, obj_in.amount, TRANSFER_SENDER),
+                (account_to.id, -obj_in.amount, TRANSFER_RECEIVER),
+            )
+        ]
+        db.execute(insert(Transaction).values(legs))
+        db.execute(
+            update(Account)
+            .where(Account.id.in_(accounts))
+            .values(
+                balance=Account.balance
+                + case(
+                    (Account.id == account_from.id, obj_in.amount),
+                    else_=-obj_in.amount,
+                )
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return account_from, account_to
+
+    def get_transfers(
+        self,
+        db: Session,
+        *,
+        user_id: int,
+        account_id: Optional[int] = None,
+        limit: int = 50,
+    ) -> List[Row]:
+        """
+        Получает переводы пользователя, по одной строке на перевод.
+
+        Проводки перевода связываются по transfer_group_id (частичный индекс
+        ix_transaction_transfer_group_id), отправитель и получатель определяются
+        по transfer_role.
+
+        Args:
+            db (Session): Сессия базы данных.
+            user_id (int): Идентификатор пользователя.
+            account_id (Optional[int], optional): Только переводы с участием счета. Defaults to None.
+            limit (int, optional): Максимальное количество переводов. Defaults to 50.
+
+        Returns:
+            List[Row]: Переводы (transfer_group_id, date, amount, description, account_id,
+            to_account_id) от новых к старым.
+        """
+        sender = aliased(Transaction)
+        receiver = aliased(Transaction)
+        statement = (
+            select(
+                sender.transfer_group_id,
+                sender.date,
+                sender.amount,
+                sender.description,
+                sender.account_id,
+                receiver.account_id.label("to_account_id"),
+            )
+            .join(
+                receiver,
+                and_(
+                    receiver.transfer_group_id == sender.transfer_group_id,
+                    receiver.transfer_role == TRANSFER_RECEIVER,
+                ),
+            )
+            .join(Account, Account.id == sender.account_id)
+            .where(
+                sender.transfer_group_id.isnot(None),
+                sender.transfer_role == TRANSFER_SENDER,
+                Account.user_id == user_id,
+            )
+            .order_by(sender.date.desc(), sender.id.desc())
+            .limit(limit)
+        )
+        if account_id:
+            statement = statement.where(
+                or_(sender.account_id == account_id, receiver.account_id == account_id)
+            )
+        return db.execute(statement).all()
+
+    def reverse_transfer(
+        self, db: Session, *, transfer_group_id: uuid.UUID, user_id: int
+    ) -> int:
+        """
+        Отменяет перевод: удаляет обе проводки и возвращает балансы счетов.
+
+        Счета блокируются в порядке возрастания id, как и при переводе. Суммы для
+        возврата берутся из `DELETE ... RETURNING`, поэтому повторная отмена
+        не изменяет балансы.
+
+        Args:
+            db (Session): Сессия базы данных.
+            transfer_group_id (uuid.UUID): Идентификатор перевода.
+            user_id (int): Идентификатор пользователя, выполняющего отмену.
+
+        Returns:
+            int: Количество удаленных проводок.
+
+        Raises:
+            HTTPException: Если перевод не найден (404) или принадлежит другому пользователю (403).
+        """
+        owners = db.execute(
+            select(Transaction.account_id, Account.user_id)
+            .join(Account, Account.id == Transaction.account_id)
+            .where(Transaction.transfer_group_id == transfer_group_id)
+        ).all()
+        if not owners:
+            raise HTTPException(status_code=404, detail="Перевод не найден")
+        if any(row.user_id != user_id for row in owners):
+            raise HTTPException(status_code=403, detail="Недостаточно прав")
+
+        db.execute(
+            select(Account.id)
+            .where(Account.id.in_({row.account_id for row in owners}))
+            .order_by(Account.id)
+            .with_for_update()
+        )
+        legs = db.execute(
+            delete(Transaction)
+            .where(Transaction.transfer_group_id == transfer_group_id)
+            .returning(Transaction.account_id, Transaction.amount)
+        ).all()
+        if not legs:
+            raise HTTPException(status_code=404, detail="Перевод не найден")
+
+        amounts: Dict[int, Decimal] = defaultdict(Decimal)
+        for leg in legs:
+            amounts[leg.account_id] += leg.amount
+        db.execute(
+            update(Account)
+            .where(Account.id.in_(amounts))
+            .values(balance=Account.balance - case(amounts, value=Account.id))
+            .execution_options(synchronize_session=False)
+        )
+        return len(legs)
+
+    def _check_import_ownership(
+        self,
+        db: Session,
+        *,
+        account_ids: Set[int],
+        category_ids: Set[int],
+        user_id: int,
+    ) -> None:
+        if account_ids:
+            owned = db.scalars(
+                select(Account.id).where(
+                    Account.id.in_(account_ids), Account.user_id == user_id
+                )
+            ).all()
+            if len(owned) != len(account_ids):
+                raise HTTPException(
+                    status_code=400,
+                    detail="Пользователь не может создать транзакцию не для своего счёта",
+                )
+        if category_ids:
+            owned = db.scalars(
+                select(Category.id).where(
+                    Category.id.in_(category_ids), Category.user_id == user_id
+                )
+            ).all()
+            if len(owned) != len(category_ids):
+                raise HTTPException(
+                    status_code=400,
+                    detail="Пользователь не может использовать не свою категорию",
+                )
+
+    def get_filtered_statement(
+        self,
+        account_id: Optional[int] = None,
         begin_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
         transaction_type: Optional[str] = None,
-    ):
+        limit: Optional[int] = None,
+        after: Optional[Tuple[datetime, int]] = None,
+        user_id: Optional[int] = None,
+    ) -> Select:
+        """
+        Строит запрос транзакций, отсортированных по `(date DESC, id DESC)`.
+
+        Форма запроса соответствует индексам `ix_transaction_account_id_date_id`,
+        `ix_transaction_account_id_date_income` и `ix_transaction_account_id_date_expense`.
+        Параметры описаны в get_filtered_transactions; `user_id` ограничивает
+        выборку счетами пользователя.
+        """
         statement = (
             select(
                 Transaction.id,
@@ -44,9 +520,12 @@ class CRUDtransaction(CRUDBase[Transaction, TransactionCreate, TransactionUpdate
             )
             .join(Account)
             .join(Category)
-            .where(Transaction.account_id == account_id)
         )
 
+        if account_id is not None:
+            statement = statement.where(Transaction.account_id == account_id)
+        if user_id:
+            statement = statement.where(Account.user_id == user_id)
         if begin_date:
             statement = statement.where(Transaction.date >= begin_date)
         if end_date:
@@ -56,11 +535,97 @@ class CRUDtransaction(CRUDBase[Transaction, TransactionCreate, TransactionUpdate
                 statement = statement.where(Transaction.amount >= 0)
             elif transaction_type.lower() == "expense":
                 statement = statement.where(Transaction.amount < 0)
+        if after:
+            statement = statement.where(
+                tuple_(Transaction.date, Transaction.id) < tuple_(*after)
+            )
+
+        statement = statement.order_by(Transaction.date.desc(), Transaction.id.desc())
+        if limit:
+            statement = statement.limit(limit)
+        return statement
+
+    def get_filtered_transactions(
+        self,
+        db: Session,
+        account_id: int,
+        begin_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        transaction_type: Optional[str] = None,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[datetime, int]] = None,
+        user_id: Optional[int] = None,
+    ):
+        """
+        Получает транзакции счета, отсортированные по `(date DESC, id DESC)`.
 
-        statement = statement.order_by(Transaction.date.desc())
+        Поддерживает keyset-пагинацию: `after` - позиция `(date, id)` последней
+        записи предыдущей страницы. В отличие от OFFSET, стоимость получения
+        любой страницы не зависит от её номера.
 
+        Args:
+            db (Session): Сессия базы данных.
+            account_id (int): Идентификатор счета.
+            begin_date (Optional[datetime], optional): Начальная дата фильтрации. Defaults to None.
+            end_date (Optional[datetime], optional): Конечная дата фильтрации. Defaults to None.
+            transaction_type (Optional[str], optional): 'income' - доходы, 'expense' - расходы. Defaults to None.
+            limit (Optional[int], optional): Максимальное количество записей. Defaults to None.
+            after (Optional[Tuple[datetime, int]], optional): Позиция, после которой начинается страница. Defaults to None.
+            user_id (Optional[int], optional): Владелец счета; транзакции чужих счетов не возвращаются. Defaults to None.
+
+        Returns:
+            List[Row]: Список транзакций с названиями счета и категории.
+        """
+        statement = self.get_filtered_statement(
+            account_id,
+            begin_date,
+            end_date,
+            transaction_type,
+            limit,
+            after,
+            user_id=user_id,
+        )
         transactions = db.execute(statement).all()
         return transactions
 
+    def stream_filtered_transactions(
+        self,
+        db: Session,
+        *,
+        user_id: int,
+        account_id: Optional[int] = None,
+        begin_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        transaction_type: Optional[str] = None,
+        batch_size: int = EXPORT_BATCH_SIZE,
+    ) -> Iterator[Row]:
+        """
+        Построчно возвращает транзакции пользователя через серверный курсор.
+
+        Строки читаются из базы пакетами по `batch_size` (`yield_per`), поэтому
+        потребление памяти не зависит от размера истории.
+
+        Args:
+            db (Session): Сессия базы данных.
+            user_id (int): Идентификатор пользователя.
+            account_id (Optional[int], optional): Идентификатор счета. Defaults to None.
+            begin_date (Optional[datetime], optional): Начальная дата фильтрации. Defaults to None.
+            end_date (Optional[datetime], optional): Конечная дата фильтрации. Defaults to None.
+            transaction_type (Optional[str], optional): 'income' - доходы, 'expense' - расходы. Defaults to None.
+            batch_size (int, optional): Размер пакета чтения. Defaults to EXPORT_BATCH_SIZE.
+
+        Returns:
+            Iterator[Row]: Транзакции с названиями счета и категории.
+        """
+        statement = self.get_filtered_statement(
+            account_id,
+            begin_date,
+            end_date,
+            transaction_type,
+            user_id=user_id,
+        ).execution_options(yield_per=batch_size)
+        for partition in db.execute(statement).partitions():
+            yield from partition
+
 
 transaction = CRUDtransaction(Transaction)
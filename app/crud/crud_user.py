@@ -1,35 +1,91 @@
 from typing import Any, Dict, Union
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.security import get_password_hash
+from app.core.cache import invalidate_after_commit, user_cache
+from app.core.security import get_password_hash, get_password_hash_async
 from app.crud.base import CRUDBase
 from app.models import User
 from app.schemas.user import UserCreate, UserUpdate
+from app.utils.utils import normalize_email
 
 class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
+    """
+    Синхронные create и update ждут bcrypt в текущем потоке, асинхронные
+    acreate и aupdate - без блокировки цикла событий.
+    """
+
     def create(self, db: Session, *, obj_in: UserCreate) -> User:
-        create_data = obj_in.model_dump()
-        create_data.pop("password")
-        db_obj = User(**create_data)
+        db_obj = User(**self._user_create_values(obj_in))
         db_obj.hashed_password = get_password_hash(obj_in.password)
         db.add(db_obj)
-        db.commit()
+        db.flush()
+
+        return db_obj
+
+    async def acreate(self, db: AsyncSession, *, obj_in: UserCreate) -> User:
+        db_obj = User(**self._user_create_values(obj_in))
+        db_obj.hashed_password = await get_password_hash_async(obj_in.password)
+        db.add(db_obj)
+        await db.flush()
 
         return db_obj
 
     def update(
         self, db: Session, *, db_obj: User, obj_in: Union[UserUpdate, Dict[str, Any]]
     ) -> User:
+        update_data = self._user_update_values(obj_in)
+        if update_data.get("password"):
+            update_data["hashed_password"] = get_password_hash(
+                update_data.pop("password")
+            )
+        user = super().update(db, db_obj=db_obj, obj_in=update_data)
+        invalidate_after_commit(db, user_cache, user.id)
+        return user
+
+    async def aupdate(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: User,
+        obj_in: Union[UserUpdate, Dict[str, Any]]
+    ) -> User:
+        update_data = self._user_update_values(obj_in)
+        if update_data.get("password"):
+            update_data["hashed_password"] = await get_password_hash_async(
+                update_data.pop("password")
+            )
+        user = await super().aupdate(db, db_obj=db_obj, obj_in=update_data)
+        invalidate_after_commit(db, user_cache, user.id)
+        return user
+
+    def remove(self, db: Session, *, id: int) -> User:
+        user = super().remove(db, id=id)
+        invalidate_after_commit(db, user_cache, id)
+        return user
+
+    async def aremove(self, db: AsyncSession, *, id: int) -> User:
+        user = await super().aremove(db, id=id)
+        invalidate_after_commit(db, user_cache, id)
+        return user
+
+    def _user_create_values(self, obj_in: UserCreate) -> Dict[str, Any]:
+        create_data = obj_in.model_dump()
+        create_data.pop("password")
+        create_data["email"] = normalize_email(create_data["email"])
+        return create_data
+
+    def _user_update_values(
+        self, obj_in: Union[UserUpdate, Dict[str, Any]]
+    ) -> Dict[str, Any]:
         if isinstance(obj_in, dict):
-            update_data = obj_in
+            update_data = dict(obj_in)
         else:
             update_data = obj_in.model_dump(exclude_unset=True)
-        if update_data.get("password"):
-            hashed_password = get_password_hash(update_data["password"])
-            del update_data["password"]
-            update_data["hashed_password"] = hashed_password
-        return super().update(db, db_obj=db_obj, obj_in=update_data)
+        if update_data.get("email"):
+            update_data["email"] = normalize_email(update_data["email"])
+        return update_data
 
 
 user = CRUDUser(User)
\ No newline at end of file
@@ -1,10 +1,48 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
+from app.core.cache import apply_pending_invalidations, discard_pending_invalidations
 from app.core.config import settings
+from app.db.pool import PoolStats, TimedAsyncAdaptedQueuePool, TimedQueuePool
 
-engine = create_engine(settings.SQLALCHEMY_DATABASE_URI.unicode_string())
+POOL_OPTIONS = dict(
+    pool_size=settings.POOL_SIZE,
+    max_overflow=settings.MAX_OVERFLOW,
+    pool_timeout=settings.POOL_TIMEOUT,
+    pool_recycle=settings.POOL_RECYCLE,
+    pool_pre_ping=settings.POOL_PRE_PING,
+)
+
+engine = create_engine(
+    settings.SQLALCHEMY_DATABASE_URI.unicode_string(),
+    poolclass=TimedQueuePool,
+    **POOL_OPTIONS,
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Асинхронный движок для async-эндпоинтов: тот же URI, но с драйвером asyncpg
+async_engine = create_async_engine(
+    make_url(settings.SQLALCHEMY_DATABASE_URI.unicode_string()).set(
+        drivername="postgresql+asyncpg"
+    ),
+    poolclass=TimedAsyncAdaptedQueuePool,
+    **POOL_OPTIONS,
+)
+# expire_on_commit=False: после commit атрибуты объектов доступны без ленивой загрузки
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
+# Записи кэша, отложенные invalidate_after_commit, сбрасываются только после commit.
+# Событие срабатывает и для AsyncSession: она работает поверх синхронной Session
+event.listen(Session, "after_commit", apply_pending_invalidations)
+event.listen(Session, "after_rollback", discard_pending_invalidations)
+
+pool_stats = {"sync": PoolStats(), "async": PoolStats()}
+pool_stats["sync"].attach(engine.pool)
+pool_stats["async"].attach(async_engine.sync_engine.pool)
+
 Base = declarative_base()
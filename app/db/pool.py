@@ -0,0 +1,107 @@
+import threading
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+
+class PoolStats:
+    """
+    Счётчики пула соединений: выдачи, возвраты, открытия и инвалидации соединений
+    (по событиям пула), а также время ожидания соединения и число таймаутов.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.waits = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record_wait(self, seconds: float, *, timed_out: bool = False) -> None:
+        with self._lock:
+            self.waits += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def _increment(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def attach(self, pool: Pool) -> None:
+        """
+        Подписывает счётчики на события пула и включает замер ожидания для TimedQueuePool.
+        """
+        if isinstance(pool, _TimedPoolMixin):
+            pool.stats = self
+        event.listen(pool, "checkout", lambda *args: self._increment("checkouts"))
+        event.listen(pool, "checkin", lambda *args: self._increment("checkins"))
+        event.listen(pool, "connect", lambda *args: self._increment("connects"))
+        event.listen(pool, "invalidate", lambda *args: self._increment("invalidations"))
+
+    def snapshot(self, pool: Pool) -> Dict:
+        """
+        Возвращает текущее состояние пула и накопленные счётчики.
+        """
+        with self._lock:
+            stats = {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": (
+                    self.wait_total / self.waits * 1000 if self.waits else 0.0
+                ),
+                "wait_max_ms": self.wait_max * 1000,
+            }
+        if isinstance(pool, QueuePool):
+            stats.update(
+                size=pool.size(),
+                checked_in=pool.checkedin(),
+                checked_out=pool.checkedout(),
+                overflow=max(pool.overflow(), 0),
+            )
+        return stats
+
+
+class _TimedPoolMixin:
+    """
+    Замеряет время получения соединения из пула. Для этого нет события пула,
+    поэтому переопределяется `_do_get`. Время включает открытие нового соединения.
+    """
+
+    stats: Optional[PoolStats] = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            if self.stats:
+                self.stats.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        if self.stats:
+            self.stats.record_wait(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        # engine.dispose() пересоздает пул: счётчики переносятся в новый экземпляр
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
@@ -5,3 +5,4 @@ from .goal import Goal
 from .account import Account
 from .transaction import Transaction
 from .budget import Budget
+from .daily_spend import DailySpend
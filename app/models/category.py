@@ -1,4 +1,4 @@
-from sqlalchemy import BigInteger, String, Column, ForeignKey, Integer
+from sqlalchemy import BigInteger, String, Column, ForeignKey, Index, Integer, func
 from sqlalchemy.orm import relationship
 
 from app.models.base import Base
@@ -27,3 +27,8 @@ class Category(Base):
     budgets = relationship(
         "Budget", back_populates="category", cascade="all,delete", uselist=True
     )
+
+    # Название категории уникально в пределах пользователя без учета регистра
+    __table_args__ = (
+        Index("ix_category_user_id_name_lower", user_id, func.lower(name), unique=True),
+    )
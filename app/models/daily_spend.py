@@ -0,0 +1,34 @@
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Date,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+)
+
+from app.models.base import Base
+
+
+# Агрегат доходов и расходов пользователя по счёту и категории за день.
+# Поддерживается инкрементально при изменении транзакций, расходы хранятся
+# положительной суммой
+class DailySpend(Base):
+    __tablename__ = "daily_spend"
+
+    user_id = Column(
+        BigInteger, ForeignKey("user.id", ondelete="CASCADE"), primary_key=True
+    )
+    account_id = Column(
+        BigInteger, ForeignKey("account.id", ondelete="CASCADE"), primary_key=True
+    )
+    category_id = Column(
+        BigInteger, ForeignKey("category.id", ondelete="CASCADE"), primary_key=True
+    )
+    day = Column(Date, primary_key=True)
+    income = Column(Numeric(precision=14, scale=2), nullable=False, default=0)
+    expense = Column(Numeric(precision=14, scale=2), nullable=False, default=0)
+    count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (Index("ix_daily_spend_user_id_day", user_id, day),)
@@ -8,11 +8,15 @@ from sqlalchemy import (
     Numeric,
     DateTime,
     Integer,
+    Index,
+    Uuid,
 )
 from sqlalchemy.orm import relationship
 
 from app.models.base import Base
 
+TRANSFER_SENDER = "sender"
+TRANSFER_RECEIVER = "receiver"
 
 # Модель транзакции пользователя
 class Transaction(Base):
@@ -26,7 +30,10 @@ class Transaction(Base):
     description = Column(String, nullable=True)
 
     category_id = Column(
-        BigInteger, ForeignKey("category.id", ondelete="CASCADE"), nullable=False
+        BigInteger,
+        ForeignKey("category.id", ondelete="CASCADE"),
+        index=True,
+        nullable=False,
     )
     category = relationship("Category", back_populates="transactions")
 
@@ -34,3 +41,45 @@ class Transaction(Base):
         BigInteger, ForeignKey("account.id", ondelete="CASCADE"), nullable=False
     )
     account = relationship("Account", back_populates="transactions")
+
+    # Общий идентификатор двух проводок перевода между счетами, NULL у обычных транзакций
+    transfer_group_id = Column(Uuid, nullable=True)
+    # Роль проводки в переводе: TRANSFER_SENDER или TRANSFER_RECEIVER, NULL у обычных транзакций
+    transfer_role = Column(String(8), nullable=True)
+
+    # Индексы под выборки транзакций счета с сортировкой по (date DESC, id DESC),
+    # частичные индексы - под фильтр доходов и расходов
+    __table_args__ = (
+        Index("ix_transaction_account_id_date_id", account_id, date.desc(), id.desc()),
+        Index(
+            "ix_transaction_account_id_date_income",
+            account_id,
+            date.desc(),
+            id.desc(),
+            postgresql_where=amount >= 0,
+            sqlite_where=amount >= 0,
+        ),
+        Index(
+            "ix_transaction_account_id_date_expense",
+            account_id,
+            date.desc(),
+            id.desc(),
+            postgresql_where=amount < 0,
+            sqlite_where=amount < 0,
+        ),
+        # Частичные индексы по переводам: поиск проводок перевода и список переводов счета
+        Index(
+            "ix_transaction_transfer_group_id",
+            transfer_group_id,
+            postgresql_where=transfer_group_id.isnot(None),
+            sqlite_where=transfer_group_id.isnot(None),
+        ),
+        Index(
+            "ix_transaction_account_id_date_transfer",
+            account_id,
+            date.desc(),
+            id.desc(),
+            postgresql_where=transfer_group_id.isnot(None),
+            sqlite_where=transfer_group_id.isnot(None),
+        ),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import BigInteger, String, Column, Integer
+from sqlalchemy import BigInteger, String, Column, Index, Integer, func
 from sqlalchemy.orm import relationship
 
 from app.models.base import Base
@@ -12,7 +12,8 @@ class User(Base):
         autoincrement=True,
     )
     name = Column(String, index=True, nullable=False)
-    email = Column(String, index=True, nullable=False, unique=True)
+    # хранится в нижнем регистре, уникальность и поиск - по индексу lower(email)
+    email = Column(String, nullable=False)
     hashed_password = Column(String, nullable=False)
     phone_number = Column(String, nullable=True)
     region = Column(String(2), nullable=False, default="RU")
@@ -29,3 +30,5 @@ class User(Base):
     budgets = relationship(
         "Budget", back_populates="user", cascade="all,delete", uselist=True
     )
+
+    __table_args__ = (Index("ix_user_email_lower", func.lower(email), unique=True),)
@@ -27,15 +27,14 @@ class AccountCreate(AccountBase):
     user_id: int
 
 
-class AccountUpdateBalance(BaseModel):
-    id: int
-    amount: condecimal(max_digits=10, decimal_places=2)
-
-
 class AccountUpdate(AccountBase):
     pass
 
 
+class AccountBatchUpdate(AccountUpdate):
+    id: int
+
+
 class AccountSchema(AccountBase):
     id: int
     user_id: int
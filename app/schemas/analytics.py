@@ -0,0 +1,30 @@
+from datetime import date
+from enum import Enum
+
+from pydantic import BaseModel, condecimal
+
+
+class CashflowBucket(str, Enum):
+    day = "day"
+    week = "week"
+    month = "month"
+
+
+class CategoryTotal(BaseModel):
+    category_id: int
+    category_name: str
+    income: condecimal(max_digits=14, decimal_places=2)
+    expense: condecimal(max_digits=14, decimal_places=2)
+    count: int
+
+    class Config:
+        from_attributes = True
+
+
+class CashflowPoint(BaseModel):
+    period_start: date
+    income: condecimal(max_digits=14, decimal_places=2)
+    expense: condecimal(max_digits=14, decimal_places=2)
+
+    class Config:
+        from_attributes = True
@@ -27,6 +27,10 @@ class BudgetUpdate(BudgetBase):
     pass
 
 
+class BudgetBatchUpdate(BudgetUpdate):
+    id: int
+
+
 class BudgetSchema(BudgetBase):
     id: int
     user_id: int
@@ -34,3 +38,13 @@ class BudgetSchema(BudgetBase):
 
     class Config:
         from_attributes = True
+
+
+class BudgetProgress(BaseModel):
+    budget_id: int
+    amount: condecimal(max_digits=10, decimal_places=2)
+    spent: condecimal(max_digits=10, decimal_places=2)
+    remaining: condecimal(max_digits=10, decimal_places=2)
+    percent_used: float
+    period_start: datetime
+    period_end: datetime
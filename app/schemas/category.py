@@ -14,6 +14,10 @@ class CategoryUpdate(CategoryBase):
     pass
 
 
+class CategoryBatchUpdate(CategoryUpdate):
+    id: int
+
+
 class CategorySchema(CategoryBase):
     id: int
     user_id: int
@@ -17,6 +17,10 @@ class GoalCreate(GoalBase):
 class GoalUpdate(GoalBase):
     pass
 
+
+class GoalBatchUpdate(GoalUpdate):
+    id: int
+
 class GoalUpdateAmount(BaseModel):
     amount: Optional[condecimal(max_digits=10, decimal_places=2)] = 0.0
 
@@ -11,6 +11,7 @@ class Token(BaseModel):
 # Содержимое JWT Token
 class TokenPayload(BaseModel):
     sub: Union[int, None] = None
+    exp: Union[int, None] = None
 
 
 class OAuth2PasswordRequestForm:
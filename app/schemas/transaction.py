@@ -1,10 +1,12 @@
-from typing import Optional
+from typing import Dict, List, Optional
 from datetime import datetime
+from decimal import Decimal
+from uuid import UUID
 from pydantic import BaseModel, condecimal
 
 
 class TransactionBase(BaseModel):
-    amount: Optional[condecimal(max_digits=10, decimal_places=2)] = 0.0
+    amount: Optional[condecimal(max_digits=10, decimal_places=2)] = Decimal("0")
     date: Optional[datetime] = None
     description: Optional[str] = None
 
@@ -22,6 +24,7 @@ class TransactionSchema(TransactionBase):
     id: int
     category_id: int
     account_id: int
+    transfer_group_id: Optional[UUID] = None
 
     class Config:
         from_attributes = True
@@ -30,8 +33,31 @@ class TransactionSchema(TransactionBase):
 class TransactionsOut(TransactionSchema):
     account_name: str
     category_name: str
-    
+
+
+class TransactionsPage(BaseModel):
+    items: List[TransactionsOut]
+    next_cursor: Optional[str] = None
+
+
 class TransactionTransferCreate(TransactionBase):
     account_id: int
     to_account_id: int
-    category_id: Optional[int] = None
\ No newline at end of file
+    category_id: Optional[int] = None
+
+
+class TransferSchema(BaseModel):
+    transfer_group_id: UUID
+    date: datetime
+    amount: condecimal(max_digits=10, decimal_places=2)
+    description: Optional[str] = None
+    account_id: int
+    to_account_id: int
+
+    class Config:
+        from_attributes = True
+
+
+class TransactionImportResult(BaseModel):
+    count: int
+    balances: Dict[int, condecimal(max_digits=10, decimal_places=2)]
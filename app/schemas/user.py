@@ -21,3 +21,13 @@ class UserSchema(UserBase):
 
     class Config:
         from_attributes = True
+
+
+# Данные пользователя, которые хранятся в кэше аутентификации
+class UserIdentity(BaseModel):
+    id: int
+    email: str
+    region: Optional[str] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,31 @@
+"""
+Пересчитывает агрегат daily_spend из таблицы transaction.
+
+Запуск:
+    python -m app.scripts.rebuild_daily_spend
+    python -m app.scripts.rebuild_daily_spend --user-id 42
+"""
+
+import argparse
+
+from app import crud
+from app.db.database import SessionLocal
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--user-id",
+        type=int,
+        default=None,
+        help="Пересчитать только данные пользователя",
+    )
+    args = parser.parse_args()
+
+    with SessionLocal.begin() as session:
+        rows = crud.daily_spend.rebuild(session, user_id=args.user_id)
+    print(f"daily_spend пересчитан: {rows} строк")
+
+
+if __name__ == "__main__":
+    main()
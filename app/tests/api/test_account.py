@@ -0,0 +1,84 @@
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.schemas.transaction import TransactionCreate
+from app.tests.utils.account import create_random_account
+from app.tests.utils.category import create_random_category
+from app.tests.utils.user import create_random_user
+
+
+def test_get_account_with_transactions(
+    client: TestClient, user_token_headers: dict, db: Session
+):
+    account = create_random_account(db=db)
+    category = create_random_category(db=db)
+    for day in range(1, 4):
+        crud.transaction.create(
+            db,
+            obj_in=TransactionCreate(
+                amount=day,
+                date=f"2004-01-0{day}T12:00:00",
+                category_id=category.id,
+                account_id=account.id,
+            ),
+        )
+
+    response = client.get(
+        f"/account/get_account_transactions/{account.id}",
+        headers=user_token_headers,
+        params={"limit": 2},
+    )
+    assert response.status_code == 200
+    [content] = response.json()
+    assert content["id"] == account.id
+    assert [t["date"] for t in content["transactions"]] == [
+        "2004-01-03T12:00:00",
+        "2004-01-02T12:00:00",
+    ]
+
+    response = client.get(
+        f"/account/get_account_transactions/{account.id}",
+        headers=user_token_headers,
+        params={"end_date": "2003-12-31T00:00:00"},
+    )
+    assert response.status_code == 200
+    assert response.json()[0]["transactions"] == []
+
+
+def test_get_account_with_transactions_not_owner(
+    client: TestClient, user_token_headers: dict, db: Session
+):
+    other_user = create_random_user(db)
+    account = create_random_account(db=db, user_id=other_user.id)
+    response = client.get(
+        f"/account/get_account_transactions/{account.id}",
+        headers=user_token_headers,
+    )
+    assert response.status_code == 404
+
+
+def test_get_account_ownership(
+    client: TestClient, user_token_headers: dict, db: Session
+):
+    other_user = create_random_user(db)
+    account = create_random_account(db=db, user_id=other_user.id)
+    response = client.get(f"/account/{account.id}", headers=user_token_headers)
+    assert response.status_code == 403
+
+    response = client.put(
+        f"/account/{account.id}", headers=user_token_headers, json={"name": "name"}
+    )
+    assert response.status_code == 400
+
+    crud.account.remove(db, id=account.id)
+    response = client.get(f"/account/{account.id}", headers=user_token_headers)
+    assert response.status_code == 404
+
+
+def test_update_expired_account(db: Session):
+    account = create_random_account(db=db)
+    db.expire(account)
+    account = crud.account.update(db, db_obj=account, obj_in={"name": "Expired"})
+    db.expire(account)
+    assert account.name == "Expired"
@@ -0,0 +1,91 @@
+from decimal import Decimal
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.tests.utils.account import create_random_account
+from app.tests.utils.category import create_random_category
+
+
+def create_transactions(client: TestClient, headers: dict, transactions: list):
+    for amount, date, category_id, account_id in transactions:
+        data = {
+            "amount": amount,
+            "date": date,
+            "category_id": category_id,
+            "account_id": account_id,
+        }
+        response = client.post("/transaction/", headers=headers, json=data)
+        assert response.status_code == 200
+
+
+def test_get_totals_by_category(
+    client: TestClient, user_token_headers: dict, db: Session
+):
+    food = create_random_category(db=db)
+    salary = create_random_category(db=db)
+    account = create_random_account(db=db)
+    other_account = create_random_account(db=db)
+    create_transactions(
+        client,
+        user_token_headers,
+        [
+            (-30, "2001-05-01T09:00:00", food.id, account.id),
+            (-12.5, "2001-05-20T18:00:00", food.id, other_account.id),
+            (1000, "2001-05-10T12:00:00", salary.id, account.id),
+            (-99, "2001-06-01T12:00:00", food.id, account.id),
+        ],
+    )
+
+    response = client.get(
+        "/analytics/by-category",
+        headers=user_token_headers,
+        params={"begin_date": "2001-05-01", "end_date": "2001-05-31"},
+    )
+    assert response.status_code == 200
+    content = {row["category_id"]: row for row in response.json()}
+    assert set(content) == {food.id, salary.id}
+    assert Decimal(content[food.id]["expense"]) == Decimal("42.5")
+    assert Decimal(content[food.id]["income"]) == 0
+    assert content[food.id]["count"] == 2
+    assert content[food.id]["category_name"] == food.name
+    assert Decimal(content[salary.id]["income"]) == 1000
+
+
+def test_get_cashflow(client: TestClient, user_token_headers: dict, db: Session):
+    category = create_random_category(db=db)
+    account = create_random_account(db=db)
+    create_transactions(
+        client,
+        user_token_headers,
+        [
+            (200, "2002-03-04T09:00:00", category.id, account.id),
+            (-50, "2002-03-10T09:00:00", category.id, account.id),
+            (-20, "2002-03-11T09:00:00", category.id, account.id),
+            (-5, "2002-04-02T09:00:00", category.id, account.id),
+        ],
+    )
+    params = {"account_id": account.id}
+
+    response = client.get(
+        "/analytics/cashflow",
+        headers=user_token_headers,
+        params={**params, "bucket": "week"},
+    )
+    assert response.status_code == 200
+    assert [
+        (row["period_start"], Decimal(row["income"]), Decimal(row["expense"]))
+        for row in response.json()
+    ] == [
+        ("2002-03-04", 200, 50),
+        ("2002-03-11", 0, 20),
+        ("2002-04-01", 0, 5),
+    ]
+
+    response = client.get(
+        "/analytics/cashflow", headers=user_token_headers, params=params
+    )
+    assert response.status_code == 200
+    assert [
+        (row["period_start"], Decimal(row["expense"])) for row in response.json()
+    ] == [("2002-03-01", 70), ("2002-04-01", 5)]
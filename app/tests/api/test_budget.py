@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.tests.utils.account import create_random_account
+from app.tests.utils.budget import create_random_budget
+from app.tests.utils.category import create_random_category
+
+
+def test_get_budget_progress(client: TestClient, user_token_headers: dict, db: Session):
+    category = create_random_category(db=db)
+    other_category = create_random_category(db=db)
+    account = create_random_account(db=db)
+    budget = create_random_budget(
+        db=db,
+        category_id=category.id,
+        start_date=datetime.utcnow() - timedelta(days=1),
+    )
+    for amount, category_id in (
+        (-30, category.id),
+        (50, category.id),
+        (-100, other_category.id),
+    ):
+        data = {"amount": amount, "category_id": category_id, "account_id": account.id}
+        client.post("/transaction/", headers=user_token_headers, json=data)
+
+    response = client.get(f"/budget/{budget.id}/progress", headers=user_token_headers)
+    assert response.status_code == 200
+    content = response.json()
+    assert content["budget_id"] == budget.id
+    assert Decimal(content["spent"]) == Decimal(30)
+    assert Decimal(content["remaining"]) == budget.amount - Decimal(30)
+    assert content["percent_used"] == round(float(30 / budget.amount * 100), 2)
+
+
+def test_get_budgets_progress(
+    client: TestClient, user_token_headers: dict, db: Session
+):
+    budget = create_random_budget(db=db)
+
+    response = client.get("/budget/progress", headers=user_token_headers)
+    assert response.status_code == 200
+    content = response.json()
+    assert budget.id in [progress["budget_id"] for progress in content]
+
+
+def test_get_budget_progress_forbidden(
+    client: TestClient, user_token_headers: dict, db: Session
+):
+    other_user_budget = create_random_budget(db=db, user_id=999)
+
+    response = client.get(
+        f"/budget/{other_user_budget.id}/progress", headers=user_token_headers
+    )
+    assert response.status_code == 403
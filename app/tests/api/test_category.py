@@ -71,3 +71,48 @@ def test_update_category_forbidden(
     assert response.status_code == 400
     content = response.json()
     assert content["detail"] == "Пользователь не может изменить не свою категорию"
+
+
+def test_create_category_duplicate_name(
+    client: TestClient, user_token_headers: dict, db: Session
+):
+    category = create_random_category(db=db)
+    data = {"name": category.name.upper()}
+    response = client.post("/category/", headers=user_token_headers, json=data)
+    assert response.status_code == 400
+
+
+def test_update_categories_batch_not_owner(
+    client: TestClient, user_token_headers: dict, db: Session
+):
+    category = create_random_category(db=db)
+    other_user_category = create_random_category(db=db, user_id=999)
+    data = [
+        {"id": category.id, "name": "Batch name"},
+        {"id": other_user_category.id, "name": "Batch name 2"},
+    ]
+    response = client.put("/category/batch", headers=user_token_headers, json=data)
+    assert response.status_code == 400
+    db.refresh(category)
+    assert category.name != "Batch name"
+
+    response = client.delete(
+        "/category/batch",
+        headers=user_token_headers,
+        params={"ids": [category.id, 0]},
+    )
+    assert response.status_code == 404
+
+
+def test_create_categories_batch_rolled_back(
+    client: TestClient, user_token_headers: dict, db: Session
+):
+    category = create_random_category(db=db)
+    data = [{"name": "Batch new category"}, {"name": category.name}]
+    response = client.post("/category/batch", headers=user_token_headers, json=data)
+    assert response.status_code == 400
+
+    response = client.get("/category/", headers=user_token_headers)
+    names = [content["name"] for content in response.json()]
+    assert "Batch new category" not in names
+    assert category.name in names
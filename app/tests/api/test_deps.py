@@ -0,0 +1,51 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.api import deps
+from app.core.cache import TTLCache, invalidate_after_commit
+from app.models import Category
+from app.models.base import Base
+
+
+def test_get_async_session_commits_or_rolls_back(tmp_path, monkeypatch):
+    # Остальные тесты подменяют get_async_session общей синхронной сессией,
+    # здесь зависимость работает с настоящим асинхронным драйвером
+    pytest.importorskip("aiosqlite")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'async.db'}")
+    monkeypatch.setattr(
+        deps,
+        "AsyncSessionLocal",
+        async_sessionmaker(engine, autoflush=False, expire_on_commit=False),
+    )
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("key", "value")
+    request = asynccontextmanager(deps.get_async_session)
+
+    async def run():
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+        async with request() as session:
+            session.add(Category(name="committed", user_id=1))
+            invalidate_after_commit(session, cache, "key")
+            await session.flush()
+            assert cache.get("key") == "value"
+        assert cache.get("key") is None
+
+        with pytest.raises(HTTPException):
+            async with request() as session:
+                session.add(Category(name="rolled back", user_id=1))
+                await session.flush()
+                raise HTTPException(status_code=400)
+
+        async with deps.AsyncSessionLocal() as session:
+            names = (await session.scalars(select(Category.name))).all()
+        await engine.dispose()
+        return names
+
+    assert asyncio.run(run()) == ["committed"]
@@ -56,6 +56,12 @@ def test_update_goal(client: TestClient, user_token_headers: dict, db: Session):
     assert Decimal(content["target_amount"]) == Decimal(data["target_amount"])
     assert "id" in content
     assert "user_id" in content
+    assert content["is_achieved"] is False
+
+    response = client.put(
+        f"/goal/{goal.id}", headers=user_token_headers, json={"amount": 800},
+    )
+    assert response.json()["is_achieved"] is True
 
 
 def test_delete_goal(client: TestClient, user_token_headers: dict, db: Session):
@@ -106,4 +112,34 @@ def test_add_accumulated_amount(client: TestClient, user_token_headers: dict, db
     assert content["user_id"] == goal.user_id
     assert "deadline" in content
     assert "id" in content
-    assert "is_achieved" in content
\ No newline at end of file
+    assert "is_achieved" in content
+
+def test_goals_batch(client: TestClient, user_token_headers: dict):
+    data = [
+        {"name": "Отпуск", "amount": 100, "target_amount": 1000},
+        {"name": "Ноутбук", "amount": 500, "target_amount": 500},
+    ]
+    response = client.post("/goal/batch", headers=user_token_headers, json=data)
+    assert response.status_code == 200
+    created = response.json()
+    assert [goal["name"] for goal in created] == ["Отпуск", "Ноутбук"]
+    assert [goal["is_achieved"] for goal in created] == [False, True]
+
+    data = [
+        {"id": created[0]["id"], "amount": 1000},
+        {"id": created[1]["id"], "name": "Телефон"},
+    ]
+    response = client.put("/goal/batch", headers=user_token_headers, json=data)
+    assert response.status_code == 200
+    updated = response.json()
+    assert [goal["name"] for goal in updated] == ["Отпуск", "Телефон"]
+    assert Decimal(updated[0]["amount"]) == Decimal(1000)
+    assert [goal["is_achieved"] for goal in updated] == [True, True]
+
+    ids = [goal["id"] for goal in created]
+    response = client.delete(
+        "/goal/batch", headers=user_token_headers, params={"ids": ids}
+    )
+    assert response.status_code == 200
+    response = client.get(f"/goal/{ids[0]}", headers=user_token_headers)
+    assert response.status_code == 404
@@ -0,0 +1,30 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+
+
+def test_get_pool_metrics(client: TestClient, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "metrics-token")
+    response = client.get(
+        "/internal/metrics/pool", headers={"X-Metrics-Token": "metrics-token"}
+    )
+    assert response.status_code == 200
+    content = response.json()
+    for name in ("sync", "async"):
+        assert content[name]["size"] == settings.POOL_SIZE
+        assert content[name]["checked_out"] >= 0
+        assert content[name]["timeouts"] >= 0
+        assert "wait_max_ms" in content[name]
+
+
+def test_get_pool_metrics_requires_token(client: TestClient, monkeypatch):
+    response = client.get("/internal/metrics/pool")
+    assert response.status_code == 404
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "metrics-token")
+    response = client.get("/internal/metrics/pool")
+    assert response.status_code == 403
+    response = client.get(
+        "/internal/metrics/pool", headers={"X-Metrics-Token": "wrong"}
+    )
+    assert response.status_code == 403
@@ -1,9 +1,17 @@
+import hashlib
+import threading
+from datetime import timedelta
 from typing import Dict
 
 from fastapi.testclient import TestClient
+from passlib.context import CryptContext
 from sqlalchemy.orm import Session
 
+from app.core import security
 from app.core.config import settings
+from app.core.security import create_access_token
+from app.schemas.token import TokenPayload
+from app.tests.utils.user import create_random_user
 from app.crud.auth import get_user_by_email
 
 
@@ -19,6 +27,21 @@ def test_get_access_token(client: TestClient):
     assert tokens["access_token"]
 
 
+def test_get_access_token_overloaded(client: TestClient, monkeypatch):
+    # все слоты пула bcrypt заняты
+    slots = threading.BoundedSemaphore(1)
+    slots.acquire()
+    monkeypatch.setattr(security, "password_hash_slots", slots)
+
+    login_data = {
+        "username": settings.EMAIL_TEST_USER,
+        "password": settings.PASSWORD_TEST_USER,
+    }
+    auth = client.post("/auth/access-token", data=login_data)
+    assert auth.status_code == 503
+    assert auth.headers["Retry-After"] == "1"
+
+
 def test_get_me(client: TestClient, user_token_headers: dict, db: Session):
     user = get_user_by_email(session=db, email=settings.EMAIL_TEST_USER)
     response = client.get("/auth/me", headers=user_token_headers)
@@ -28,3 +51,32 @@ def test_get_me(client: TestClient, user_token_headers: dict, db: Session):
     assert content["email"] == user.email
     assert content["phone_number"] == user.phone_number
     assert content["region"] == user.region
+
+
+def test_expired_token_rejected(client: TestClient, db: Session):
+    user = get_user_by_email(session=db, email=settings.EMAIL_TEST_USER)
+    token = create_access_token(user.id, expires_delta=timedelta(seconds=-1))
+    headers = {"Authorization": f"Bearer {token}"}
+
+    # токен был проверен и закэширован до exp, срок жизни записи кэша уже истёк
+    key = hashlib.sha256(token.encode()).digest()
+    security.token_cache.set(key, TokenPayload(sub=user.id), ttl=-1)
+
+    response = client.get("/auth/me", headers=headers)
+    assert response.status_code == 403
+
+
+def test_login_rehashes_outdated_password(client: TestClient, db: Session):
+    user = create_random_user(db=db)
+    user.hashed_password = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash(
+        "oldpassword"
+    )
+    db.commit()
+
+    login_data = {"username": user.email, "password": "oldpassword"}
+    auth = client.post("/auth/access-token", data=login_data)
+    assert auth.status_code == 200
+
+    db.refresh(user)
+    assert user.hashed_password.startswith(f"$2b${settings.BCRYPT_ROUNDS:02d}$")
+    assert security.pwd_context.verify("oldpassword", user.hashed_password)
@@ -1,10 +1,22 @@
+import json
+import uuid
+from datetime import date
 from decimal import Decimal
 
 from fastapi.testclient import TestClient
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app import crud
+from app.core.config import settings
+from app.crud.crud_category import TRANSFER_CATEGORY_NAME, system_category_cache
+from app.models import Account, Category, DailySpend, Transaction
+from app.models.transaction import TRANSFER_RECEIVER, TRANSFER_SENDER
+
 from app.tests.utils.category import create_random_category
 from app.tests.utils.account import create_random_account
+from app.tests.utils.transaction import create_random_transaction
+from app.tests.utils.user import create_random_user
 
 
 def test_create_transaction(client: TestClient, db: Session, user_token_headers: dict):
@@ -26,13 +38,442 @@ def test_create_transaction(client: TestClient, db: Session, user_token_headers:
     assert content["category_id"] == data["category_id"]
     assert content["account_id"] == data["account_id"]
     assert "date" in content
-    
+
+
+def test_create_transaction_without_amount(
+    client: TestClient, db: Session, user_token_headers: dict
+):
+    category = create_random_category(db=db)
+    account = create_random_account(db=db)
+    balance = account.balance
+    data = {"category_id": category.id, "account_id": account.id}
+
+    response = client.post("/transaction/", headers=user_token_headers, json=data)
+    assert response.status_code == 200
+    assert Decimal(response.json()["amount"]) == 0
+
+    db.refresh(account)
+    assert account.balance == balance
+
+
+def test_create_transaction_updates_balance(
+    client: TestClient, db: Session, user_token_headers: dict
+):
+    category = create_random_category(db=db)
+    account = create_random_account(db=db)
+    balance = account.balance
+    data = {
+        "amount": -25.5,
+        "category_id": category.id,
+        "account_id": account.id,
+    }
+
+    response = client.post("/transaction/", headers=user_token_headers, json=data)
+    assert response.status_code == 200
+
+    db.refresh(account)
+    assert account.balance == balance + Decimal("-25.5")
+    assert len(account.transactions) == 1
+
+
 def test_get_account_transactions(client: TestClient, db: Session, user_token_headers: dict):
     account = create_random_account(db=db)
 
     response = client.get(f"/transaction/account_transactions/{account.id}", headers=user_token_headers)
 
     assert response.status_code == 200
-    
-    
 
+
+def test_get_account_transactions_not_owner(
+    client: TestClient, db: Session, user_token_headers: dict
+):
+    transaction = create_random_transaction(db=db, user_id=999)
+
+    response = client.get(
+        f"/transaction/account_transactions/{transaction.account_id}",
+        headers=user_token_headers,
+    )
+    assert response.status_code == 400
+
+    response = client.get("/transaction/account_transactions/0", headers=user_token_headers)
+    assert response.status_code == 404
+
+
+def test_get_account_transactions_pagination(
+    client: TestClient, db: Session, user_token_headers: dict
+):
+    category = create_random_category(db=db)
+    account = create_random_account(db=db)
+    for day in range(1, 6):
+        data = {
+            "amount": day,
+            "date": f"2024-03-0{day}T12:00:00",
+            "category_id": category.id,
+            "account_id": account.id,
+        }
+        client.post("/transaction/", headers=user_token_headers, json=data)
+
+    url = f"/transaction/account_transactions/{account.id}"
+    response = client.get(url, headers=user_token_headers, params={"limit": 2})
+    assert response.status_code == 200
+    content = response.json()
+    assert [Decimal(t["amount"]) for t in content["items"]] == [5, 4]
+    assert content["next_cursor"]
+
+    amounts = []
+    cursor = content["next_cursor"]
+    while cursor:
+        response = client.get(
+            url, headers=user_token_headers, params={"limit": 2, "cursor": cursor}
+        )
+        content = response.json()
+        amounts.extend(Decimal(t["amount"]) for t in content["items"])
+        cursor = content["next_cursor"]
+    assert amounts == [3, 2, 1]
+
+
+def test_update_transaction_applies_delta(
+    client: TestClient, db: Session, user_token_headers: dict
+):
+    category = create_random_category(db=db)
+    account = create_random_account(db=db)
+    balance = account.balance
+    data = {"amount": 100, "category_id": category.id, "account_id": account.id}
+    response = client.post("/transaction/", headers=user_token_headers, json=data)
+    transaction_id = response.json()["id"]
+
+    response = client.put(
+        f"/transaction/{transaction_id}",
+        headers=user_token_headers,
+        json={"amount": 40},
+    )
+    assert response.status_code == 200
+    assert Decimal(response.json()["amount"]) == Decimal(40)
+
+    db.refresh(account)
+    assert account.balance == balance + Decimal(40)
+
+
+def test_delete_transaction_reverts_balance(
+    client: TestClient, db: Session, user_token_headers: dict
+):
+    category = create_random_category(db=db)
+    account = create_random_account(db=db)
+    balance = account.balance
+    data = {"amount": -70, "category_id": category.id, "account_id": account.id}
+    response = client.post("/transaction/", headers=user_token_headers, json=data)
+    transaction_id = response.json()["id"]
+
+    response = client.delete(
+        f"/transaction/{transaction_id}", headers=user_token_headers
+    )
+    assert response.status_code == 200
+
+    db.refresh(account)
+    assert account.balance == balance
+
+
+def test_create_transactions_bulk(
+    client: TestClient, db: Session, user_token_headers: dict
+):
+    category = create_random_category(db=db)
+    account = create_random_account(db=db)
+    balance = account.balance
+    data = [
+        {"amount": 10, "category_id": category.id, "account_id": account.id},
+        {"amount": -3.5, "category_id": category.id, "account_id": account.id},
+    ]
+
+    response = client.post("/transaction/bulk", headers=user_token_headers, json=data)
+    assert response.status_code == 200
+    content = response.json()
+    assert content["count"] == 2
+    assert Decimal(content["balances"][str(account.id)]) == balance + Decimal("6.5")
+
+
+def test_create_transactions_bulk_too_large(
+    client: TestClient, db: Session, user_token_headers: dict
+):
+    category = create_random_category(db=db)
+    account = create_random_account(db=db)
+    data = [
+        {"amount": 1, "category_id": category.id, "account_id": account.id}
+    ] * (settings.BATCH_MAX_SIZE + 1)
+
+    response = client.post("/transaction/bulk", headers=user_token_headers, json=data)
+    assert response.status_code == 422
+
+
+def test_import_transactions_csv(
+    client: TestClient, db: Session, user_token_headers: dict
+):
+    category = create_random_category(db=db)
+    account = create_random_account(db=db)
+    balance = account.balance
+    csv_content = (
+        "amount,date,description,category_id,account_id\n"
+        f"100,2024-03-01T10:00:00,Зарплата,{category.id},{account.id}\n"
+        f"-40,,,{category.id},{account.id}\n"
+    )
+
+    response = client.post(
+        "/transaction/import",
+        headers=user_token_headers,
+        files={"file": ("statement.csv", csv_content, "text/csv")},
+    )
+    assert response.status_code == 200
+    assert response.json()["count"] == 2
+
+    db.refresh(account)
+    assert account.balance == balance + Decimal(60)
+
+
+def test_create_transactions_bulk_forbidden(
+    client: TestClient, db: Session, user_token_headers: dict
+):
+    category = create_random_category(db=db)
+    other_user_account = create_random_account(db=db, user_id=999)
+    data = [
+        {"amount": 10, "category_id": category.id, "account_id": other_user_account.id}
+    ]
+
+    response = client.post("/transaction/bulk", headers=user_token_headers, json=data)
+    assert response.status_code == 400
+
+
+def test_daily_spend_follows_transactions(
+    client: TestClient, db: Session, user_token_headers: dict
+):
+    category = create_random_category(db=db)
+    account = create_random_account(db=db)
+    ids = []
+    for amount, day in ((100, "2024-04-01"), (-30, "2024-04-01"), (-20, "2024-04-02")):
+        data = {
+            "amount": amount,
+            "date": f"{day}T10:00:00",
+            "category_id": category.id,
+            "account_id": account.id,
+        }
+        response = client.post("/transaction/", headers=user_token_headers, json=data)
+        ids.append(response.json()["id"])
+    client.put(f"/transaction/{ids[1]}", headers=user_token_headers, json={"amount": -50})
+    client.delete(f"/transaction/{ids[2]}", headers=user_token_headers)
+
+    def daily_spend_rows():
+        rows = db.scalars(
+            select(DailySpend)
+            .where(DailySpend.account_id == account.id, DailySpend.count > 0)
+            .order_by(DailySpend.day)
+        ).all()
+        return [(row.day, row.income, row.expense, row.count) for row in rows]
+
+    expected = [(date(2024, 4, 1), Decimal(100), Decimal(50), 2)]
+    assert daily_spend_rows() == expected
+
+    crud.daily_spend.rebuild(db, user_id=account.user_id)
+    assert daily_spend_rows() == expected
+
+
+def test_transfer_uses_user_transfer_category(
+    client: TestClient, db: Session, user_token_headers: dict
+):
+    account_from = create_random_account(db)
+    account_to = create_random_account(db)
+    balance_from, balance_to = account_from.balance, account_to.balance
+    data = {
+        "amount": -10,
+        "account_id": account_from.id,
+        "to_account_id": account_to.id,
+    }
+    for _ in range(2):
+        response = client.post(
+            "/transaction/transfer_transaction", headers=user_token_headers, json=data
+        )
+        assert response.status_code == 200
+
+    db.refresh(account_from)
+    db.refresh(account_to)
+    assert account_from.balance == balance_from - 20
+    assert account_to.balance == balance_to + 20
+    legs = db.scalars(
+        select(Transaction.amount).where(
+            Transaction.account_id.in_([account_from.id, account_to.id])
+        )
+    ).all()
+    assert sorted(legs) == [-10, -10, 10, 10]
+
+    categories = db.scalars(
+        select(Category).where(
+            Category.user_id == account_from.user_id,
+            Category.name == TRANSFER_CATEGORY_NAME,
+        )
+    ).all()
+    assert len(categories) == 1
+    assert system_category_cache.get(
+        (account_from.user_id, TRANSFER_CATEGORY_NAME.lower())
+    ) == categories[0].id
+
+
+def test_transfer_with_stale_category_cache(
+    client: TestClient, db: Session, user_token_headers: dict
+):
+    account_from = create_random_account(db)
+    account_to = create_random_account(db)
+    key = (account_from.user_id, TRANSFER_CATEGORY_NAME.lower())
+    # id категории, удаленной в другом воркере
+    stale_id = 10**9
+    system_category_cache.set(key, stale_id)
+
+    data = {
+        "amount": -10,
+        "account_id": account_from.id,
+        "to_account_id": account_to.id,
+    }
+    response = client.post(
+        "/transaction/transfer_transaction", headers=user_token_headers, json=data
+    )
+    assert response.status_code == 200
+    assert system_category_cache.get(key) != stale_id
+    leg = db.scalar(select(Transaction).where(Transaction.account_id == account_from.id))
+    assert db.get(Category, leg.category_id).name == TRANSFER_CATEGORY_NAME
+
+
+def test_transfer_forbidden(client: TestClient, db: Session, user_token_headers: dict):
+    other_user = create_random_user(db)
+    account_from = create_random_account(db)
+    account_to = create_random_account(db, user_id=other_user.id)
+    data = {
+        "amount": -10,
+        "account_id": account_from.id,
+        "to_account_id": account_to.id,
+    }
+    response = client.post(
+        "/transaction/transfer_transaction", headers=user_token_headers, json=data
+    )
+    assert response.status_code == 400
+
+    data["to_account_id"] = account_from.id
+    response = client.post(
+        "/transaction/transfer_transaction", headers=user_token_headers, json=data
+    )
+    assert response.status_code == 400
+
+
+def test_transfers_direction_from_role(
+    client: TestClient, db: Session, user_token_headers: dict
+):
+    category = create_random_category(db=db)
+    account_from = create_random_account(db)
+    account_to = create_random_account(db)
+    group = uuid.uuid4()
+    # Проводка получателя вставлена первой и получила меньший id
+    for account_id, amount, role in (
+        (account_to.id, 5, TRANSFER_RECEIVER),
+        (account_from.id, -5, TRANSFER_SENDER),
+    ):
+        db.add(
+            Transaction(
+                amount=amount,
+                category_id=category.id,
+                account_id=account_id,
+                transfer_group_id=group,
+                transfer_role=role,
+            )
+        )
+        db.flush()
+
+    response = client.get(
+        "/transaction/transfers",
+        headers=user_token_headers,
+        params={"account_id": account_from.id},
+    )
+    [transfer] = response.json()
+    assert transfer["account_id"] == account_from.id
+    assert transfer["to_account_id"] == account_to.id
+    assert Decimal(transfer["amount"]) == -5
+
+
+def test_list_and_reverse_transfer(
+    client: TestClient, db: Session, user_token_headers: dict
+):
+    account_from = create_random_account(db)
+    account_to = create_random_account(db)
+    balance_from, balance_to = account_from.balance, account_to.balance
+    data = {
+        "amount": -25,
+        "date": "2003-05-01T10:00:00",
+        "account_id": account_from.id,
+        "to_account_id": account_to.id,
+    }
+    response = client.post(
+        "/transaction/transfer_transaction", headers=user_token_headers, json=data
+    )
+    assert response.status_code == 200
+
+    response = client.get(
+        "/transaction/transfers",
+        headers=user_token_headers,
+        params={"account_id": account_to.id},
+    )
+    assert response.status_code == 200
+    [transfer] = response.json()
+    assert transfer["account_id"] == account_from.id
+    assert transfer["to_account_id"] == account_to.id
+    assert Decimal(transfer["amount"]) == -25
+
+    # переводы не попадают в доходы и расходы
+    response = client.get(
+        "/analytics/cashflow",
+        headers=user_token_headers,
+        params={"account_id": account_from.id, "begin_date": "2003-05-01"},
+    )
+    assert response.json() == []
+
+    leg = db.scalars(
+        select(Transaction).where(Transaction.account_id == account_from.id)
+    ).one()
+    response = client.delete(f"/transaction/{leg.id}", headers=user_token_headers)
+    assert response.status_code == 400
+
+    group_id = transfer["transfer_group_id"]
+    response = client.delete(
+        f"/transaction/transfers/{group_id}", headers=user_token_headers
+    )
+    assert response.status_code == 200
+    response = client.delete(
+        f"/transaction/transfers/{group_id}", headers=user_token_headers
+    )
+    assert response.status_code == 404
+
+    db.expire_all()
+    assert db.get(Account, account_from.id).balance == balance_from
+    assert db.get(Account, account_to.id).balance == balance_to
+
+
+def test_export_transactions(client: TestClient, db: Session, user_token_headers: dict):
+    category = create_random_category(db=db)
+    account = create_random_account(db=db)
+    for amount in (15, -5):
+        data = {"amount": amount, "category_id": category.id, "account_id": account.id}
+        client.post("/transaction/", headers=user_token_headers, json=data)
+
+    response = client.get(
+        "/transaction/export",
+        headers=user_token_headers,
+        params={"format": "ndjson", "account_id": account.id},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(Decimal(row["amount"]) for row in rows) == [-5, 15]
+    assert all(row["account_id"] == account.id for row in rows)
+
+    response = client.get(
+        "/transaction/export",
+        headers=user_token_headers,
+        params={"account_id": account.id},
+    )
+    assert response.status_code == 200
+    lines = response.text.splitlines()
+    assert lines[0].startswith("id,date,amount")
+    assert len(lines) == 3
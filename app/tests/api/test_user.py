@@ -2,7 +2,11 @@ from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 from faker import Faker
 
-from app.tests.utils.user import create_random_user
+from app import crud
+from app.core.cache import user_cache
+from app.models import User
+from app.schemas.user import UserCreate
+from app.tests.utils.user import create_random_user, user_authentication_headers
 fake = Faker()
 
 
@@ -42,3 +46,64 @@ def test_delete_user(client: TestClient, user_token_headers: dict, db: Session):
     assert response.status_code == 200
     content = response.text
     assert f"Пользователь: {user.name} удалён" in content
+
+
+def test_user_cache_invalidated_on_update(client: TestClient, db: Session):
+    user_in = UserCreate(email=fake.email(), name=fake.name(), password="cachepassword")
+    user = crud.user.create(db=db, obj_in=user_in)
+    headers = user_authentication_headers(
+        client=client, email=user.email, password="cachepassword"
+    )
+
+    response = client.get("/category/", headers=headers)
+    assert response.status_code == 200
+    assert user_cache.get(user.id) == {
+        "id": user.id,
+        "email": user.email,
+        "region": user.region,
+    }
+
+    response = client.put(
+        f"/user/{user.id}", headers=headers, json={"region": "US"}
+    )
+    assert response.status_code == 200
+    assert user_cache.get(user.id) is None
+
+    response = client.get("/category/", headers=headers)
+    assert response.status_code == 200
+    assert user_cache.get(user.id)["region"] == "US"
+
+
+def test_user_cache_invalidated_after_commit(db: Session):
+    user = create_random_user(db=db)
+    user_cache.set(user.id, {"id": user.id, "email": user.email, "region": "RU"})
+
+    # Отдельная сессия в savepoint общей транзакции: её commit вызывает after_commit
+    with Session(
+        bind=db.connection(), join_transaction_mode="create_savepoint"
+    ) as session:
+        crud.user.update(
+            session, db_obj=session.get(User, user.id), obj_in={"region": "US"}
+        )
+        assert user_cache.get(user.id) is not None
+        session.commit()
+    assert user_cache.get(user.id) is None
+
+
+def test_create_user_email_case_insensitive(client: TestClient, user_token_headers: dict):
+    user_data = {
+        "name": "Case User",
+        "email": "  Case.User@Example.com ",
+        "password": "casepassword",
+    }
+    response = client.post("/user/", headers=user_token_headers, json=user_data)
+    assert response.status_code == 200
+    assert response.json()["email"] == "case.user@example.com"
+
+    user_data["email"] = "CASE.USER@example.com"
+    response = client.post("/user/", headers=user_token_headers, json=user_data)
+    assert response.status_code == 400
+
+    login_data = {"username": "Case.User@EXAMPLE.com", "password": "casepassword"}
+    response = client.post("/auth/access-token", data=login_data)
+    assert response.status_code == 200
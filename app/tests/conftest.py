@@ -3,6 +3,7 @@ from typing import Generator, Dict
 
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.orm import Session
 from sqlalchemy.pool import StaticPool
@@ -11,7 +12,8 @@ from app.models.base import Base
 from app.main import app
 from app.tests.utils.user import authentication_token_from_email
 from app.core.config import settings
-from app.api.deps import get_session
+from app.api.deps import get_session, get_async_session
+from app.core.cache import apply_pending_invalidations
 
 TEST_SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
 
@@ -48,13 +50,25 @@ def db() -> Generator:
 
 @pytest.fixture(scope="module")
 def client(test_app, db: Session) -> Generator:
+    # Как и get_session, запрос фиксируется или откатывается целиком:
+    # вместо commit и rollback используется savepoint общей тестовой транзакции
+    # Общая транзакция не фиксируется, поэтому отложенные сбросы кэша
+    # применяются после savepoint, как после commit в get_session
     def get_test_db_session():
-        try:
+        with db.begin_nested():
             yield db
-        finally:
-            pass
+        apply_pending_invalidations(db)
+
+    async def get_test_async_session():
+        # AsyncSession поверх общей синхронной сессии: драйвер sqlite синхронный,
+        # поэтому запросы выполняются в той же тестовой транзакции. Сама зависимость
+        # get_async_session с асинхронным драйвером проверяется в test_deps.py
+        with db.begin_nested():
+            yield AsyncSession(sync_session_class=lambda **kw: db)
+        apply_pending_invalidations(db)
 
     test_app.dependency_overrides[get_session] = get_test_db_session
+    test_app.dependency_overrides[get_async_session] = get_test_async_session
     with TestClient(test_app) as client:
         yield client
         test_app.dependency_overrides = {}
@@ -0,0 +1,39 @@
+from datetime import datetime
+from typing import Optional
+
+from faker import Faker
+from sqlalchemy.orm import Session
+
+from app.schemas.budget import BudgetCreate, BudgetPeriod
+from app import crud
+from app.core.config import settings
+from app.models import Budget
+
+fake = Faker()
+
+
+def create_random_budget(
+    db: Session,
+    user_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+    period: BudgetPeriod = BudgetPeriod.month,
+    start_date: Optional[datetime] = None,
+) -> Budget:
+    if not user_id:
+        user = crud.auth.get_user_by_email(session=db, email=settings.EMAIL_TEST_USER)
+        user_id = user.id
+
+    budget_in = BudgetCreate(
+        amount=fake.pydecimal(min_value=100, max_value=10000, right_digits=2),
+        period=period,
+        description=fake.word(),
+        user_id=user_id,
+        category_id=category_id,
+    )
+
+    budget = crud.budget.create(db=db, obj_in=budget_in, user_id=user_id)
+    if start_date:
+        budget = crud.budget.update(
+            db, db_obj=budget, obj_in={"start_date": start_date}
+        )
+    return budget
@@ -16,7 +16,7 @@ def create_random_category(db: Session, user_id: Optional[int] = None) -> Catego
         user = crud.auth.get_user_by_email(session=db, email=settings.EMAIL_TEST_USER)
         user_id = user.id
 
-    name = fake.word()
+    name = fake.unique.word()
     color = fake.color_name()
     icon_name = fake.word()
 
@@ -32,4 +32,4 @@ def create_random_transaction(
         account_id=account.id,
     )
 
-    return crud.transaction.create(db=db, obj_in=transaction_in, user_id=user_id)
+    return crud.transaction.create(db=db, obj_in=transaction_in)
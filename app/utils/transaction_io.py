@@ -0,0 +1,131 @@
+import csv
+import io
+import json
+from itertools import islice
+from typing import BinaryIO, Dict, Iterable, Iterator, Optional
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from app.schemas.transaction import TransactionCreate
+
+CSV_FORMAT = "csv"
+NDJSON_FORMAT = "ndjson"
+
+MEDIA_TYPES = {
+    CSV_FORMAT: "text/csv; charset=utf-8",
+    NDJSON_FORMAT: "application/x-ndjson",
+}
+
+EXPORT_FIELDS = (
+    "id",
+    "date",
+    "amount",
+    "description",
+    "category_id",
+    "category_name",
+    "account_id",
+    "account_name",
+)
+EXPORT_CHUNK_SIZE = 500
+
+
+def _validate_row(data: Dict, line: int) -> TransactionCreate:
+    """
+    Проверяет строку импорта схемой TransactionCreate.
+
+    Raises:
+        HTTPException: Если строка не проходит валидацию (код 422).
+    """
+    try:
+        return TransactionCreate.model_validate(data)
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Строка {line}: {e.errors(include_url=False)}",
+        ) from e
+
+
+def iter_csv_transactions(file: BinaryIO) -> Iterator[TransactionCreate]:
+    """
+    Построчно читает CSV-файл с заголовком
+    `amount,date,description,category_id,account_id` и возвращает транзакции.
+
+    Файл не загружается в память целиком. Пустые значения считаются отсутствующими.
+    """
+    reader = csv.DictReader(io.TextIOWrapper(file, encoding="utf-8-sig", newline=""))
+    for row in reader:
+        data = {key: value for key, value in row.items() if key and value != ""}
+        yield _validate_row(data, reader.line_num)
+
+
+def iter_ndjson_transactions(file: BinaryIO) -> Iterator[TransactionCreate]:
+    """
+    Построчно читает NDJSON-файл (один JSON-объект на строку) и возвращает транзакции.
+
+    Пустые строки пропускаются.
+    """
+    for line_num, line in enumerate(io.TextIOWrapper(file, encoding="utf-8"), start=1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise HTTPException(
+                status_code=422, detail=f"Строка {line_num}: некорректный JSON"
+            ) from e
+        yield _validate_row(data, line_num)
+
+
+def detect_format(
+    content_type: Optional[str], filename: Optional[str]
+) -> Optional[str]:
+    """
+    Определяет формат файла импорта по content-type или расширению имени файла.
+
+    Returns:
+        Optional[str]: 'csv', 'ndjson' или None, если формат определить не удалось.
+    """
+    content_type = (content_type or "").lower()
+    filename = (filename or "").lower()
+    if "csv" in content_type or filename.endswith(".csv"):
+        return CSV_FORMAT
+    if "ndjson" in content_type or filename.endswith((".ndjson", ".jsonl")):
+        return NDJSON_FORMAT
+    return None
+
+
+def _export_values(row) -> Dict:
+    values = {field: getattr(row, field) for field in EXPORT_FIELDS}
+    values["date"] = values["date"].isoformat()
+    values["amount"] = str(values["amount"])
+    return values
+
+
+def iter_csv_export(rows: Iterable) -> Iterator[str]:
+    """
+    Преобразует строки транзакций в CSV, отдавая текст частями по EXPORT_CHUNK_SIZE строк.
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    writer.writeheader()
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, EXPORT_CHUNK_SIZE))
+        writer.writerows(_export_values(row) for row in chunk)
+        yield buffer.getvalue()
+        if len(chunk) < EXPORT_CHUNK_SIZE:
+            return
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def iter_ndjson_export(rows: Iterable) -> Iterator[str]:
+    """
+    Преобразует строки транзакций в NDJSON, отдавая текст частями по EXPORT_CHUNK_SIZE строк.
+    """
+    rows = iter(rows)
+    while chunk := list(islice(rows, EXPORT_CHUNK_SIZE)):
+        yield "".join(
+            json.dumps(_export_values(row), ensure_ascii=False) + "\n" for row in chunk
+        )
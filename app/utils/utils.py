@@ -1,3 +1,9 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+
 def is_current_user_owner(current_user_id: int, user_id: int) -> bool:
     """
     Проверяет, является ли текущий пользователь владельцем.
@@ -10,3 +16,47 @@ def is_current_user_owner(current_user_id: int, user_id: int) -> bool:
         bool: True, если текущий пользователь является владельцем указанного пользователя, в противном случае False.
     """
     return current_user_id == user_id
+
+
+def normalize_email(email: Optional[str]) -> Optional[str]:
+    """
+    Приводит адрес электронной почты к виду, в котором он хранится в базе данных:
+    без пробелов по краям и в нижнем регистре.
+    """
+    return email.strip().lower() if email else email
+
+
+def encode_cursor(date: datetime, id: int) -> str:
+    """
+    Кодирует позицию keyset-пагинации `(date, id)` в непрозрачную строку.
+
+    Args:
+        date (datetime): Дата последней записи страницы.
+        id (int): Идентификатор последней записи страницы.
+
+    Returns:
+        str: Курсор для получения следующей страницы.
+    """
+    raw = json.dumps([date.isoformat(), id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Декодирует курсор, полученный из encode_cursor.
+
+    Args:
+        cursor (str): Курсор следующей страницы.
+
+    Returns:
+        Tuple[datetime, int]: Дата и идентификатор последней записи предыдущей страницы.
+
+    Raises:
+        ValueError: Если курсор поврежден.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        date, id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(date), int(id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Некорректный курсор") from e
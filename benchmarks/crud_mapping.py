@@ -0,0 +1,86 @@
+"""
+Микробенчмарк подготовки данных в CRUDBase.create и CRUDBase.update.
+
+Сравнивает прежний способ (jsonable_encoder для схемы и для ORM-объекта, чтобы
+получить имена полей) с текущим: model_dump схемы и имена столбцов из маппинга
+SQLAlchemy. Запросы к базе данных не выполняются.
+
+Запуск:
+    python -m benchmarks.crud_mapping
+    python -m benchmarks.crud_mapping --number 100000
+"""
+
+import argparse
+import timeit
+from datetime import datetime
+from decimal import Decimal
+
+from fastapi.encoders import jsonable_encoder
+
+from app import crud
+from app.models import Account
+from app.schemas.account import AccountCreate, AccountUpdate
+from app.schemas.goal import GoalCreate
+
+
+def create_legacy(obj_in, user_id):
+    obj_in_data = jsonable_encoder(obj_in)
+    obj_in_data["user_id"] = user_id
+    return obj_in_data
+
+
+def update_legacy(db_obj, obj_in):
+    obj_data = jsonable_encoder(db_obj)
+    update_data = obj_in.model_dump(exclude_unset=True)
+    return {field: update_data[field] for field in obj_data if field in update_data}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    account_in = AccountCreate(
+        name="account", balance=Decimal("100.50"), type="card", user_id=1
+    )
+    goal_in = GoalCreate(
+        name="goal",
+        target_amount=Decimal("1000"),
+        amount=Decimal("10"),
+        deadline=datetime(2030, 1, 1),
+    )
+    account_update = AccountUpdate(name="renamed", balance=Decimal("200"))
+    # Объект без загруженных связей: если связь загружена (например, account.transactions
+    # с обратной ссылкой transaction.account), jsonable_encoder обходит ее рекурсивно
+    account = Account(
+        id=1, name="account", balance=Decimal("100.50"), type="card", user_id=1
+    )
+    # имена столбцов вычисляются один раз, до замеров
+    crud.account._column_keys
+    crud.goal._column_keys
+
+    cases = {
+        "create account": (
+            lambda: create_legacy(account_in, 1),
+            lambda: crud.account._create_values(account_in, 1),
+        ),
+        "create goal": (
+            lambda: create_legacy(goal_in, 1),
+            lambda: crud.goal._create_values(goal_in, 1),
+        ),
+        "update account": (
+            lambda: update_legacy(account, account_update),
+            lambda: crud.account._update_values(account_update),
+        ),
+    }
+    for name, (legacy, current) in cases.items():
+        legacy_us = timeit.timeit(legacy, number=args.number) / args.number * 1e6
+        current_us = timeit.timeit(current, number=args.number) / args.number * 1e6
+        print(
+            f"{name}: jsonable_encoder {legacy_us:.2f} us, "
+            f"model_dump {current_us:.2f} us ({legacy_us / current_us:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()